@@ -1,16 +1,164 @@
-from django.contrib import admin
+from django.conf import settings
+from django.contrib import admin, messages
+from django.contrib.admin import actions
+from django.core.exceptions import PermissionDenied
+from django.db import transaction
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.html import format_html
 
+from .cache import invalidate_news
 from .models import Comment
 from .models import News
 
 
-class CommentInline(admin.StackedInline):
+class LatestCommentsFormSet(BaseInlineFormSet):
+    """
+    Только последние NEWS_ADMIN_INLINE_COMMENTS комментариев.
+
+    У популярной новости их тысячи, остальные листаются
+    в списке комментариев.
+
+    При сохранении берутся комментарии, которые были на форме: окно
+    последних комментариев к этому моменту могли сдвинуть новые,
+    и правки вытесненных из него молча пропали бы.
+    """
+
+    def get_queryset(self):
+        if not hasattr(self, '_latest'):
+            queryset = super().get_queryset()
+            if self.is_bound:
+                self._latest = queryset.filter(pk__in=self.submitted_pks())
+            else:
+                self._latest = queryset.order_by('-created', '-pk')[
+                    :settings.NEWS_ADMIN_INLINE_COMMENTS
+                ]
+        return self._latest
+
+    def submitted_pks(self):
+        pk_name = self.model._meta.pk.name
+        pks = (
+            self.data.get(f'{self.add_prefix(i)}-{pk_name}', '')
+            for i in range(self.initial_form_count())
+        )
+        return [pk for pk in pks if pk.isdigit()]
+
+
+class CommentInline(admin.TabularInline):
     model = Comment
+    formset = LatestCommentsFormSet
+    raw_id_fields = ('author',)
     extra = 0
 
 
+def delete_selected(modeladmin, request, queryset):
+    """
+    Замена стандартного действия: подтверждение то же, но удаление
+    идёт через delete_queryset без записи в журнал на каждый объект.
+    """
+    if not request.POST.get('post'):
+        return actions.delete_selected(modeladmin, request, queryset)
+    # Как и стандартное действие, без права на удаление зависимых
+    # объектов ничего не удаляем.
+    if modeladmin.get_perms_needed(request, queryset):
+        raise PermissionDenied
+    deleted = modeladmin.delete_queryset(request, queryset)
+    modeladmin.message_user(
+        request, f'Удалено объектов: {deleted}.', messages.SUCCESS
+    )
+
+
+class BulkDeleteMixin:
+    """
+    Удаление выбранных объектов одним запросом.
+
+    Страница подтверждения показывает удаляемые объекты и число
+    зависимых комментариев, не перечисляя их.
+    """
+
+    def get_actions(self, request):
+        actions = super().get_actions(request)
+        if 'delete_selected' in actions:
+            *_, description = actions['delete_selected']
+            actions['delete_selected'] = (
+                delete_selected, 'delete_selected', description
+            )
+        return actions
+
+    def get_deleted_objects(self, objs, request):
+        deleted = [str(obj) for obj in objs]
+        model_count = {self.model._meta.verbose_name_plural: len(deleted)}
+        comments = self.get_deleted_comments(objs)
+        if comments:
+            model_count[Comment._meta.verbose_name_plural] = comments
+        return deleted, model_count, self.get_perms_needed(request, objs), []
+
+    def get_perms_needed(self, request, objs):
+        """Названия объектов, которые пользователю нельзя удалять."""
+        perms_needed = set()
+        if not self.has_delete_permission(request):
+            perms_needed.add(self.model._meta.verbose_name)
+        if (
+            not request.user.has_perm('news.delete_comment')
+            and self.get_deleted_comments(objs)
+        ):
+            perms_needed.add(Comment._meta.verbose_name)
+        return perms_needed
+
+    def get_deleted_comments(self, objs):
+        return 0
+
+
 @admin.register(News)
-class NewsAdmin(admin.ModelAdmin):
+class NewsAdmin(BulkDeleteMixin, admin.ModelAdmin):
     inlines = [
         CommentInline,
     ]
+    list_display = ('title', 'date', 'comment_count')
+    search_fields = ('title',)
+    date_hierarchy = 'date'
+    readonly_fields = ('all_comments',)
+    show_full_result_count = False
+
+    @admin.display(description='Все комментарии')
+    def all_comments(self, news):
+        if news.pk is None:
+            return '—'
+        url = reverse('admin:news_comment_changelist')
+        return format_html(
+            '<a href="{}?news__id__exact={}">{} шт.</a>',
+            url, news.pk, news.comment_count,
+        )
+
+    def get_deleted_comments(self, objs):
+        return Comment.objects.filter(news__in=objs).count()
+
+    def delete_model(self, request, obj):
+        self.delete_queryset(request, News.objects.filter(pk=obj.pk))
+
+    def delete_queryset(self, request, queryset):
+        """
+        Новости и их комментарии удаляются двумя запросами,
+        без каскадного сбора объектов и сигналов на каждый комментарий.
+        """
+        news_ids = list(queryset.values_list('pk', flat=True))
+        with transaction.atomic(using=queryset.db):
+            comments = Comment.objects.filter(news__in=queryset)
+            comments._raw_delete(comments.db)
+            deleted = queryset._raw_delete(queryset.db)
+        invalidate_news(*news_ids)
+        return deleted
+
+
+@admin.register(Comment)
+class CommentAdmin(BulkDeleteMixin, admin.ModelAdmin):
+    list_display = ('__str__', 'news', 'author', 'created')
+    list_select_related = ('news', 'author')
+    autocomplete_fields = ('news', 'author')
+    search_fields = ('text',)
+    date_hierarchy = 'created'
+    show_full_result_count = False
+
+    def delete_queryset(self, request, queryset):
+        """Одним запросом, со сдвигом счётчиков у новостей."""
+        return queryset.bulk_delete()
@@ -0,0 +1,139 @@
+"""
+Асинхронный путь обработки запросов под ASGI.
+
+В Django 3.2 нет асинхронного ORM, поэтому асинхронные представления
+выполняют синхронный код в отдельном ограниченном пуле потоков
+NEWS_ASYNC_DB_THREADS (run_sync). Без этого Django под ASGI выполняет
+все синхронные представления и middleware в одном общем потоке,
+и запросы идут строго по очереди.
+
+Middleware проекта работают в обоих режимах (AsyncCapableMiddleware),
+иначе Django переключался бы в этот общий поток на каждом из них.
+Обёртки SQL-запросов, которые middleware ставят через
+execute_wrapper(), переносятся в потоки пула вместе с контекстом.
+
+Асинхронные представления включает NEWS_ASYNC_VIEWS, по умолчанию —
+только в yanews/asgi.py: под WSGI они добавили бы переключение
+в цикл событий на каждый запрос.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections, connection
+
+query_wrappers = ContextVar('query_wrappers', default=())
+executor_lock = threading.Lock()
+executor = None
+
+
+def get_executor():
+    global executor
+    with executor_lock:
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=settings.NEWS_ASYNC_DB_THREADS,
+                thread_name_prefix='news-db',
+            )
+        return executor
+
+
+@contextmanager
+def execute_wrapper(wrapper):
+    """
+    connection.execute_wrapper(), который действует и в потоках
+    run_sync, запущенных внутри блока.
+    """
+    token = query_wrappers.set(query_wrappers.get() + (wrapper,))
+    try:
+        with connection.execute_wrapper(wrapper):
+            yield
+    finally:
+        query_wrappers.reset(token)
+
+
+def call_with_wrappers(func, *args, **kwargs):
+    with ExitStack() as stack:
+        for wrapper in query_wrappers.get():
+            stack.enter_context(connection.execute_wrapper(wrapper))
+        try:
+            return func(*args, **kwargs)
+        finally:
+            # Соединение потока пула живёт по тем же правилам
+            # CONN_MAX_AGE, что и соединение обычного запроса.
+            close_old_connections()
+
+
+async def run_sync(func, *args, **kwargs):
+    """Выполняет синхронную функцию в пуле потоков для работы с базой."""
+    return await sync_to_async(
+        call_with_wrappers, thread_sensitive=False, executor=get_executor()
+    )(func, *args, **kwargs)
+
+
+def render_view(view, request, *args, **kwargs):
+    """Ответ представления, отрендеренный в том же потоке."""
+    response = view(request, *args, **kwargs)
+    if hasattr(response, 'render') and callable(response.render):
+        response.render()
+    return response
+
+
+class AsyncViewMixin:
+    """
+    При NEWS_ASYNC_VIEWS представление становится асинхронным:
+    dispatch и рендеринг шаблона идут в пуле run_sync.
+
+    Шаблон рендерится там же, иначе Django отрендерил бы его в общем
+    потоке, а ленивые QuerySet'ы шаблона — это запросы к базе.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        if not settings.NEWS_ASYNC_VIEWS:
+            return view
+
+        async def async_view(request, *args, **kwargs):
+            return await run_sync(render_view, view, request, *args, **kwargs)
+
+        # view_class, csrf_exempt и прочие атрибуты исходной функции.
+        update_wrapper(async_view, view)
+        # Для вызова вне цикла событий, например генератором
+        # статических страниц (news.prerender).
+        async_view.sync_view = view
+        return async_view
+
+
+class AsyncCapableMiddleware:
+    """
+    Основа middleware, которые работают и под WSGI, и под ASGI.
+
+    Наследник реализует call() и acall(); acall() не должен
+    обращаться к базе иначе как через run_sync.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Так Django помечает экземпляр MiddlewareMixin корутиной.
+            self._is_coroutine = asyncio.coroutines._is_coroutine
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.acall(request)
+        return self.call(request)
+
+    def call(self, request):
+        raise NotImplementedError
+
+    async def acall(self, request):
+        raise NotImplementedError
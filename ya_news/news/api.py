@@ -0,0 +1,236 @@
+"""
+JSON API для мобильных клиентов, версия 1 (/api/v1/).
+
+Ответы строятся из values(), без создания объектов моделей,
+и кодируются orjson, если он установлен, иначе стандартным json.
+Готовое тело ответа и его gzip-версия хранятся в кеше под версией
+области (news.cache): лента — под LIST_SCOPE, новость и её
+комментарии — под областью новости, поэтому правки сбрасывают их
+так же, как HTML-страницы. ETag — хеш тела ответа.
+"""
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import date, datetime
+from hashlib import md5
+
+from django.conf import settings
+from django.db.models import Q
+from django.http import Http404, HttpResponse, JsonResponse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.dateparse import parse_date
+from django.utils.text import compress_string
+from django.views import generic
+
+from . import cache
+from .models import ArchivedComment, ArchivedNews, Comment, News
+from .pagination import (
+    CURSOR_SEPARATOR, InvalidCursor, decode_cursor, paginate_comments
+)
+from .query_budget import QueryBudgetMixin
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+CONTENT_TYPE = 'application/json'
+FEED_FIELDS = ('id', 'title', 'excerpt', 'date', 'comment_count')
+DETAIL_FIELDS = ('id', 'title', 'text', 'date', 'comment_count')
+
+
+def isoformat(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} не сериализуется в JSON')
+
+
+def dumps(data):
+    """JSON в байтах; orjson и json дают одинаковый результат."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(
+        data, default=isoformat, ensure_ascii=False, separators=(',', ':')
+    ).encode()
+
+
+def encode_news_cursor(row):
+    raw = f'{row["date"].isoformat()}{CURSOR_SEPARATOR}{row["id"]}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_news_cursor(cursor):
+    """Возвращает пару (date, id) из строки курсора."""
+    try:
+        raw = urlsafe_b64decode(cursor.encode()).decode()
+        day, pk = raw.rsplit(CURSOR_SEPARATOR, 1)
+        day = parse_date(day)
+        pk = int(pk)
+    except (Base64Error, UnicodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if day is None:
+        raise InvalidCursor(cursor)
+    return day, pk
+
+
+def feed_page(cursor=None, limit=20):
+    """Новости от новых к старым, листание по ключу (date, id)."""
+    queryset = News.objects.order_by('-date', '-pk')
+    if cursor:
+        day, pk = decode_news_cursor(cursor)
+        queryset = queryset.filter(Q(date__lt=day) | Q(date=day, pk__lt=pk))
+    rows = list(queryset.values(*FEED_FIELDS)[:limit + 1])
+    if len(rows) <= limit:
+        return {'results': rows, 'next': None}
+    rows = rows[:limit]
+    return {'results': rows, 'next': encode_news_cursor(rows[-1])}
+
+
+def comments_page(news_id, cursor=None, model=Comment):
+    """Страница комментариев; для архивной новости model — ArchivedComment."""
+    queryset = model.objects.filter(news_id=news_id).values(
+        'id', 'author__username', 'text', 'created'
+    )
+    comments, next_cursor = paginate_comments(
+        queryset, cursor, settings.COMMENTS_COUNT_ON_PAGE
+    )
+    return {
+        'results': [
+            {
+                'id': comment['id'],
+                'author': comment['author__username'],
+                'text': comment['text'],
+                'created': comment['created'],
+            }
+            for comment in comments
+        ],
+        'next': next_cursor,
+    }
+
+
+def news_detail(news_id):
+    """Новость с первой страницей комментариев, в том числе из архива."""
+    archived = False
+    rows = list(News.objects.filter(pk=news_id).values(*DETAIL_FIELDS))
+    if not rows:
+        archived = True
+        rows = list(
+            ArchivedNews.objects.filter(pk=news_id).values(*DETAIL_FIELDS)
+        )
+    if not rows:
+        raise Http404
+    news = rows[0]
+    news['archived'] = archived
+    news['comments'] = comments_page(
+        news_id, model=ArchivedComment if archived else Comment
+    )
+    return news
+
+
+def news_comments(news_id, cursor=None):
+    page = comments_page(news_id, cursor)
+    if page['results'] or News.objects.filter(pk=news_id).exists():
+        return page
+    if ArchivedNews.objects.filter(pk=news_id).exists():
+        return comments_page(news_id, cursor, ArchivedComment)
+    raise Http404
+
+
+class ApiView(QueryBudgetMixin, generic.View):
+    """
+    Основа представлений API: кеш тела ответа, ETag и gzip.
+
+    Ответ не зависит от пользователя, поэтому сессия не читается
+    и кеш общий для всех клиентов.
+
+    Ответ зависит только от курсора ?after: в ключ кеша попадает
+    разобранный курсор, а другие параметры и порядок параметров
+    новых записей не создают.
+    """
+    # Функция разбора курсора ?after; None — курсор не принимается.
+    cursor_decoder = None
+
+    def get_scope(self):
+        raise NotImplementedError
+
+    def get_data(self):
+        raise NotImplementedError
+
+    def encode(self):
+        body = dumps(self.get_data())
+        return body, compress_string(body), md5(body).hexdigest()
+
+    def get_cursor(self):
+        """Курсор ?after или None, если его нет или он не нужен."""
+        if self.cursor_decoder is None:
+            return None
+        return self.request.GET.get('after') or None
+
+    def get_cache_name(self):
+        name = f'api:v1:{type(self).__name__}'
+        cursor = self.get_cursor()
+        if cursor is None:
+            return name
+        key = md5(repr(self.cursor_decoder(cursor)).encode()).hexdigest()
+        return f'{name}:{key}'
+
+    def get(self, request, *args, **kwargs):
+        try:
+            body, gzipped, digest = cache.cached_data(
+                self.get_scope(), self.get_cache_name(), self.encode
+            )
+        except InvalidCursor:
+            return JsonResponse({'detail': 'Некорректный курсор.'}, status=400)
+        except Http404:
+            return JsonResponse({'detail': 'Новость не найдена.'}, status=404)
+        gzip = bool(re_accepts_gzip.search(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        ))
+        # У сжатого и несжатого представлений разные ETag.
+        etag = f'"{digest}-gzip"' if gzip else f'"{digest}"'
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(
+                gzipped if gzip else body, content_type=CONTENT_TYPE
+            )
+            if gzip:
+                response['Content-Encoding'] = 'gzip'
+        response['ETag'] = etag
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+class NewsFeed(ApiView):
+    """Лента новостей: GET /api/v1/news/?after=<курсор>."""
+    query_budget = 1
+    cursor_decoder = staticmethod(decode_news_cursor)
+
+    def get_scope(self):
+        return cache.LIST_SCOPE
+
+    def get_data(self):
+        return feed_page(self.get_cursor(), settings.NEWS_API_PAGE_SIZE)
+
+
+class NewsItem(ApiView):
+    """Новость с первой страницей комментариев."""
+    query_budget = 3
+
+    def get_scope(self):
+        return cache.detail_scope(self.kwargs['pk'])
+
+    def get_data(self):
+        return news_detail(self.kwargs['pk'])
+
+
+class NewsItemComments(ApiView):
+    """Следующие страницы комментариев: ?after=<курсор>."""
+    query_budget = 3
+    cursor_decoder = staticmethod(decode_cursor)
+
+    def get_scope(self):
+        return cache.detail_scope(self.kwargs['pk'])
+
+    def get_data(self):
+        return news_comments(self.kwargs['pk'], self.get_cursor())
@@ -0,0 +1,15 @@
+from django.urls import path
+from news import api
+
+
+app_name = 'api_v1'
+
+urlpatterns = [
+    path('news/', api.NewsFeed.as_view(), name='feed'),
+    path('news/<int:pk>/', api.NewsItem.as_view(), name='detail'),
+    path(
+        'news/<int:pk>/comments/',
+        api.NewsItemComments.as_view(),
+        name='comments'
+    ),
+]
@@ -0,0 +1,88 @@
+"""
+Перенос старых новостей и их комментариев в архивные таблицы.
+
+Живые таблицы news_news и news_comment, а с ними и индексы, остаются
+небольшими: в них только новости моложе NEWS_ARCHIVE_AFTER_DAYS.
+Главная читает только живые таблицы, страница новости при отсутствии
+живой записи ищет её в архиве. Первичные ключи сохраняются, поэтому
+ссылки на старые новости продолжают работать. В полнотекстовый
+поиск архив не попадает.
+"""
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import cache
+from .models import ArchivedComment, ArchivedNews, Comment, News
+
+NEWS_FIELDS = ('pk', 'title', 'text', 'date', 'comment_count')
+COMMENT_FIELDS = ('pk', 'news_id', 'author_id', 'text', 'created')
+
+
+def archive_cutoff(days):
+    return timezone.localdate() - timedelta(days=days)
+
+
+def delete_rows(model, field, values):
+    """
+    Удаление одним запросом, без сигналов post_delete: счётчики
+    и кеш удаляемых новостей пересчитывать незачем.
+    """
+    placeholders = ', '.join(['%s'] * len(values))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {model._meta.db_table} '
+            f'WHERE {field} IN ({placeholders})',
+            values,
+        )
+
+
+def archive_batch(news_ids, batch_size):
+    """Переносит новости news_ids с комментариями. Возвращает число
+    перенесённых комментариев."""
+    ArchivedNews.objects.bulk_create(
+        ArchivedNews(**dict(zip(NEWS_FIELDS, row)))
+        for row in News.objects.filter(
+            pk__in=news_ids
+        ).values_list(*NEWS_FIELDS)
+    )
+    comments = Comment.objects.filter(
+        news_id__in=news_ids
+    ).order_by().values_list(*COMMENT_FIELDS)
+    moved = 0
+    batch = []
+    for row in comments.iterator(chunk_size=batch_size):
+        batch.append(ArchivedComment(**dict(zip(COMMENT_FIELDS, row))))
+        if len(batch) >= batch_size:
+            ArchivedComment.objects.bulk_create(batch)
+            moved += len(batch)
+            batch = []
+    ArchivedComment.objects.bulk_create(batch)
+    moved += len(batch)
+    delete_rows(Comment, 'news_id', news_ids)
+    delete_rows(News, 'id', news_ids)
+    return moved
+
+
+def archive_news(days, batch_size=500):
+    """
+    Переносит в архив новости старше days дней пачками по batch_size,
+    каждая пачка — отдельная транзакция.
+    Возвращает (новостей, комментариев).
+    """
+    cutoff = archive_cutoff(days)
+    news_total = comments_total = 0
+    while True:
+        with transaction.atomic():
+            news_ids = list(
+                News.objects.filter(date__lt=cutoff).order_by(
+                    'pk'
+                ).values_list('pk', flat=True)[:batch_size]
+            )
+            if not news_ids:
+                break
+            comments_total += archive_batch(news_ids, batch_size)
+        cache.invalidate_news(*news_ids)
+        news_total += len(news_ids)
+    return news_total, comments_total
@@ -0,0 +1,155 @@
+"""
+Кеш отрендеренных страниц новостей.
+
+Страницы не устаревают по времени: у каждой области кеша (список
+новостей, страница конкретной новости) есть версия, которую сигналы
+меняют при изменении News или Comment. Запись с чужой версией считается
+устаревшей и перестраивается. Всё, что сохраняется в кеш, читается
+с основной базы, а не с реплики.
+
+Кеш NEWS_PAGE_CACHE_ALIAS должен быть общим для всех процессов:
+с LocMemCache версия меняется только в процессе, где прошла запись,
+и остальные отдают старые страницы бессрочно (проверка news.W001).
+"""
+from pathlib import Path
+from time import monotonic, sleep
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.urls import reverse
+
+from .routers import primary_reads
+
+PAGE_KEY = 'news:page:{}'
+DATA_KEY = 'news:data:{}:{}'
+VERSION_KEY = 'news:version:{}'
+LOCK_KEY = 'news:lock:{}'
+
+LIST_SCOPE = 'list'
+
+
+def detail_scope(news_id):
+    return f'detail:{news_id}'
+
+
+def get_cache():
+    return caches[settings.NEWS_PAGE_CACHE_ALIAS]
+
+
+def get_version(scope):
+    """Текущая версия области кеша; создаётся при первом обращении."""
+    cache = get_cache()
+    key = VERSION_KEY.format(scope)
+    version = cache.get(key)
+    if version is None:
+        version = uuid4().hex
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def scope_news_id(scope):
+    """pk новости для области её страницы; None для списка."""
+    if scope == LIST_SCOPE:
+        return None
+    return int(scope.split(':')[1])
+
+
+def scope_url(scope):
+    if scope == LIST_SCOPE:
+        return reverse('news:home')
+    return reverse('news:detail', args=(scope_news_id(scope),))
+
+
+def static_page_path(scope):
+    """Файл с заранее отрендеренной страницей области (см. prerender)."""
+    url = scope_url(scope)
+    return Path(settings.NEWS_PRERENDER_DIR) / url.strip('/') / 'index.html'
+
+
+def bump_versions(scopes):
+    get_cache().set_many(
+        {VERSION_KEY.format(scope): uuid4().hex for scope in scopes}, None
+    )
+    if settings.NEWS_PRERENDER_DIR:
+        for scope in scopes:
+            static_page_path(scope).unlink(missing_ok=True)
+
+
+def invalidate(*scopes):
+    """
+    Делает устаревшими все сохранённые страницы указанных областей.
+
+    Заранее отрендеренные файлы этих страниц удаляются: их перестроит
+    фоновый генератор, а до тех пор страница строится обычным путём.
+
+    Внутри транзакции версии меняются ещё раз после COMMIT: читатель
+    с другого соединения до фиксации видит старые строки и мог сохранить
+    их уже под новой версией.
+    """
+    bump_versions(scopes)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: bump_versions(scopes))
+
+
+def invalidate_news(*news_ids):
+    """Сбрасывает список новостей и страницы указанных новостей."""
+    invalidate(LIST_SCOPE, *(detail_scope(news_id) for news_id in news_ids))
+
+
+def cached_data(scope, name, compute):
+    """
+    Небольшие данные, привязанные к версии области кеша.
+
+    В отличие от страниц, пересчёт дешёвый, поэтому без блокировки.
+    """
+    cache = get_cache()
+    version = get_version(scope)
+    key = DATA_KEY.format(scope, name)
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    with primary_reads():
+        value = compute()
+    cache.set(key, (version, value), None)
+    return value
+
+
+def cached_page(scope, render):
+    """
+    Возвращает страницу из кеша или строит её функцией render.
+
+    Защита от «набега» на остывший ключ: перестраивает страницу только
+    тот, кто первым взял блокировку. Остальные в это время получают
+    предыдущую версию страницы, а если её нет — ждут, пока страница
+    появится, но не дольше NEWS_PAGE_CACHE_LOCK_TIMEOUT.
+    """
+    cache = get_cache()
+    version = get_version(scope)
+    key = PAGE_KEY.format(scope)
+    entry = cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+
+    lock_timeout = settings.NEWS_PAGE_CACHE_LOCK_TIMEOUT
+    lock_key = LOCK_KEY.format(scope)
+    if cache.add(lock_key, True, lock_timeout):
+        try:
+            with primary_reads():
+                page = render()
+            cache.set(key, (version, page), None)
+        finally:
+            cache.delete(lock_key)
+        return page
+    if entry is not None:
+        return entry[1]
+
+    deadline = monotonic() + lock_timeout
+    while monotonic() < deadline:
+        sleep(settings.NEWS_PAGE_CACHE_POLL_INTERVAL)
+        entry = cache.get(key)
+        if entry is not None and entry[0] == version:
+            return entry[1]
+    return render()
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Tags, Warning, register
+
+LOCMEM = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@register(Tags.caches)
+def check_page_cache_shared(app_configs, **kwargs):
+    """
+    Версии кеша страниц меняются только в кеше процесса, где прошла
+    запись; с LocMemCache остальные процессы отдают старые страницы
+    без ограничения по времени.
+    """
+    alias = settings.NEWS_PAGE_CACHE_ALIAS
+    if settings.CACHES.get(alias, {}).get('BACKEND') != LOCMEM:
+        return []
+    return [Warning(
+        f'Кеш страниц новостей ({alias}) — LocMemCache, он свой '
+        f'у каждого процесса.',
+        hint='Подходит только для запуска в одном процессе; для '
+             'нескольких воркеров нужен общий кеш, например '
+             'FileBasedCache.',
+        id='news.W001',
+    )]
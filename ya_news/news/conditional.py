@@ -0,0 +1,70 @@
+"""
+Валидаторы для условных GET-запросов к страницам новостей.
+
+ETag считается по дате новости, времени последнего комментария
+и числу комментариев, без рендеринга шаблонов. В него добавляется
+версия кеша страницы (меняется при любой правке новости или
+комментария) и пользователь: авторизованным показываются форма
+и ссылки на правку.
+
+Last-Modified не отдаётся: по этим датам не видна правка текста
+новости или старого комментария, и запрос с одним If-Modified-Since
+получал бы 304 с устаревшей страницей.
+"""
+from hashlib import md5
+
+from django.conf import settings
+from django.db.models import OuterRef, Subquery
+
+from . import cache
+from .models import Comment, News
+
+ATTRIBUTE = '_news_etag'
+
+
+def with_last_comment(queryset):
+    last_comment = Comment.objects.filter(
+        news=OuterRef('pk')
+    ).order_by('-created').values('created')[:1]
+    return queryset.annotate(
+        last_comment=Subquery(last_comment)
+    ).values_list('pk', 'date', 'comment_count', 'last_comment')
+
+
+def user_marker(request):
+    """Часть ETag, которая отличает ответы разным пользователям."""
+    if not request.user.is_authenticated:
+        return 'anonymous'
+    # Форма комментария содержит CSRF-токен, он должен совпадать с cookie.
+    csrf = request.COOKIES.get(settings.CSRF_COOKIE_NAME, '')
+    return f'{request.user.pk}:{csrf}'
+
+
+def get_etag(request, scope, rows):
+    """
+    ETag страницы; считается один раз на запрос.
+
+    Данные из базы хранятся в кеше до смены версии области, так что
+    повторный запрос обходится без обращения к базе.
+    """
+    if not hasattr(request, ATTRIBUTE):
+        rows = cache.cached_data(scope, 'validators', lambda: list(rows))
+        etag = None
+        if rows:
+            etag = md5(repr(
+                (user_marker(request), cache.get_version(scope), rows)
+            ).encode()).hexdigest()
+        setattr(request, ATTRIBUTE, etag)
+    return getattr(request, ATTRIBUTE)
+
+
+def list_etag(request, *args, **kwargs):
+    rows = with_last_comment(
+        News.objects.all()
+    )[:settings.NEWS_COUNT_ON_HOME_PAGE]
+    return get_etag(request, cache.LIST_SCOPE, rows)
+
+
+def detail_etag(request, *args, **kwargs):
+    rows = with_last_comment(News.objects.filter(pk=kwargs['pk']))
+    return get_etag(request, cache.detail_scope(kwargs['pk']), rows)
@@ -0,0 +1,47 @@
+"""
+Анонс новости для главной страницы.
+
+Анонс хранится в News.excerpt, чтобы главная не читала тексты новостей
+целиком и не обрезала их при каждом рендеринге. Его обновляют
+News.save() и News.objects.bulk_create(); после QuerySet.update(text=...)
+и loaddata анонсы восстанавливает команда backfill_excerpts.
+
+Модуль не импортирует модели: его использует и миграция.
+"""
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 15
+
+
+def make_excerpt(text):
+    """То же, что фильтр truncatewords:15."""
+    return Truncator(text).words(EXCERPT_WORDS, truncate=' …')
+
+
+def backfill_excerpts(model, batch_size=1000, only_empty=True):
+    """
+    Пересчитывает анонсы пачками по первичному ключу, каждая пачка —
+    один bulk_update. Возвращает число изменённых новостей.
+    """
+    queryset = model.objects.order_by('pk')
+    if only_empty:
+        queryset = queryset.filter(excerpt='')
+    last_pk = 0
+    changed = 0
+    while True:
+        batch = list(
+            queryset.filter(pk__gt=last_pk).only('text', 'excerpt')[
+                :batch_size
+            ]
+        )
+        if not batch:
+            return changed
+        last_pk = batch[-1].pk
+        stale = []
+        for news in batch:
+            excerpt = make_excerpt(news.text)
+            if news.excerpt != excerpt:
+                news.excerpt = excerpt
+                stale.append(news)
+        model.objects.bulk_update(stale, ['excerpt'])
+        changed += len(stale)
@@ -0,0 +1,136 @@
+"""
+Потоковая выгрузка новостей с комментариями в NDJSON или CSV.
+
+Новости и комментарии читаются двумя запросами через
+iterator(chunk_size), упорядоченными по id новости, и сливаются
+на ходу. Объекты моделей не создаются (values()), комментарии
+новости не собираются в список, а отдаются по одному, поэтому
+в памяти держится одна пачка строк даже для новости с десятками
+тысяч комментариев. Тот же генератор используют представление
+NewsExport и команда export_news.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.text import compress_sequence
+
+from .models import Comment, News
+
+NDJSON = 'ndjson'
+CSV = 'csv'
+CONTENT_TYPES = {
+    NDJSON: 'application/x-ndjson; charset=utf-8',
+    CSV: 'text/csv; charset=utf-8',
+}
+NEWS_FIELDS = ('id', 'title', 'text', 'date', 'comment_count')
+COMMENT_FIELDS = ('id', 'author', 'text', 'created')
+CSV_HEADER = [f'news_{field}' for field in NEWS_FIELDS] + [
+    f'comment_{field}' for field in COMMENT_FIELDS
+]
+
+
+class CommentStream:
+    """Поток комментариев, упорядоченных по id новости."""
+
+    def __init__(self, comments):
+        self.comments = comments
+        self.current = next(comments, None)
+
+    def skip_before(self, news_id):
+        """
+        Пропускает комментарии новостей, которых нет в выборке
+        (удалены между запросами).
+        """
+        while self.current is not None and self.current[0] < news_id:
+            self.current = next(self.comments, None)
+
+    def of(self, news_id):
+        """Комментарии одной новости словарями, по одному."""
+        while self.current is not None and self.current[0] == news_id:
+            comment = self.current
+            self.current = next(self.comments, None)
+            yield dict(zip(COMMENT_FIELDS, comment[1:]))
+
+
+def news_with_comments(date_from=None, date_to=None, chunk_size=2000):
+    """
+    Словари новостей в порядке id, у каждой в comments — итератор
+    её комментариев. Его нужно пройти до перехода к следующей
+    новости; не пройденные комментарии пропускаются.
+    """
+    news = News.objects.order_by('pk')
+    comments = Comment.objects.order_by('news_id', 'created', 'pk')
+    if date_from is not None:
+        news = news.filter(date__gte=date_from)
+        comments = comments.filter(news__date__gte=date_from)
+    if date_to is not None:
+        news = news.filter(date__lte=date_to)
+        comments = comments.filter(news__date__lte=date_to)
+    stream = CommentStream(comments.values_list(
+        'news_id', 'pk', 'author__username', 'text', 'created'
+    ).iterator(chunk_size=chunk_size))
+    for row in news.values(*NEWS_FIELDS).iterator(chunk_size=chunk_size):
+        stream.skip_before(row['id'])
+        row['comments'] = stream.of(row['id'])
+        yield row
+        stream.skip_before(row['id'] + 1)
+
+
+def to_json(value):
+    return json.dumps(value, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+
+def ndjson_lines(rows):
+    """
+    Строка на новость с вложенным списком комментариев; строка
+    собирается по кускам, по комментарию за раз.
+    """
+    for row in rows:
+        comments = row.pop('comments')
+        yield to_json(row)[:-1] + ', "comments": ['
+        separator = ''
+        for comment in comments:
+            yield separator + to_json(comment)
+            separator = ', '
+        yield ']}\n'
+
+
+class Line:
+    """Файлоподобный объект: csv.writer пишет в него одну строку."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    """Строка на комментарий; новость без комментариев — одна строка."""
+    writer = csv.writer(Line())
+    yield writer.writerow(CSV_HEADER)
+    empty = [''] * len(COMMENT_FIELDS)
+    for row in rows:
+        news = [row[field] for field in NEWS_FIELDS]
+        written = False
+        for comment in row['comments']:
+            written = True
+            yield writer.writerow(
+                news + [comment[field] for field in COMMENT_FIELDS]
+            )
+        if not written:
+            yield writer.writerow(news + empty)
+
+
+FORMATTERS = {
+    NDJSON: ndjson_lines,
+    CSV: csv_lines,
+}
+
+
+def export_chunks(export_format, rows, gzip=False):
+    """Байтовые куски выгрузки, при gzip=True — сжатые на лету."""
+    chunks = (
+        line.encode() for line in FORMATTERS[export_format](rows)
+    )
+    if gzip:
+        return compress_sequence(chunks)
+    return chunks
@@ -2,6 +2,8 @@ from django.core.exceptions import ValidationError
 from django.forms import ModelForm
 
 from .models import Comment
+from .moderation import BadWordsSource
+from .timing import FORM, timed
 
 
 BAD_WORDS = (
@@ -11,6 +13,8 @@ BAD_WORDS = (
 )
 WARNING = 'Не ругайтесь!'
 
+bad_words = BadWordsSource(BAD_WORDS)
+
 
 class CommentForm(ModelForm):
 
@@ -18,11 +22,10 @@ class CommentForm(ModelForm):
         model = Comment
         fields = ('text',)
 
+    @timed(FORM)
     def clean_text(self):
         """Не позволяем ругаться в комментариях."""
         text = self.cleaned_data['text']
-        lowered_text = text.lower()
-        for word in BAD_WORDS:
-            if word in lowered_text:
-                raise ValidationError(WARNING)
+        if bad_words.get_matcher().search(text.lower()):
+            raise ValidationError(WARNING)
         return text
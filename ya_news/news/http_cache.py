@@ -0,0 +1,100 @@
+"""
+Заголовки Cache-Control для общих кешей (обратного прокси, CDN).
+
+Политика задаётся в HTTP_CACHE_POLICIES по имени маршрута: аргументы
+patch_cache_control(), обычно max_age и stale_while_revalidate.
+HttpCachePolicyMiddleware применяет её к успешным ответам на GET
+и HEAD:
+
+* анониму — public с заданными сроками;
+* авторизованному пользователю и ответу, который ставит cookie, —
+  private, no-cache: браузер хранит страницу, но сверяет её ETag;
+* ответ, где Cache-Control уже задан представлением, не меняется.
+
+Django добавляет Vary: Cookie, как только прочитана сессия, а для
+проверки пользователя она читается всегда. Из-за этого прокси
+хранил бы отдельную копию страницы на каждый набор cookie, в том
+числе счётчиков и csrftoken. Если в запросе не было cookie сессии,
+страница не зависит от cookie, и Vary: Cookie снимается.
+
+Условие для прокси: запросы с cookie сессии (SESSION_COOKIE_NAME)
+идут мимо общего кеша, например в nginx — proxy_cache_bypass
+и proxy_no_cache по $cookie_sessionid. Иначе авторизованный
+пользователь получил бы из кеша анонимную страницу. Так же ведёт
+себя CachingProxy из команды bench_http_cache.
+
+Правка новости или комментария сбрасывает кеш страниц сразу,
+а в общем кеше страница может оставаться прежней до max_age секунд.
+"""
+from django.conf import settings
+from django.urls import Resolver404, resolve
+from django.utils.cache import cc_delim_re, patch_cache_control
+
+from .aio import AsyncCapableMiddleware, run_sync
+
+CACHEABLE_STATUSES = (200, 304)
+
+
+def get_policy(request):
+    """Политика маршрута запроса или None."""
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    match = request.resolver_match
+    if match is None:
+        # Ответ отдан до вызова представления (news.prerender).
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+    return settings.HTTP_CACHE_POLICIES.get(match.view_name)
+
+
+def remove_vary_cookie(response):
+    if not response.has_header('Vary'):
+        return
+    headers = [
+        header for header in cc_delim_re.split(response['Vary'])
+        if header.lower() != 'cookie'
+    ]
+    if headers:
+        response['Vary'] = ', '.join(headers)
+    else:
+        del response['Vary']
+
+
+def apply_policy(request, response, policy):
+    if (
+        response.status_code not in CACHEABLE_STATUSES
+        or response.has_header('Cache-Control')
+    ):
+        return
+    if response.cookies or request.user.is_authenticated:
+        patch_cache_control(response, private=True, no_cache=True)
+        return
+    patch_cache_control(response, public=True, **policy)
+    if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+        remove_vary_cookie(response)
+
+
+class HttpCachePolicyMiddleware(AsyncCapableMiddleware):
+    """
+    Применяет HTTP_CACHE_POLICIES к ответам.
+
+    Должен стоять выше SessionMiddleware и CsrfViewMiddleware, чтобы
+    видеть добавленные ими Vary и cookie.
+    """
+
+    def call(self, request):
+        response = self.get_response(request)
+        policy = get_policy(request)
+        if policy is not None:
+            apply_policy(request, response, policy)
+        return response
+
+    async def acall(self, request):
+        response = await self.get_response(request)
+        policy = get_policy(request)
+        if policy is not None:
+            # request.user может ещё не быть загружен из сессии.
+            await run_sync(apply_policy, request, response, policy)
+        return response
@@ -0,0 +1,179 @@
+"""
+Отложенная запись комментариев.
+
+При COMMENT_INGEST_MODE = 'queue' проверенный формой комментарий
+не сохраняется в представлении, а попадает в ограниченную очередь.
+Единственный поток-писатель забирает из неё пачки и записывает каждую
+одним bulk_create в одной транзакции, так что SQLite получает одну
+транзакцию вместо сотни.
+
+Если очередь полна дольше COMMENT_QUEUE_PUT_TIMEOUT, комментарий
+сохраняется синхронно: запрос замедляется, но не теряется. Перед
+показом новости автору представление ждёт, пока его собственные
+комментарии из очереди будут записаны. Очередь живёт в процессе,
+поэтому это работает, пока запросы пользователя обслуживает один
+процесс; при остановке процесса очередь дописывается.
+"""
+import atexit
+import logging
+import queue
+import threading
+from time import monotonic
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from .models import Comment
+
+logger = logging.getLogger(__name__)
+
+SYNC = 'sync'
+QUEUE = 'queue'
+
+
+class Ticket:
+    """Квитанция на комментарий в очереди."""
+
+    def __init__(self, comment):
+        self.comment = comment
+        self.done = threading.Event()
+
+
+class CommentQueue:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queue = None
+        self.thread = None
+        # pk автора -> квитанции его ещё не записанных комментариев.
+        self.pending = {}
+
+    def submit(self, comment):
+        """
+        Ставит комментарий в очередь.
+
+        Возвращает False, если очередь выключена или переполнена:
+        тогда комментарий нужно сохранить самому.
+        """
+        if settings.COMMENT_INGEST_MODE != QUEUE:
+            return False
+        self.start()
+        ticket = Ticket(comment)
+        with self.lock:
+            self.pending.setdefault(comment.author_id, set()).add(ticket)
+        try:
+            self.queue.put(
+                ticket, timeout=settings.COMMENT_QUEUE_PUT_TIMEOUT
+            )
+        except queue.Full:
+            self.forget([ticket])
+            logger.warning('Очередь комментариев полна, пишем синхронно.')
+            return False
+        return True
+
+    def wait_for_author(self, user, timeout=None):
+        """Ждёт записи комментариев пользователя, стоящих в очереди."""
+        if not user.is_authenticated:
+            return
+        with self.lock:
+            tickets = list(self.pending.get(user.pk, ()))
+        if not tickets:
+            return
+        if timeout is None:
+            timeout = settings.COMMENT_QUEUE_WAIT_TIMEOUT
+        deadline = monotonic() + timeout
+        for ticket in tickets:
+            if not ticket.done.wait(max(deadline - monotonic(), 0)):
+                logger.warning(
+                    'Комментарии пользователя %s ещё не записаны.', user.pk
+                )
+                return
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.queue = queue.Queue(settings.COMMENT_QUEUE_SIZE)
+            self.thread = threading.Thread(
+                target=self.run, name='comment-writer', daemon=True
+            )
+            self.thread.start()
+            atexit.register(self.stop)
+
+    def stop(self):
+        """Дописывает очередь и останавливает поток-писатель."""
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is None:
+            return
+        self.queue.put(None)
+        thread.join()
+        atexit.unregister(self.stop)
+
+    def flush(self):
+        """Ждёт, пока всё, что уже в очереди, будет записано."""
+        if self.queue is not None:
+            self.queue.join()
+
+    def run(self):
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self.queue.get()]
+                while len(batch) < settings.COMMENT_QUEUE_BATCH_SIZE:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if None in batch:
+                    stopping = True
+                tickets = [ticket for ticket in batch if ticket is not None]
+                try:
+                    self.write(tickets)
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+        finally:
+            connection.close()
+
+    def write(self, tickets):
+        """
+        Пишет пачку одной транзакцией. Если транзакция не прошла,
+        например новость успели удалить, комментарии пишутся по одному,
+        чтобы один неудачный не потянул за собой остальные.
+
+        Кеш страниц и валидаторы сбрасываются ещё раз после COMMIT
+        (см. cache.invalidate), а квитанции закрываются только после
+        выхода из транзакции: дождавшийся автор не получит ETag или
+        страницу без своего комментария.
+        """
+        if not tickets:
+            return
+        try:
+            with transaction.atomic():
+                Comment.objects.bulk_create(
+                    ticket.comment for ticket in tickets
+                )
+        except Exception:
+            logger.exception('Пачка комментариев не записана целиком.')
+            for ticket in tickets:
+                try:
+                    with transaction.atomic():
+                        Comment.objects.bulk_create([ticket.comment])
+                except Exception:
+                    logger.exception('Комментарий не записан.')
+        finally:
+            self.forget(tickets)
+
+    def forget(self, tickets):
+        with self.lock:
+            for ticket in tickets:
+                author_tickets = self.pending.get(ticket.comment.author_id)
+                if author_tickets is not None:
+                    author_tickets.discard(ticket)
+                    if not author_tickets:
+                        del self.pending[ticket.comment.author_id]
+                ticket.done.set()
+
+
+comment_queue = CommentQueue()
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news.archive import archive_news
+
+
+class Command(BaseCommand):
+    help = (
+        'Переносит старые новости вместе с комментариями '
+        'в архивные таблицы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=settings.NEWS_ARCHIVE_AFTER_DAYS,
+            help='Возраст новости в днях, после которого она уходит в архив.',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Сколько новостей переносить за одну транзакцию.',
+        )
+
+    def handle(self, *args, **options):
+        news, comments = archive_news(
+            options['older_than'], options['batch_size']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'В архив перенесено новостей: {news}, комментариев: {comments}.'
+        ))
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from news.excerpts import backfill_excerpts
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает анонсы новостей пачками: после loaddata, '
+        'QuerySet.update(text=...) или смены длины анонса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько новостей обновлять одним запросом.',
+        )
+        parser.add_argument(
+            '--all', action='store_true',
+            help='Сверить все анонсы, а не только пустые.',
+        )
+
+    def handle(self, *args, **options):
+        changed = backfill_excerpts(
+            News, options['batch_size'], only_empty=not options['all']
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено анонсов: {changed}.'
+        ))
@@ -0,0 +1,117 @@
+from time import perf_counter
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from news.management.commands.bench_routes import Rollback, measure
+from news.models import Comment, News
+
+
+class LegacyCommentInline(admin.StackedInline):
+    """Прежний вариант: все комментарии и select со всеми авторами."""
+    model = Comment
+    extra = 0
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет страницу новости с большим числом комментариев '
+        'в админке и удаление комментариев: прежний вариант и текущий.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--comments', type=int, default=10000)
+        parser.add_argument('--authors', type=int, default=1000)
+        parser.add_argument('--requests', type=int, default=5)
+        parser.add_argument(
+            '--skip-legacy', action='store_true',
+            help='Прежний вариант на 10 тысячах комментариев '
+                 'рендерится часами.',
+        )
+
+    def handle(self, *args, **options):
+        # Без setup_test_environment: тестовый клиент копировал бы
+        # контекст каждого шаблона виджета, а их тысячи.
+        try:
+            with override_settings(ALLOWED_HOSTS=['testserver']), \
+                    transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        news = self.create_news(options['comments'], options['authors'])
+        client = Client()
+        client.force_login(User.objects.create_superuser('bench-admin'))
+        news_admin = admin.site._registry[News]
+        url = reverse('admin:news_news_change', args=(news.pk,))
+        self.stdout.write(
+            f'{"вариант":<10} {"p50, мс":>10} {"запросов":>9} '
+            f'{"КБ":>8}'
+        )
+        inlines = news_admin.inlines
+        variants = [('прежний', [LegacyCommentInline]), ('текущий', inlines)]
+        if options['skip_legacy']:
+            variants = variants[1:]
+        for label, variant in variants:
+            news_admin.inlines = variant
+            try:
+                result = measure(client, url, options['requests'])
+            finally:
+                news_admin.inlines = inlines
+            self.stdout.write(
+                f'{label:<10} {result["p50_ms"]:>10.1f} '
+                f'{result["queries"]:>9} {result["bytes"] / 1024:>8.0f}'
+            )
+        self.measure_delete(news)
+
+    @staticmethod
+    def create_news(comments, authors):
+        news = News.objects.create(title='Bench admin', text='Bench')
+        User.objects.bulk_create(
+            User(username=f'bench-admin-{i}') for i in range(authors)
+        )
+        author_ids = list(User.objects.filter(
+            username__startswith='bench-admin-'
+        ).values_list('pk', flat=True))
+        Comment.objects.bulk_create(
+            Comment(
+                news=news, author_id=author_ids[i % len(author_ids)],
+                text=f'Комментарий {i}',
+            )
+            for i in range(comments)
+        )
+        return news
+
+    def measure_delete(self, news):
+        """Удаление всех комментариев новости: через Collector и одним
+        запросом; каждое — в откатываемой точке сохранения."""
+        comments = Comment.objects.filter(news=news)
+        for label, delete in (
+            ('delete()', lambda: comments.delete()),
+            ('bulk_delete()', lambda: comments.bulk_delete()),
+        ):
+            try:
+                with transaction.atomic():
+                    # CaptureQueriesContext хранит не больше 9000 запросов.
+                    queries = []
+                    with connection.execute_wrapper(
+                        lambda execute, sql, *args: (
+                            queries.append(sql) or execute(sql, *args)
+                        )
+                    ):
+                        started = perf_counter()
+                        delete()
+                        elapsed = (perf_counter() - started) * 1000
+                    raise Rollback
+            except Rollback:
+                pass
+            self.stdout.write(
+                f'{label:<14} {elapsed:>10.1f} мс {len(queries):>7} запросов'
+            )
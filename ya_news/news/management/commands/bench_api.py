@@ -0,0 +1,94 @@
+from time import perf_counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.template.loader import render_to_string
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from news import api
+from news.management.commands.bench_routes import Rollback, measure
+from news.models import News
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает сериализацию ленты новостей в JSON (orjson и json) '
+        'с рендерингом шаблона главной и замеряет запросы к API '
+        'и к HTML-страницам с кешем и без.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=1000)
+        parser.add_argument('--page-size', type=int, default=20)
+        parser.add_argument('--rounds', type=int, default=500)
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=['testserver'],
+                NEWS_API_PAGE_SIZE=options['page_size'],
+                NEWS_COUNT_ON_HOME_PAGE=options['page_size'],
+            ), transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        News.objects.bulk_create(
+            News(title=f'Bench API {i}', text='Текст новости. ' * 200)
+            for i in range(options['news'])
+        )
+        self.serialization(options['page_size'], options['rounds'])
+        self.requests(options['requests'])
+
+    def serialization(self, page_size, rounds):
+        """Только кодирование уже загруженной страницы ленты."""
+        rows = api.feed_page(limit=page_size)
+        news = list(News.objects.defer('text')[:page_size])
+        orjson = api.orjson
+        variants = [
+            ('шаблон', lambda: render_to_string(
+                'news/home.html', {'object_list': news}
+            )),
+            ('json', lambda: api.dumps(rows)),
+        ]
+        if orjson is not None:
+            variants.append(('orjson', lambda: api.dumps(rows)))
+        self.stdout.write(f'{"кодирование":<12} {"страниц/с":>11}')
+        for label, encode in variants:
+            api.orjson = orjson if label == 'orjson' else None
+            try:
+                started = perf_counter()
+                for _ in range(rounds):
+                    encode()
+                elapsed = perf_counter() - started
+            finally:
+                api.orjson = orjson
+            self.stdout.write(f'{label:<12} {rounds / elapsed:>11.0f}')
+
+    def requests(self, requests):
+        """Полный запрос: первая страница ленты API и главная."""
+        client = Client()
+        self.stdout.write(
+            f'{"маршрут":<16} {"кеш":<5} {"p50, мс":>9} {"КБ":>6}'
+        )
+        for route in ('api_v1:feed', 'news:home'):
+            url = reverse(route)
+            for cached in (False, True):
+                alias = settings.NEWS_PAGE_CACHE_ALIAS
+                overrides = {} if cached else {'CACHES': {alias: {
+                    'BACKEND': 'django.core.cache.backends.dummy.'
+                               'DummyCache',
+                }}}
+                with override_settings(**overrides):
+                    result = measure(client, url, requests)
+                self.stdout.write(
+                    f'{route:<16} {"да" if cached else "нет":<5} '
+                    f'{result["p50_ms"]:>9.2f} '
+                    f'{result["bytes"] / 1024:>6.1f}'
+                )
@@ -0,0 +1,235 @@
+import asyncio
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth import (
+    BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY,
+)
+from django.contrib.auth.models import User
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.urls import reverse
+from django.utils.module_loading import import_string
+
+from news.management.commands.bench_routes import percentile
+from news.models import Comment, News
+
+USERNAME = 'bench-asgi'
+HOST = 'localhost'
+# Вариант: (сервер, NEWS_ASYNC_VIEWS).
+VARIANTS = {
+    'wsgi': ('wsgi', '0'),
+    'asgi-sync': ('asgi', '0'),
+    'asgi-async': ('asgi', '1'),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность при конкурентных '
+        'соединениях: WSGI с потоками, ASGI с синхронными '
+        'представлениями и ASGI с асинхронными (news/aio.py). '
+        'Каждый вариант запускается в отдельном процессе; данные '
+        'создаются в настроенной базе и удаляются после замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=32,
+            help='Одновременных соединений (потоков WSGI-сервера).',
+        )
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--comments', type=int, default=50)
+        parser.add_argument('--variant', choices=tuple(VARIANTS))
+        parser.add_argument('--cookie', help='Служебный: cookie сессии.')
+        parser.add_argument('--news-id', type=int, help='Служебный.')
+
+    def handle(self, *args, **options):
+        if options['variant']:
+            self.load(options)
+            return
+        user = User.objects.create_user(username=USERNAME)
+        news = News.objects.create(title='Bench ASGI', text='Bench')
+        Comment.objects.bulk_create(
+            Comment(news=news, author=user, text=f'Комментарий {i}')
+            for i in range(options['comments'])
+        )
+        try:
+            self.stdout.write(
+                f'Соединений: {options["concurrency"]}, '
+                f'секунд на вариант: {options["seconds"]}'
+            )
+            self.stdout.write(
+                f'{"вариант":<11} {"запр./с":>9} {"p50, мс":>9} '
+                f'{"p95, мс":>9} {"ошибок":>7}'
+            )
+            cookie = self.login(user)
+            for variant in VARIANTS:
+                result = self.spawn(variant, news, cookie, options)
+                self.stdout.write(
+                    f'{variant:<11} {result["rps"]:>9.1f} '
+                    f'{result["p50_ms"]:>9.1f} {result["p95_ms"]:>9.1f} '
+                    f'{result["errors"]:>7}'
+                )
+        finally:
+            news.delete()
+            user.delete()
+
+    @staticmethod
+    def login(user):
+        """Cookie сессии авторизованного пользователя: его страницы
+        не берутся из кеша и обращаются к базе."""
+        store = import_string(f'{settings.SESSION_ENGINE}.SessionStore')()
+        store[SESSION_KEY] = str(user.pk)
+        store[BACKEND_SESSION_KEY] = settings.AUTHENTICATION_BACKENDS[0]
+        store[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        store.save()
+        return f'{settings.SESSION_COOKIE_NAME}={store.session_key}'
+
+    @staticmethod
+    def spawn(variant, news, cookie, options):
+        env = {
+            **os.environ,
+            'NEWS_ASYNC_VIEWS': VARIANTS[variant][1],
+            'SERVER_TIMING_SAMPLE_RATE': '0',
+        }
+        output = subprocess.run(
+            [
+                sys.executable, str(settings.BASE_DIR / 'manage.py'),
+                'bench_asgi', '--variant', variant,
+                '--news-id', str(news.pk), '--cookie', cookie,
+                '--concurrency', str(options['concurrency']),
+                '--seconds', str(options['seconds']),
+            ],
+            env=env, check=True, capture_output=True, text=True,
+        ).stdout
+        return json.loads(output.splitlines()[-1])
+
+    def load(self, options):
+        paths = [
+            reverse('news:home'),
+            reverse('news:detail', args=(options['news_id'],)),
+        ]
+        server = VARIANTS[options['variant']][0]
+        run = self.run_wsgi if server == 'wsgi' else self.run_asgi
+        timings, errors = run(
+            paths, options['cookie'].encode(),
+            options['concurrency'], options['seconds'],
+        )
+        self.stdout.write(json.dumps({
+            'rps': len(timings) / options['seconds'],
+            'p50_ms': percentile(timings, 50),
+            'p95_ms': percentile(timings, 95),
+            'errors': errors,
+        }))
+
+    @staticmethod
+    def run_wsgi(paths, cookie, concurrency, seconds):
+        """Как многопоточный WSGI-сервер: соединение — поток."""
+        handler = WSGIHandler()
+        timings = []
+        errors = []
+        barrier = threading.Barrier(concurrency + 1)
+        deadline = []
+
+        def worker(number):
+            statuses = []
+
+            def start_response(status, headers, exc_info=None):
+                statuses.append(status)
+
+            barrier.wait()
+            i = number
+            while perf_counter() < deadline[0]:
+                environ = {
+                    'REQUEST_METHOD': 'GET',
+                    'PATH_INFO': paths[i % len(paths)],
+                    'QUERY_STRING': '',
+                    'SERVER_NAME': HOST,
+                    'SERVER_PORT': '80',
+                    'SERVER_PROTOCOL': 'HTTP/1.1',
+                    'HTTP_HOST': HOST,
+                    'HTTP_COOKIE': cookie.decode(),
+                    'wsgi.input': io.BytesIO(),
+                    'wsgi.url_scheme': 'http',
+                }
+                started = perf_counter()
+                result = handler(environ, start_response)
+                b''.join(result)
+                result.close()
+                timings.append((perf_counter() - started) * 1000)
+                if not statuses.pop().startswith('200'):
+                    errors.append(1)
+                i += 1
+
+        threads = [
+            threading.Thread(target=worker, args=(number,))
+            for number in range(concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        deadline.append(perf_counter() + seconds)
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+        return timings, len(errors)
+
+    @staticmethod
+    def run_asgi(paths, cookie, concurrency, seconds):
+        """Как ASGI-сервер: соединение — задача в цикле событий."""
+        application = ASGIHandler()
+        timings = []
+        errors = []
+
+        async def request(path):
+            statuses = []
+
+            async def receive():
+                return {'type': 'http.request', 'body': b''}
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses.append(message['status'])
+
+            await application({
+                'type': 'http',
+                'asgi': {'version': '3.0'},
+                'http_version': '1.1',
+                'method': 'GET',
+                'scheme': 'http',
+                'path': path,
+                'raw_path': path.encode(),
+                'query_string': b'',
+                'root_path': '',
+                'headers': [(b'host', HOST.encode()), (b'cookie', cookie)],
+                'client': ('127.0.0.1', 50000),
+                'server': (HOST, 80),
+            }, receive, send)
+            return statuses[0]
+
+        async def connection(number, deadline):
+            i = number
+            while perf_counter() < deadline:
+                started = perf_counter()
+                status = await request(paths[i % len(paths)])
+                timings.append((perf_counter() - started) * 1000)
+                if status != 200:
+                    errors.append(status)
+                i += 1
+
+        async def main():
+            deadline = perf_counter() + seconds
+            await asyncio.gather(*(
+                connection(number, deadline)
+                for number in range(concurrency)
+            ))
+
+        asyncio.run(main())
+        return timings, len(errors)
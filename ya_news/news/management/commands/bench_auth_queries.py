@@ -0,0 +1,75 @@
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import (
+    CaptureQueriesContext, override_settings, setup_test_environment,
+)
+from django.urls import reverse
+
+from news.management.commands.bench_routes import Rollback, percentile
+from news.models import News
+
+VARIANTS = (
+    ('без кеша', {
+        'SESSION_ENGINE': 'django.contrib.sessions.backends.db',
+        'AUTHENTICATION_BACKENDS': [
+            'django.contrib.auth.backends.ModelBackend'
+        ],
+    }),
+    ('с кешем', {}),
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Считает SQL-запросы и латентность авторизованного запроса '
+        'с кешем сессии и пользователя и без него.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100)
+
+    def handle(self, *args, **options):
+        try:
+            setup_test_environment()
+        except RuntimeError:
+            pass
+        self.stdout.write(
+            f'{"вариант":<10} {"маршрут":<14} {"запросов":>9} '
+            f'{"p50, мс":>9}'
+        )
+        try:
+            with transaction.atomic():
+                self.run(options['requests'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, requests):
+        user = User.objects.create_user(username='bench-auth-user')
+        news = News.objects.create(title='Bench', text='Bench')
+        urls = {
+            'news:home': reverse('news:home'),
+            'news:comments': reverse('news:comments', args=(news.pk,)),
+        }
+        for label, overrides in VARIANTS:
+            with override_settings(**overrides):
+                client = Client()
+                client.force_login(user)
+                for route, url in urls.items():
+                    client.get(url)
+                    timings = []
+                    for _ in range(requests):
+                        with CaptureQueriesContext(connection) as queries:
+                            started = perf_counter()
+                            client.get(url)
+                            timings.append(
+                                (perf_counter() - started) * 1000
+                            )
+                    self.stdout.write(
+                        f'{label:<10} {route:<14} {len(queries):>9} '
+                        f'{percentile(timings, 50):>9.2f}'
+                    )
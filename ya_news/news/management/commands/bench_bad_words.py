@@ -0,0 +1,69 @@
+import random
+from timeit import Timer
+
+from django.core.management.base import BaseCommand
+
+from news.moderation import WordMatcher
+
+ALPHABET = 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'
+
+
+def naive_search(words, text):
+    """Прежняя проверка: поиск каждого слова по всему тексту."""
+    for word in words:
+        if word in text:
+            return True
+    return False
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает проверку запрещённых слов циклом и автоматом '
+        'Ахо — Корасик на списках разного размера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+', default=[10, 1000, 50000],
+            help='Размеры списков запрещённых слов.',
+        )
+        parser.add_argument(
+            '--text-length', type=int, default=2000,
+            help='Длина проверяемого комментария в символах.',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        # Худший случай для цикла: в тексте нет ни одного слова.
+        text = ''.join(
+            rng.choice(ALPHABET + ' ') for _ in range(options['text_length'])
+        )
+        self.stdout.write(
+            f'{"слов":>8} {"цикл, мс":>12} {"автомат, мс":>12} '
+            f'{"сборка, мс":>12} {"ускорение":>10}'
+        )
+        for size in options['sizes']:
+            words = {
+                ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(6, 9)))
+                for _ in range(size)
+            }
+            words = [word for word in words if word not in text]
+            build = Timer(lambda: WordMatcher(words)).timeit(1)
+            matcher = WordMatcher(words)
+            naive = self.measure(
+                lambda: naive_search(words, text), options['repeat']
+            )
+            compiled = self.measure(
+                lambda: matcher.search(text), options['repeat']
+            )
+            self.stdout.write(
+                f'{size:>8} {naive * 1000:>12.3f} {compiled * 1000:>12.3f} '
+                f'{build * 1000:>12.1f} {naive / compiled:>9.1f}x'
+            )
+
+    @staticmethod
+    def measure(func, repeat):
+        """Лучшее время одного вызова из нескольких повторов."""
+        return min(Timer(func).repeat(repeat=repeat, number=1))
@@ -0,0 +1,103 @@
+import threading
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment
+from django.urls import reverse
+
+from news.ingest import QUEUE, SYNC, comment_queue
+from news.management.commands.bench_routes import percentile
+from news.models import Comment, News
+
+USERNAME = 'bench-ingest-{}'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность конкурентной отправки '
+        'комментариев к одной новости в режимах sync и queue. '
+        'Данные создаются в настроенной базе и удаляются после замера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument(
+            '--posts', type=int, default=50,
+            help='Комментариев от каждого потока.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            setup_test_environment()
+        except RuntimeError:
+            pass
+        threads = options['threads']
+        users = [
+            User.objects.create_user(username=USERNAME.format(i))
+            for i in range(threads)
+        ]
+        news = News.objects.create(title='Bench', text='Bench')
+        try:
+            self.stdout.write(
+                f'Потоков: {threads}, комментариев от потока: '
+                f'{options["posts"]}'
+            )
+            self.stdout.write(
+                f'{"режим":<6} {"комм./с":>9} {"p50, мс":>9} '
+                f'{"p95, мс":>9} {"записано":>9}'
+            )
+            for mode in (SYNC, QUEUE):
+                with override_settings(COMMENT_INGEST_MODE=mode):
+                    self.run(mode, news, users, options['posts'])
+                Comment.objects.filter(news=news).delete()
+        finally:
+            comment_queue.stop()
+            news.delete()
+            User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def run(self, mode, news, users, posts):
+        url = reverse('news:detail', args=(news.pk,))
+        clients = []
+        for user in users:
+            client = Client()
+            client.force_login(user)
+            clients.append(client)
+        timings = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(len(clients) + 1)
+
+        def worker(client):
+            own = []
+            try:
+                barrier.wait()
+                for i in range(posts):
+                    started = perf_counter()
+                    client.post(url, {'text': f'Комментарий {i}'})
+                    own.append((perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+            with lock:
+                timings.extend(own)
+
+        workers = [
+            threading.Thread(target=worker, args=(client,))
+            for client in clients
+        ]
+        for thread in workers:
+            thread.start()
+        barrier.wait()
+        started = perf_counter()
+        for thread in workers:
+            thread.join()
+        # Очередь должна быть дописана, иначе сравнение нечестное.
+        comment_queue.flush()
+        elapsed = perf_counter() - started
+        written = Comment.objects.filter(news=news).count()
+        self.stdout.write(
+            f'{mode:<6} {written / elapsed:>9.0f} '
+            f'{percentile(timings, 50):>9.2f} '
+            f'{percentile(timings, 95):>9.2f} {written:>9}'
+        )
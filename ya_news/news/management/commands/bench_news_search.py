@@ -0,0 +1,127 @@
+import random
+import sqlite3
+import tempfile
+from importlib import import_module
+from pathlib import Path
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from faker import Faker
+
+from news.management.commands.bench_routes import percentile
+from news.search import (
+    MATCH_END, MATCH_START, SEARCH_SQL, SNIPPET_TOKENS, TEXT_WEIGHT,
+    TITLE_WEIGHT, build_match,
+)
+
+search_migration = import_module('news.migrations.0004_news_search')
+
+SCHEMA = '''
+    CREATE TABLE news_news (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        text TEXT NOT NULL,
+        date TEXT NOT NULL,
+        comment_count INTEGER NOT NULL DEFAULT 0
+    )
+'''
+INSERT_SQL = 'INSERT INTO news_news (title, text, date) VALUES (?, ?, ?)'
+# Так выглядел бы поиск через icontains: полный проход по таблице.
+LIKE_SQL = (
+    'SELECT id, title, date FROM news_news '
+    'WHERE title LIKE ? OR text LIKE ? ORDER BY date DESC, id LIMIT 10'
+)
+TEXT_POOL_SIZE = 1000
+BATCH_SIZE = 10000
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает поиск по FTS5-индексу news_search с поиском через '
+        'LIKE на отдельной временной базе с заданным числом новостей.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=1000000)
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument(
+            '--like-queries', type=int, default=5,
+            help='LIKE медленный, поэтому замеров меньше.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        faker = Faker('ru_RU')
+        faker.seed_instance(options['seed'])
+        texts = [
+            faker.paragraph(nb_sentences=3) for _ in range(TEXT_POOL_SIZE)
+        ]
+        words = sorted({
+            word.strip('.,').lower()
+            for text in texts for word in text.split() if len(word) > 5
+        })
+        with tempfile.TemporaryDirectory() as directory:
+            connection = sqlite3.connect(str(Path(directory) / 'search.db'))
+            self.fill(connection, rng, faker, texts, options['news'])
+            queries = [rng.choice(words) for _ in range(options['queries'])]
+            fts = self.measure(connection, queries, self.search_fts)
+            like = self.measure(
+                connection, queries[:options['like_queries']],
+                self.search_like,
+            )
+            connection.close()
+        self.stdout.write(
+            f'{"способ":<6} {"запросов":>9} {"p50, мс":>10} {"p95, мс":>10}'
+        )
+        for name, timings in (('fts5', fts), ('like', like)):
+            self.stdout.write(
+                f'{name:<6} {len(timings):>9} '
+                f'{percentile(timings, 50):>10.2f} '
+                f'{percentile(timings, 95):>10.2f}'
+            )
+
+    def fill(self, connection, rng, faker, texts, count):
+        """Новости пишутся до создания индекса, потом он строится разом."""
+        started = perf_counter()
+        connection.execute(SCHEMA)
+        for start in range(0, count, BATCH_SIZE):
+            connection.executemany(INSERT_SQL, [
+                (
+                    faker.sentence(nb_words=4)[:50],
+                    '\n\n'.join(rng.choices(texts, k=2)),
+                    f'2022-{rng.randint(1, 12):02}-{rng.randint(1, 28):02}',
+                )
+                for _ in range(min(BATCH_SIZE, count - start))
+            ])
+        connection.commit()
+        loaded = perf_counter()
+        for sql in search_migration.CREATE_SQL:
+            connection.execute(sql)
+        connection.commit()
+        self.stdout.write(
+            f'Новостей: {count}, загрузка {loaded - started:.1f} с, '
+            f'индекс {perf_counter() - loaded:.1f} с.'
+        )
+
+    @staticmethod
+    def measure(connection, queries, search):
+        timings = []
+        for query in queries:
+            started = perf_counter()
+            search(connection, query)
+            timings.append((perf_counter() - started) * 1000)
+        return timings
+
+    @staticmethod
+    def search_fts(connection, query):
+        sql = SEARCH_SQL.format(where='').replace('%s', '?')
+        return connection.execute(sql, (
+            TITLE_WEIGHT, TEXT_WEIGHT, MATCH_START, MATCH_END,
+            SNIPPET_TOKENS, build_match(query), 11,
+        )).fetchall()
+
+    @staticmethod
+    def search_like(connection, query):
+        pattern = f'%{query}%'
+        return connection.execute(LIKE_SQL, (pattern, pattern)).fetchall()
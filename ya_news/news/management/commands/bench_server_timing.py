@@ -0,0 +1,98 @@
+import io
+import logging
+from time import perf_counter
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment
+from django.urls import reverse
+
+from news import cache
+from news.management.commands.bench_routes import Rollback, percentile
+from news.models import News
+
+MIDDLEWARE = 'news.timing.ServerTimingMiddleware'
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает латентность страниц без ServerTimingMiddleware, '
+        'с ним при нулевой выборке и при замере каждого запроса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--news', type=int, default=100)
+        parser.add_argument('--requests', type=int, default=200)
+
+    def handle(self, *args, **options):
+        try:
+            setup_test_environment()
+        except RuntimeError:
+            pass
+        try:
+            with transaction.atomic():
+                self.run(options['news'], options['requests'])
+                raise Rollback
+        except Rollback:
+            pass
+        finally:
+            cache.invalidate(cache.LIST_SCOPE)
+
+    def run(self, news_count, requests):
+        call_command(
+            'generate_news_data', users=10, news=news_count, comments=20,
+            stdout=io.StringIO(),
+        )
+        news = News.objects.order_by('-comment_count').first()
+        user = User.objects.create_user(username='bench-timing-user')
+        client = Client()
+        client.force_login(user)
+        urls = {
+            'news:home': reverse('news:home'),
+            'news:detail': reverse('news:detail', args=(news.pk,)),
+        }
+        without = [name for name in settings.MIDDLEWARE if name != MIDDLEWARE]
+        variants = (
+            ('выключен', {'MIDDLEWARE': without}),
+            ('выборка 0', {'SERVER_TIMING_SAMPLE_RATE': 0}),
+            ('выборка 1', {'SERVER_TIMING_SAMPLE_RATE': 1}),
+        )
+        self.stdout.write(
+            f'{"маршрут":<12} {"вариант":<10} {"p50, мс":>9} '
+            f'{"p95, мс":>9} {"прирост p50":>12}'
+        )
+        # Строки лога не должны влиять на замер.
+        logging.disable(logging.INFO)
+        try:
+            for route, url in urls.items():
+                timings = self.measure(client, url, variants, requests)
+                base = percentile(timings[variants[0][0]], 50)
+                for label, _ in variants:
+                    p50 = percentile(timings[label], 50)
+                    self.stdout.write(
+                        f'{route:<12} {label:<10} {p50:>9.3f} '
+                        f'{percentile(timings[label], 95):>9.3f} '
+                        f'{(p50 / base - 1) * 100:>11.1f}%'
+                    )
+        finally:
+            logging.disable(logging.NOTSET)
+
+    @staticmethod
+    def measure(client, url, variants, requests):
+        """
+        Варианты чередуются от запроса к запросу, чтобы дрейф
+        производительности машины сказывался на них одинаково.
+        """
+        client.get(url)
+        timings = {label: [] for label, _ in variants}
+        for _ in range(requests):
+            for label, overrides in variants:
+                with override_settings(**overrides):
+                    started = perf_counter()
+                    client.get(url)
+                    timings[label].append((perf_counter() - started) * 1000)
+        return timings
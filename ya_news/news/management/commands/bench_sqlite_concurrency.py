@@ -0,0 +1,161 @@
+import random
+import sqlite3
+import tempfile
+import threading
+from pathlib import Path
+from time import monotonic
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from yanews.sqlite_backend.base import apply_pragmas
+
+SCHEMA = '''
+    CREATE TABLE news (
+        id INTEGER PRIMARY KEY,
+        title TEXT NOT NULL,
+        comment_count INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE TABLE comment (
+        id INTEGER PRIMARY KEY,
+        news_id INTEGER NOT NULL REFERENCES news (id),
+        text TEXT NOT NULL,
+        created REAL NOT NULL
+    );
+    CREATE INDEX comment_news_created ON comment (news_id, created, id);
+'''
+READ_SQL = (
+    'SELECT id, text, created FROM comment WHERE news_id = ? '
+    'ORDER BY created, id LIMIT 50'
+)
+NEWS_SQL = 'SELECT id, title FROM news WHERE id = ?'
+INSERT_SQL = 'INSERT INTO comment (news_id, text, created) VALUES (?, ?, ?)'
+COUNT_SQL = 'UPDATE news SET comment_count = comment_count + 1 WHERE id = ?'
+
+
+class Profile:
+    """Как приложение работает с базой в одном из профилей настроек."""
+
+    def __init__(self, name, pragmas, transaction_mode, persistent):
+        self.name = name
+        self.pragmas = pragmas
+        self.begin = ' '.join(filter(None, ('BEGIN', transaction_mode)))
+        self.persistent = persistent
+
+    def connect(self, path):
+        # Как Django: автокоммит, таймаут по умолчанию 5 секунд.
+        connection = sqlite3.connect(
+            path, isolation_level=None, check_same_thread=False
+        )
+        apply_pragmas(connection, self.pragmas)
+        return connection
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает пропускную способность SQLite при конкурентных '
+        'чтениях и записях в профилях development и production.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument(
+            '--write-ratio', type=float, default=0.2,
+            help='Доля операций записи.',
+        )
+        parser.add_argument('--news', type=int, default=100)
+
+    def handle(self, *args, **options):
+        production = settings.DATABASE_PROFILES['production']
+        profiles = [
+            Profile('development', {}, None, persistent=False),
+            Profile(
+                'production',
+                production['PRAGMAS'],
+                production['TRANSACTION_MODE'],
+                persistent=True,
+            ),
+        ]
+        self.stdout.write(
+            f'Потоков: {options["threads"]}, '
+            f'доля записи: {options["write_ratio"]:.0%}'
+        )
+        self.stdout.write(
+            f'{"профиль":<12} {"чтений/с":>10} {"записей/с":>10} '
+            f'{"locked":>8}'
+        )
+        for profile in profiles:
+            with tempfile.TemporaryDirectory() as directory:
+                path = str(Path(directory) / 'bench.sqlite3')
+                self.prepare(path, options['news'])
+                reads, writes, errors = self.run(profile, path, options)
+            seconds = options['seconds']
+            self.stdout.write(
+                f'{profile.name:<12} {reads / seconds:>10.0f} '
+                f'{writes / seconds:>10.0f} {errors:>8}'
+            )
+
+    def prepare(self, path, news_count):
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        connection.executemany(
+            'INSERT INTO news (title) VALUES (?)',
+            [(f'News {i}',) for i in range(news_count)],
+        )
+        connection.commit()
+        connection.close()
+
+    def run(self, profile, path, options):
+        totals = {'reads': 0, 'writes': 0, 'errors': 0}
+        lock = threading.Lock()
+        deadline = monotonic() + options['seconds']
+
+        def worker(seed):
+            rng = random.Random(seed)
+            counts = {'reads': 0, 'writes': 0, 'errors': 0}
+            connection = profile.connect(path) if profile.persistent else None
+            while monotonic() < deadline:
+                current = connection or profile.connect(path)
+                news_id = rng.randint(1, options['news'])
+                try:
+                    if rng.random() < options['write_ratio']:
+                        self.write(current, profile.begin, news_id)
+                        counts['writes'] += 1
+                    else:
+                        current.execute(READ_SQL, (news_id,)).fetchall()
+                        counts['reads'] += 1
+                except sqlite3.OperationalError:
+                    counts['errors'] += 1
+                    if current.in_transaction:
+                        current.execute('ROLLBACK')
+                finally:
+                    if connection is None:
+                        current.close()
+            if connection is not None:
+                connection.close()
+            with lock:
+                for key, value in counts.items():
+                    totals[key] += value
+
+        threads = [
+            threading.Thread(target=worker, args=(seed,))
+            for seed in range(options['threads'])
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return totals['reads'], totals['writes'], totals['errors']
+
+    @staticmethod
+    def write(connection, begin, news_id):
+        """
+        Запись комментария, как в NewsComment: проверка новости,
+        вставка и счётчик.
+        """
+        connection.execute(begin)
+        connection.execute(NEWS_SQL, (news_id,)).fetchone()
+        connection.execute(COUNT_SQL, (news_id,))
+        connection.execute(INSERT_SQL, (news_id, 'Comment', monotonic()))
+        connection.execute('COMMIT')
@@ -0,0 +1,56 @@
+import sys
+from datetime import date
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news import export
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает новости с комментариями в NDJSON или CSV '
+        'потоком, в постоянной памяти.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', choices=tuple(export.FORMATTERS),
+            default=export.NDJSON,
+        )
+        parser.add_argument(
+            '--from', dest='date_from', type=date.fromisoformat,
+            help='Первая дата новостей, ГГГГ-ММ-ДД.',
+        )
+        parser.add_argument(
+            '--to', dest='date_to', type=date.fromisoformat,
+            help='Последняя дата новостей, ГГГГ-ММ-ДД.',
+        )
+        parser.add_argument(
+            '--gzip', action='store_true', help='Сжимать выгрузку gzip.',
+        )
+        parser.add_argument(
+            '--output', default='-',
+            help='Файл выгрузки; по умолчанию стандартный вывод.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int,
+            default=settings.NEWS_EXPORT_CHUNK_SIZE,
+        )
+
+    def handle(self, *args, **options):
+        rows = export.news_with_comments(
+            options['date_from'], options['date_to'], options['chunk_size']
+        )
+        chunks = export.export_chunks(options['format'], rows, options['gzip'])
+        if options['output'] == '-':
+            self.write(sys.stdout.buffer, chunks)
+        else:
+            with open(options['output'], 'wb') as output:
+                self.write(output, chunks)
+
+    @staticmethod
+    def write(output, chunks):
+        for chunk in chunks:
+            output.write(chunk)
+        output.flush()
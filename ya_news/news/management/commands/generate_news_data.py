@@ -0,0 +1,154 @@
+import random
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+from news import cache
+from news.models import Comment, News
+
+PASSWORD = 'password'
+TEXT_POOL_SIZE = 1000
+# Ограничение SQLite на число параметров запроса.
+LOOKUP_CHUNK = 500
+
+
+def popularity_weights(count, skew):
+    """
+    Веса новостей по закону Ципфа: k-я по популярности новость
+    получает комментарии пропорционально 1 / k ** skew.
+    """
+    return [1 / rank ** skew for rank in range(1, count + 1)]
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует пользователей, новости и комментарии для нагрузочного '
+        'тестирования. При одинаковом --seed данные совпадают.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--news', type=int, default=100)
+        parser.add_argument(
+            '--comments', type=int, default=20,
+            help='Комментариев на новость в среднем.',
+        )
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель распределения Ципфа; 0 — равномерно.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        self.texts = [
+            self.faker.paragraph(nb_sentences=3)
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+
+        with transaction.atomic():
+            authors = self.create_users(options['users'], options['seed'])
+            news = self.create_news(options['news'])
+            comments = self.create_comments(
+                news, authors,
+                options['news'] * options['comments'],
+                options['skew'],
+            )
+        cache.invalidate(cache.LIST_SCOPE)
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {len(authors)}, новостей {len(news)}, '
+            f'комментариев {comments}.'
+        ))
+
+    def create_users(self, count, seed):
+        """Пользователи с одинаковым паролем; хеш считается один раз."""
+        password = make_password(PASSWORD)
+        usernames = [
+            f'{self.faker.user_name()}_{seed}_{i}' for i in range(count)
+        ]
+        User.objects.bulk_create(
+            (User(username=name, password=password) for name in usernames),
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        pks = []
+        for start in range(0, count, LOOKUP_CHUNK):
+            pks += User.objects.filter(
+                username__in=usernames[start:start + LOOKUP_CHUNK]
+            ).values_list('pk', flat=True)
+        return pks
+
+    def create_news(self, count):
+        """
+        Новости за последний год.
+
+        SQLite не возвращает первичные ключи из bulk_create,
+        поэтому созданные новости перечитываются по диапазону pk.
+        """
+        today = timezone.localdate()
+        last_pk = News.objects.aggregate(last=Max('pk'))['last'] or 0
+        News.objects.bulk_create(
+            (
+                News(
+                    title=self.faker.sentence(nb_words=4)[:50],
+                    text='\n\n'.join(self.rng.choices(self.texts, k=3)),
+                    date=today - timedelta(days=self.rng.randrange(365)),
+                )
+                for _ in range(count)
+            ),
+            batch_size=self.batch_size,
+        )
+        news = list(
+            News.objects.filter(pk__gt=last_pk).order_by('pk').only('date')
+        )
+        # Популярность не связана с датой публикации.
+        self.rng.shuffle(news)
+        return news
+
+    def create_comments(self, news, authors, total, skew):
+        """
+        Раскладывает total комментариев по новостям с перекосом
+        популярности и записывает их пачками.
+        """
+        if not news or not authors:
+            return 0
+        cumulative = list(accumulate(popularity_weights(len(news), skew)))
+        # Точкой отсчёта служит полночь, а не текущий момент, чтобы
+        # повторный запуск с тем же seed давал те же даты.
+        midnight = timezone.make_aware(
+            datetime.combine(timezone.localdate(), time.min)
+        )
+        created = 0
+        for start in range(0, total, self.batch_size):
+            targets = self.rng.choices(
+                news, cum_weights=cumulative,
+                k=min(self.batch_size, total - start),
+            )
+            batch = []
+            for item in targets:
+                published = timezone.make_aware(
+                    datetime.combine(item.date, time.min)
+                )
+                span = (midnight - published).total_seconds() or 1
+                batch.append(Comment(
+                    news=item,
+                    author_id=self.rng.choice(authors),
+                    text=self.rng.choice(self.texts),
+                    created=published + timedelta(
+                        seconds=self.rng.uniform(0, span)
+                    ),
+                ))
+            Comment.objects.bulk_load(batch)
+            created += len(batch)
+        return created
@@ -0,0 +1,207 @@
+import json
+import sys
+from contextlib import nullcontext
+from pathlib import Path
+from time import monotonic
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.python import Deserializer
+from django.db import transaction
+from django.utils import timezone
+
+from news import cache
+from news.models import Comment, News
+
+READ_SIZE = 64 * 1024
+# Больше этого один объект массива занимать не может: иначе битый
+# или слишком большой элемент заставил бы читать весь файл в память.
+MAX_OBJECT_SIZE = 16 * 1024 * 1024
+MODELS = (News, Comment)
+
+
+def iter_ndjson(stream):
+    """Объекты из файла NDJSON: по одному JSON-объекту в строке."""
+    for number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as error:
+            raise CommandError(f'Строка {number}: {error}')
+
+
+def iter_json_array(
+    stream, read_size=READ_SIZE, max_object_size=MAX_OBJECT_SIZE,
+):
+    """
+    Элементы JSON-массива верхнего уровня, без загрузки всего файла.
+
+    В памяти держится только непрочитанный хвост буфера, то есть
+    не больше одного объекта и одного блока чтения. Объект длиннее
+    max_object_size символов считается ошибкой.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    eof = False
+    started = False
+
+    def fill():
+        nonlocal buffer, position, eof
+        chunk = stream.read(read_size)
+        buffer = buffer[position:] + chunk
+        position = 0
+        eof = not chunk
+
+    while True:
+        while position < len(buffer) and buffer[position] in ' \t\r\n,':
+            if buffer[position] == ',' and not started:
+                raise CommandError('Ожидался JSON-массив.')
+            position += 1
+        if position >= len(buffer):
+            if eof:
+                raise CommandError('Файл оборвался посреди массива.')
+            fill()
+            continue
+        if not started:
+            if buffer[position] != '[':
+                raise CommandError('Ожидался JSON-массив.')
+            started = True
+            position += 1
+            continue
+        if buffer[position] == ']':
+            return
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            if eof:
+                raise CommandError(str(error))
+            if len(buffer) - position > max_object_size:
+                raise CommandError(
+                    f'Объект длиннее {max_object_size} символов: {error}'
+                )
+            fill()
+            continue
+        position = end
+        yield item
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково загружает новости и комментарии из JSON (формат '
+        'фикстур Django) или NDJSON пачками bulk_create.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Файл с данными; «-» — stdin.')
+        parser.add_argument(
+            '--format', choices=('json', 'ndjson'),
+            help='По умолчанию определяется по расширению файла.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Объектов в одном bulk_create.',
+        )
+        parser.add_argument(
+            '--transaction-size', type=int, default=20000,
+            help='Объектов в одной транзакции.',
+        )
+        parser.add_argument(
+            '--progress-every', type=int, default=100000,
+            help='Как часто, в объектах, печатать прогресс.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        data_format = options['format'] or (
+            'ndjson' if Path(path).suffix in ('.ndjson', '.jsonl') else 'json'
+        )
+        reader = iter_ndjson if data_format == 'ndjson' else iter_json_array
+        self.batch_size = options['batch_size']
+        self.progress_every = options['progress_every']
+        self.loaded = 0
+        self.started = monotonic()
+
+        if path == '-':
+            stream = nullcontext(sys.stdin)
+        else:
+            stream = open(path, encoding='utf-8')
+        with stream as lines:
+            batches = self.batches(reader(lines))
+            done = False
+            while not done:
+                with transaction.atomic():
+                    done = self.write_chunk(
+                        batches, options['transaction_size']
+                    )
+        self.report(final=True)
+
+    def batches(self, records):
+        """
+        Превращает поток записей в пачки (модель, объекты).
+
+        Как только одна из пачек заполнена, отдаются все накопленные,
+        причём новости раньше комментариев, которые могут на них
+        ссылаться: к концу транзакции все ссылки уже записаны.
+        """
+        labels = {model._meta.label_lower: model for model in MODELS}
+        pending = {model: [] for model in MODELS}
+        for record in records:
+            if record.get('model') not in labels:
+                raise CommandError(
+                    f'Неизвестная модель: {record.get("model")}'
+                )
+            instance = next(Deserializer([record])).object
+            if isinstance(instance, News):
+                # Счётчик наберут загружаемые комментарии.
+                instance.comment_count = 0
+            elif instance.created is None:
+                instance.created = timezone.now()
+            objects = pending[type(instance)]
+            objects.append(instance)
+            if len(objects) >= self.batch_size:
+                yield from self.drain(pending)
+        yield from self.drain(pending)
+
+    @staticmethod
+    def drain(pending):
+        for model in MODELS:
+            if pending[model]:
+                yield model, pending[model]
+                pending[model] = []
+
+    def write_chunk(self, batches, transaction_size):
+        """
+        Пишет пачки, пока не наберётся transaction_size объектов.
+
+        Возвращает True, когда данные закончились.
+        """
+        written = 0
+        for model, objects in batches:
+            if model is News:
+                News.objects.bulk_create(objects)
+                cache.invalidate(cache.LIST_SCOPE)
+            else:
+                Comment.objects.bulk_load(objects)
+            written += len(objects)
+            before, self.loaded = self.loaded, self.loaded + len(objects)
+            if before // self.progress_every != (
+                self.loaded // self.progress_every
+            ):
+                self.report()
+            if written >= transaction_size:
+                return False
+        return True
+
+    def report(self, final=False):
+        elapsed = monotonic() - self.started
+        rate = self.loaded / elapsed if elapsed else 0
+        message = (
+            f'Загружено объектов: {self.loaded} '
+            f'за {elapsed:.1f} с ({rate:.0f} в секунду)'
+        )
+        if final:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(message)
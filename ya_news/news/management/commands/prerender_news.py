@@ -0,0 +1,27 @@
+from time import sleep
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from news.prerender import regenerate
+
+
+class Command(BaseCommand):
+    help = (
+        'Рендерит главную и самые посещаемые новости в статические '
+        'HTML-файлы NEWS_PRERENDER_DIR и обновляет изменившиеся.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--watch', action='store_true',
+            help='Повторять каждые NEWS_PRERENDER_INTERVAL секунд.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            rendered = regenerate()
+            self.stdout.write(f'Перестроено страниц: {rendered}.')
+            if not options['watch']:
+                break
+            sleep(settings.NEWS_PRERENDER_INTERVAL)
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+
+class Command(BaseCommand):
+    help = (
+        'Перестраивает полнотекстовый индекс новостей news_search '
+        'по таблице news_news и при необходимости сжимает его.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--optimize', action='store_true',
+            help='Слить сегменты индекса после перестройки.',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO news_search (news_search) VALUES ('rebuild')"
+            )
+            if options['optimize']:
+                cursor.execute(
+                    "INSERT INTO news_search (news_search) "
+                    "VALUES ('optimize')"
+                )
+            cursor.execute('SELECT count(*) FROM news_search')
+            count = cursor.fetchone()[0]
+        self.stdout.write(self.style.SUCCESS(
+            f'Индекс перестроен, новостей в нём: {count}.'
+        ))
@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from news.models import Comment, News
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у новостей пачками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько новостей проверять за один проход.',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        checked = fixed = 0
+        while True:
+            batch = list(
+                News.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'comment_count')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            checked += len(batch)
+            fixed += self.reconcile(dict(batch))
+        self.stdout.write(self.style.SUCCESS(
+            f'Проверено новостей: {checked}, исправлено: {fixed}.'
+        ))
+
+    def reconcile(self, stored):
+        """Сверяет счётчики пачки новостей с реальным числом комментариев."""
+        with transaction.atomic():
+            actual = dict(
+                Comment.objects.filter(news_id__in=stored)
+                .order_by()
+                .values('news_id')
+                .annotate(count=Count('pk'))
+                .values_list('news_id', 'count')
+            )
+            drifted = [
+                News(pk=pk, comment_count=actual.get(pk, 0))
+                for pk, count in stored.items()
+                if actual.get(pk, 0) != count
+            ]
+            News.objects.bulk_update(drifted, ['comment_count'])
+        return len(drifted)
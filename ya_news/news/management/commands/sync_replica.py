@@ -0,0 +1,63 @@
+import sqlite3
+from time import sleep, time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from news.routers import PRIMARY, REPLICA, STATUS_TABLE
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в реплику через backup API '
+        'и отмечает в ней время синхронизации.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--replica',
+            help='Файл реплики; по умолчанию из DATABASES["replica"].',
+        )
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять каждые N секунд; 0 — один раз.',
+        )
+
+    def handle(self, *args, **options):
+        path = options['replica']
+        if path is None:
+            if REPLICA not in settings.DATABASES:
+                raise CommandError(
+                    'Реплика не настроена: задайте DJANGO_DB_REPLICA '
+                    'или --replica.'
+                )
+            path = settings.DATABASES[REPLICA]['NAME']
+        while True:
+            self.sync(str(path))
+            if not options['interval']:
+                break
+            sleep(options['interval'])
+
+    def sync(self, path):
+        primary = connections[PRIMARY]
+        primary.ensure_connection()
+        replica = sqlite3.connect(path)
+        try:
+            # Копия отражает базу на начало копирования: записи, сделанные
+            # во время него, в реплику не попадают, поэтому время берём до.
+            synced = time()
+            primary.connection.backup(replica)
+            with replica:
+                replica.execute(
+                    f'CREATE TABLE IF NOT EXISTS {STATUS_TABLE} '
+                    '(synced REAL NOT NULL)'
+                )
+                replica.execute(f'DELETE FROM {STATUS_TABLE}')
+                replica.execute(
+                    f'INSERT INTO {STATUS_TABLE} (synced) VALUES (?)',
+                    (synced,),
+                )
+        finally:
+            replica.close()
+        self.stdout.write(f'Реплика {path} синхронизирована.')
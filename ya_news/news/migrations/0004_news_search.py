@@ -0,0 +1,81 @@
+from django.db import migrations
+
+# unicode61 приводит кириллицу к нижнему регистру, но не сводит «ё»
+# к «е»: это делает представление news_search_content, из которого
+# индекс берёт текст. Триггеры пишут в индекс те же выражения,
+# префиксные индексы ускоряют запросы «слово*».
+YO = "replace(replace({}, 'ё', 'е'), 'Ё', 'Е')"
+TITLE = YO.format('{}.title')
+TEXT = YO.format('{}.text')
+
+CREATE_SQL = (
+    f'''
+    CREATE VIEW news_search_content AS
+    SELECT id, {TITLE.format('news_news')} AS title,
+        {TEXT.format('news_news')} AS text
+    FROM news_news
+    ''',
+    '''
+    CREATE VIRTUAL TABLE news_search USING fts5(
+        title, text,
+        content='news_search_content', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    ''',
+    f'''
+    CREATE TRIGGER news_search_insert AFTER INSERT ON news_news BEGIN
+        INSERT INTO news_search (rowid, title, text)
+        VALUES (new.id, {TITLE.format('new')}, {TEXT.format('new')});
+    END
+    ''',
+    f'''
+    CREATE TRIGGER news_search_delete AFTER DELETE ON news_news BEGIN
+        INSERT INTO news_search (news_search, rowid, title, text)
+        VALUES (
+            'delete', old.id, {TITLE.format('old')}, {TEXT.format('old')}
+        );
+    END
+    ''',
+    f'''
+    CREATE TRIGGER news_search_update AFTER UPDATE OF title, text
+    ON news_news BEGIN
+        INSERT INTO news_search (news_search, rowid, title, text)
+        VALUES (
+            'delete', old.id, {TITLE.format('old')}, {TEXT.format('old')}
+        );
+        INSERT INTO news_search (rowid, title, text)
+        VALUES (new.id, {TITLE.format('new')}, {TEXT.format('new')});
+    END
+    ''',
+    "INSERT INTO news_search (news_search) VALUES ('rebuild')",
+)
+DROP_SQL = (
+    'DROP TRIGGER IF EXISTS news_search_update',
+    'DROP TRIGGER IF EXISTS news_search_delete',
+    'DROP TRIGGER IF EXISTS news_search_insert',
+    'DROP TABLE IF EXISTS news_search',
+    'DROP VIEW IF EXISTS news_search_content',
+)
+
+
+def run_on_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0003_news_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_on_sqlite(CREATE_SQL), run_on_sqlite(DROP_SQL)
+        ),
+    ]
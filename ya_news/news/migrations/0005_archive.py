@@ -0,0 +1,48 @@
+# Generated by Django 3.2.16 on 2026-10-17 01:18
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('news', '0004_news_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedNews',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=50)),
+                ('text', models.TextField()),
+                ('date', models.DateField()),
+                ('comment_count', models.PositiveIntegerField(default=0, editable=False, verbose_name='Количество комментариев')),
+            ],
+            options={
+                'verbose_name': 'Архивная новость',
+                'verbose_name_plural': 'Архив новостей',
+                'ordering': ('-date',),
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedComment',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('text', models.TextField()),
+                ('created', models.DateTimeField()),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+                ('news', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='news.archivednews')),
+            ],
+            options={
+                'ordering': ('created',),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedcomment',
+            index=models.Index(fields=['news', 'created', 'id'], name='archived_comment_news_idx'),
+        ),
+    ]
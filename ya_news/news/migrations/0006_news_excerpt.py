@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-17 03:10
+
+from importlib import import_module
+
+from django.db import migrations, models
+
+from news.excerpts import backfill_excerpts
+
+# SQLite добавляет столбец, пересоздавая news_news: представление
+# и триггеры поиска на время пересоздания удаляются.
+search = import_module('news.migrations.0004_news_search')
+
+
+def fill_excerpts(apps, schema_editor):
+    backfill_excerpts(apps.get_model('news', 'News'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news', '0005_archive'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            search.run_on_sqlite(search.DROP_SQL),
+            search.run_on_sqlite(search.CREATE_SQL),
+        ),
+        migrations.AddField(
+            model_name='news',
+            name='excerpt',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс'),
+        ),
+        migrations.RunPython(
+            search.run_on_sqlite(search.CREATE_SQL),
+            search.run_on_sqlite(search.DROP_SQL),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
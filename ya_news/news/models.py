@@ -1,22 +1,144 @@
+from collections import Counter
 from datetime import datetime
 
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, transaction
+
+from .cache import invalidate_news
+from .excerpts import make_excerpt
+
+
+class NewsQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """save() при bulk_create не вызывается, анонсы считаем здесь."""
+        objs = list(objs)
+        for news in objs:
+            news.excerpt = make_excerpt(news.text)
+        return super().bulk_create(objs, *args, **kwargs)
 
 
 class News(models.Model):
     title = models.CharField(max_length=50)
     text = models.TextField()
+    excerpt = models.TextField('Анонс', blank=True, editable=False)
     date = models.DateField(default=datetime.today)
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
+
+    objects = NewsQuerySet.as_manager()
 
     class Meta:
         ordering = ('-date',)
+        indexes = (
+            models.Index(fields=('-date',), name='news_date_idx'),
+        )
         verbose_name_plural = 'Новости'
         verbose_name = 'Новость'
 
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """Анонс пересчитывается, если сохраняется текст."""
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None:
+            # Отложенный текст не менялся и не сохраняется.
+            text_saved = 'text' not in self.get_deferred_fields()
+        else:
+            text_saved = 'text' in update_fields
+        if text_saved:
+            self.excerpt = make_excerpt(self.text)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'excerpt'}
+        super().save(*args, **kwargs)
+
+
+class CommentQuerySet(models.QuerySet):
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Массовое создание комментариев.
+
+        Сигналы при bulk_create не отправляются, поэтому счётчики
+        комментариев у новостей увеличиваем здесь же, одним запросом
+        на каждую затронутую новость, и сбрасываем кеш их страниц.
+        """
+        objs = super().bulk_create(objs, *args, **kwargs)
+        self._count_added(objs)
+        return objs
+
+    def bulk_load(self, objs):
+        """
+        Массовая загрузка комментариев с их собственными датами.
+
+        Как и loaddata, пишет значения полей как есть (raw), поэтому
+        auto_now_add не заменяет created текущим временем. Первичные
+        ключи объектам не проставляются; счётчики и кеш обновляются
+        так же, как в bulk_create.
+        """
+        objs = list(objs)
+        if not objs:
+            return objs
+        fields = [
+            field for field in self.model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        connection = connections[self.db]
+        batch_size = max(connection.ops.bulk_batch_size(fields, objs), 1)
+        with transaction.atomic(using=self.db, savepoint=False):
+            for start in range(0, len(objs), batch_size):
+                self._insert(
+                    objs[start:start + batch_size], fields,
+                    raw=True, using=self.db,
+                )
+        self._count_added(objs)
+        return objs
+
+    def _count_added(self, objs):
+        per_news = Counter(comment.news_id for comment in objs)
+        for news_id, count in per_news.items():
+            News.objects.filter(pk=news_id).update(
+                comment_count=models.F('comment_count') + count
+            )
+        if per_news:
+            invalidate_news(*per_news)
+
+    def bulk_delete(self):
+        """
+        Удаление одним DELETE, без загрузки объектов и сигналов.
+
+        Счётчики комментариев у затронутых новостей уменьшаем одним
+        запросом и сбрасываем кеш их страниц.
+        Возвращает число удалённых комментариев.
+        """
+        with transaction.atomic(using=self.db):
+            per_news = dict(
+                self.order_by().values('news_id').annotate(
+                    count=models.Count('pk')
+                ).values_list('news_id', 'count')
+            )
+            deleted = self._raw_delete(self.db)
+            if per_news:
+                News.objects.filter(pk__in=per_news).update(
+                    comment_count=models.Case(
+                        *(
+                            models.When(
+                                pk=news_id,
+                                then=models.F('comment_count') - count,
+                            )
+                            for news_id, count in per_news.items()
+                        ),
+                        default=models.F('comment_count'),
+                    )
+                )
+        if per_news:
+            invalidate_news(*per_news)
+        return deleted
+
 
 class Comment(models.Model):
     news = models.ForeignKey(
@@ -30,8 +152,62 @@ class Comment(models.Model):
     text = models.TextField()
     created = models.DateTimeField(auto_now_add=True)
 
+    objects = CommentQuerySet.as_manager()
+
+    class Meta:
+        ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='comment_news_created_idx',
+            ),
+        )
+
+    def __str__(self):
+        return self.text[:50]
+
+
+class ArchivedNews(models.Model):
+    """Новость, перенесённая из News командой archive_news."""
+    title = models.CharField(max_length=50)
+    text = models.TextField()
+    date = models.DateField()
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев',
+        default=0,
+        editable=False,
+    )
+
+    class Meta:
+        ordering = ('-date',)
+        verbose_name_plural = 'Архив новостей'
+        verbose_name = 'Архивная новость'
+
+    def __str__(self):
+        return self.title
+
+
+class ArchivedComment(models.Model):
+    """Комментарий архивной новости; pk сохраняется из Comment."""
+    news = models.ForeignKey(
+        ArchivedNews,
+        on_delete=models.CASCADE
+    )
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+    )
+    text = models.TextField()
+    created = models.DateTimeField()
+
     class Meta:
         ordering = ('created',)
+        indexes = (
+            models.Index(
+                fields=('news', 'created', 'id'),
+                name='archived_comment_news_idx',
+            ),
+        )
 
     def __str__(self):
         return self.text[:50]
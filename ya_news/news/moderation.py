@@ -0,0 +1,128 @@
+"""
+Поиск запрещённых слов в тексте комментария.
+
+Список слов компилируется в автомат Ахо — Корасик, поэтому проверка
+текста — один проход по нему независимо от длины списка.
+"""
+import logging
+import os
+from collections import deque
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WordMatcher:
+    """Автомат Ахо — Корасик для поиска любого слова из списка."""
+
+    def __init__(self, words):
+        self.transitions = [{}]
+        self.fail = [0]
+        self.terminal = [False]
+        for word in words:
+            if word:
+                self._add(word.lower())
+        self._link()
+
+    def _add(self, word):
+        state = 0
+        for char in word:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions[state][char] = next_state
+                self.transitions.append({})
+                self.fail.append(0)
+                self.terminal.append(False)
+            state = next_state
+        self.terminal[state] = True
+
+    def _link(self):
+        """Строит суффиксные ссылки обходом в ширину."""
+        queue = deque(self.transitions[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fallback = self.fail[state]
+                while fallback and char not in self.transitions[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.transitions[fallback].get(
+                    char, 0
+                )
+                if self.terminal[self.fail[next_state]]:
+                    self.terminal[next_state] = True
+
+    def search(self, text):
+        """Есть ли в тексте хотя бы одно слово из списка."""
+        transitions = self.transitions
+        fail = self.fail
+        terminal = self.terminal
+        state = 0
+        for char in text:
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+def read_words(path):
+    """Слова из файла: по одному в строке, # — комментарий."""
+    with open(path, encoding='utf-8') as words_file:
+        return [
+            line.strip() for line in words_file
+            if line.strip() and not line.lstrip().startswith('#')
+        ]
+
+
+class BadWordsSource:
+    """
+    Держит скомпилированный автомат и перестраивает его при изменении
+    файла BAD_WORDS_FILE.
+
+    Файл проверяется не чаще раза в BAD_WORDS_RELOAD_INTERVAL секунд,
+    так что новый список подхватывается без перезапуска воркеров.
+    Если файл пропал или не читается, остаётся последний собранный
+    автомат, а до первого удачного чтения — встроенный список слов.
+    """
+
+    def __init__(self, default_words):
+        self.default_words = tuple(default_words)
+        self.lock = Lock()
+        self.matcher = None
+        self.version = None
+        self.checked_at = None
+
+    def get_matcher(self):
+        now = monotonic()
+        if (
+            self.matcher is not None
+            and now - self.checked_at < settings.BAD_WORDS_RELOAD_INTERVAL
+        ):
+            return self.matcher
+        with self.lock:
+            self.checked_at = now
+            path = settings.BAD_WORDS_FILE
+            try:
+                version = (path, os.stat(path).st_mtime_ns if path else None)
+                if self.matcher is None or version != self.version:
+                    words = read_words(path) if path else self.default_words
+                    self.matcher = WordMatcher(words)
+                    self.version = version
+            except (OSError, UnicodeError):
+                logger.exception(
+                    'Не удалось прочитать список запрещённых слов %s.', path
+                )
+                if self.matcher is None:
+                    self.matcher = WordMatcher(self.default_words)
+        return self.matcher
+
+    def reload(self):
+        """Принудительно перечитывает список при следующей проверке."""
+        with self.lock:
+            self.matcher = None
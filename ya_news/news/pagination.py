@@ -0,0 +1,60 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+CURSOR_SEPARATOR = '|'
+
+
+class InvalidCursor(ValueError):
+    """Курсор не удалось разобрать."""
+
+
+def encode_cursor(comment):
+    """
+    Курсор указывает на последний показанный комментарий:
+    объект модели или словарь из values() с полями created и id.
+    """
+    if isinstance(comment, dict):
+        created, pk = comment['created'], comment['id']
+    else:
+        created, pk = comment.created, comment.pk
+    raw = f'{created.isoformat()}{CURSOR_SEPARATOR}{pk}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Возвращает пару (created, id) из строки курсора."""
+    try:
+        raw = urlsafe_b64decode(cursor.encode()).decode()
+        created, pk = raw.rsplit(CURSOR_SEPARATOR, 1)
+        created = parse_datetime(created)
+        pk = int(pk)
+    except (Base64Error, UnicodeError, ValueError):
+        raise InvalidCursor(cursor)
+    if created is None:
+        raise InvalidCursor(cursor)
+    return created, pk
+
+
+def paginate_comments(queryset, cursor=None, limit=50):
+    """
+    Постраничная выборка комментариев по ключу (created, id).
+
+    Вместо OFFSET продолжаем выборку с последнего показанного
+    комментария, поэтому стоимость запроса не зависит от того,
+    насколько далеко листает пользователь.
+    Возвращает список комментариев и курсор следующей страницы
+    (None, если страница последняя).
+    """
+    if cursor:
+        created, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(created__gt=created) | Q(created=created, pk__gt=pk)
+        )
+    comments = list(queryset.order_by('created', 'pk')[:limit + 1])
+    if len(comments) <= limit:
+        return comments, None
+    comments = comments[:limit]
+    return comments, encode_cursor(comments[-1])
@@ -0,0 +1,262 @@
+"""
+Заранее отрендеренные страницы для анонимных посетителей.
+
+Главная и NEWS_PRERENDER_TOP самых посещаемых новостей сохраняются
+в NEWS_PRERENDER_DIR как статические HTML-файлы по путям URL
+(news/5/index.html), их может отдавать и веб-сервер. При
+NEWS_PRERENDER_SERVE = True PrerenderedPageMiddleware отвечает
+анонимам прямо из файла, считает посещения новостей и запускает
+фоновый генератор.
+
+Изменение новости или комментария удаляет файлы затронутых страниц
+(cache.invalidate), генератор раз в NEWS_PRERENDER_INTERVAL секунд
+строит недостающие. Кроме того, он сверяет отпечаток данных каждой
+страницы с сохранённым в manifest.json: так ловятся изменения
+в обход сигналов, например QuerySet.update().
+"""
+import json
+import logging
+import os
+import threading
+from hashlib import md5
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections
+from django.http import Http404, HttpRequest, HttpResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from . import cache
+from .aio import AsyncCapableMiddleware, run_sync
+from .conditional import with_last_comment
+from .models import News
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = 'manifest.json'
+VISITS_KEY = 'news:visits:{}'
+# Среди скольких последних новостей искать самые посещаемые.
+CANDIDATES = 500
+PRERENDER_ATTRIBUTE = 'prerender'
+SERVED_HEADER = 'X-Prerendered'
+
+
+def page_scope(path):
+    """Область кеша для URL главной или новости; иначе None."""
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return None
+    if match.view_name == 'news:home':
+        return cache.LIST_SCOPE
+    if match.view_name == 'news:detail':
+        return cache.detail_scope(match.kwargs['pk'])
+    return None
+
+
+def record_visit(news_id):
+    store = cache.get_cache()
+    key = VISITS_KEY.format(news_id)
+    store.add(key, 0, None)
+    try:
+        store.incr(key)
+    except ValueError:
+        # Ключ успели вытеснить из кеша.
+        pass
+
+
+def top_news_ids(count):
+    """
+    Самые посещаемые из последних новостей; при равенстве
+    посещений — самые обсуждаемые.
+    """
+    candidates = list(
+        News.objects.values_list('pk', 'comment_count')[:CANDIDATES]
+    )
+    visits = cache.get_cache().get_many(
+        [VISITS_KEY.format(pk) for pk, _ in candidates]
+    )
+    candidates.sort(key=lambda row: (
+        visits.get(VISITS_KEY.format(row[0]), 0), row[1]
+    ), reverse=True)
+    return [pk for pk, _ in candidates[:count]]
+
+
+def fingerprint(scope):
+    """Отпечаток данных страницы, включая текст новостей."""
+    news_id = cache.scope_news_id(scope)
+    queryset = News.objects.all()
+    if news_id is not None:
+        queryset = queryset.filter(pk=news_id)
+    rows = list(with_last_comment(queryset).values_list(
+        'pk', 'title', 'text', 'date', 'comment_count', 'last_comment'
+    )[:settings.NEWS_COUNT_ON_HOME_PAGE])
+    return md5(repr(rows).encode()).hexdigest()
+
+
+def render_page(scope):
+    """HTML страницы так, как её увидел бы анонимный посетитель."""
+    url = cache.scope_url(scope)
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = url
+    request.user = AnonymousUser()
+    # Кеш страниц в другом процессе может быть устаревшим.
+    setattr(request, PRERENDER_ATTRIBUTE, True)
+    match = resolve(url)
+    # При NEWS_ASYNC_VIEWS представление — корутина, а генератор
+    # работает в обычном потоке.
+    view = getattr(match.func, 'sync_view', match.func)
+    try:
+        response = view(request, *match.args, **match.kwargs)
+    except Http404:
+        return None
+    if hasattr(response, 'render'):
+        response.render()
+    if response.status_code != 200:
+        return None
+    return response.content
+
+
+def write_atomically(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    temporary.write_bytes(content)
+    os.replace(temporary, path)
+
+
+def regenerate():
+    """
+    Приводит каталог в соответствие с данными: строит недостающие
+    и изменившиеся страницы, удаляет выпавшие из top.
+    Возвращает число перестроенных страниц.
+    """
+    directory = Path(settings.NEWS_PRERENDER_DIR)
+    manifest_path = directory / MANIFEST
+    try:
+        manifest = json.loads(manifest_path.read_text())
+    except (FileNotFoundError, ValueError):
+        manifest = {}
+    scopes = [cache.LIST_SCOPE] + [
+        cache.detail_scope(pk)
+        for pk in top_news_ids(settings.NEWS_PRERENDER_TOP)
+    ]
+    for scope in set(manifest) - set(scopes):
+        cache.static_page_path(scope).unlink(missing_ok=True)
+        del manifest[scope]
+    rendered = 0
+    for scope in scopes:
+        path = cache.static_page_path(scope)
+        current = fingerprint(scope)
+        if path.exists() and manifest.get(scope) == current:
+            continue
+        content = render_page(scope)
+        if content is None:
+            manifest.pop(scope, None)
+            continue
+        write_atomically(path, content)
+        manifest[scope] = current
+        rendered += 1
+    write_atomically(manifest_path, json.dumps(manifest).encode())
+    return rendered
+
+
+class Regenerator:
+    """Фоновый поток, который периодически вызывает regenerate()."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.thread = None
+        self.stopped = threading.Event()
+
+    def start(self):
+        with self.lock:
+            if self.thread is not None:
+                return
+            self.stopped.clear()
+            self.thread = threading.Thread(
+                target=self.run, name='news-prerender', daemon=True
+            )
+            self.thread.start()
+
+    def stop(self):
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is not None:
+            self.stopped.set()
+            thread.join()
+
+    def run(self):
+        while not self.stopped.is_set():
+            try:
+                regenerate()
+            except Exception:
+                logger.exception('Не удалось обновить статические страницы.')
+            finally:
+                close_old_connections()
+            self.stopped.wait(settings.NEWS_PRERENDER_INTERVAL)
+
+
+regenerator = Regenerator()
+
+
+class PrerenderedPageMiddleware(AsyncCapableMiddleware):
+    """
+    Отдаёт анонимам готовый файл главной или новости.
+
+    Стоит в конце MIDDLEWARE, чтобы ответ прошёл через остальные
+    middleware; сессия при этом не загружается, если нет её cookie.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        if settings.NEWS_PRERENDER_SERVE:
+            regenerator.start()
+
+    def call(self, request):
+        return self.prerendered(request) or self.get_response(request)
+
+    async def acall(self, request):
+        if not settings.NEWS_PRERENDER_SERVE:
+            return await self.get_response(request)
+        # Сессия и пользователь читаются из кеша или базы.
+        response = await run_sync(self.prerendered, request)
+        return response or await self.get_response(request)
+
+    @staticmethod
+    def prerendered(request):
+        """
+        Ответ из готового файла или None. На условный GET с прежними
+        ETag или Last-Modified отвечает 304, как и обычная страница.
+        """
+        if not settings.NEWS_PRERENDER_SERVE or request.method not in (
+            'GET', 'HEAD'
+        ):
+            return None
+        scope = page_scope(request.path_info)
+        if scope is None:
+            return None
+        news_id = cache.scope_news_id(scope)
+        if news_id is not None:
+            record_visit(news_id)
+        if request.GET or request.user.is_authenticated:
+            return None
+        try:
+            with open(cache.static_page_path(scope), 'rb') as page:
+                content = page.read()
+                modified = int(os.fstat(page.fileno()).st_mtime)
+        except FileNotFoundError:
+            return None
+        # Валидаторы — самого файла: в нём может быть снимок данных
+        # старше текущих, пока генератор его не перестроил.
+        etag = quote_etag(md5(content).hexdigest())
+        response = get_conditional_response(
+            request, etag=etag, last_modified=modified
+        ) or HttpResponse(content)
+        response['ETag'] = etag
+        response['Last-Modified'] = http_date(modified)
+        response[SERVED_HEADER] = '1'
+        return response
@@ -0,0 +1,56 @@
+from importlib import reload
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.urls import clear_url_caches
+
+import pytest
+from news import urls as news_urls
+from news.models import News
+from yanews import urls as project_urls
+
+
+def reload_urls():
+    reload(news_urls)
+    reload(project_urls)
+    clear_url_caches()
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Кеш страниц не должен переживать отдельный тест."""
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """Превышение бюджета запросов представления валит тест."""
+    settings.QUERY_BUDGET_MODE = 'raise'
+
+
+@pytest.fixture
+def async_views(settings):
+    """URLconf собирается заново: as_view() читает NEWS_ASYNC_VIEWS."""
+    settings.NEWS_ASYNC_VIEWS = True
+    reload_urls()
+    yield
+    settings.NEWS_ASYNC_VIEWS = False
+    reload_urls()
+
+
+@pytest.fixture
+def author():
+    return User.objects.create_user(username='author', password='password')
+
+
+@pytest.fixture
+def author_client(client, author):
+    client.force_login(author)
+    return client
+
+
+@pytest.fixture
+def news():
+    return News.objects.create(title='Заголовок', text='Текст новости')
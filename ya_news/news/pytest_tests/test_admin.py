@@ -0,0 +1,181 @@
+from http import HTTPStatus
+
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.auth.models import Permission, User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+INLINE_COMMENTS = 5
+
+
+@pytest.fixture(autouse=True)
+def inline_comments(settings):
+    settings.NEWS_ADMIN_INLINE_COMMENTS = INLINE_COMMENTS
+
+
+def create_news(author, comments):
+    news = News.objects.create(title='Популярная', text='Текст')
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=f'Comment {i}')
+        for i in range(comments)
+    )
+    return news
+
+
+@pytest.fixture
+def news(author):
+    return create_news(author, INLINE_COMMENTS * 3)
+
+
+def change_page(admin_client, news):
+    return admin_client.get(
+        reverse('admin:news_news_change', args=(news.pk,))
+    )
+
+
+def test_inline_shows_latest_comments(admin_client, news):
+    """
+    Проверяет, что на странице новости в админке только последние
+    комментарии и ссылка на их полный список.
+    """
+    response = change_page(admin_client, news)
+    assert response.status_code == HTTPStatus.OK
+    formset = response.context['inline_admin_formsets'][0].formset
+    assert [form.instance for form in formset.forms] == list(
+        Comment.objects.filter(news=news).order_by('-created', '-pk')[
+            :INLINE_COMMENTS
+        ]
+    )
+    assert f'?news__id__exact={news.pk}' in response.content.decode()
+    assert '<select name="comment_set-0-author"' not in (
+        response.content.decode()
+    )
+
+
+def test_edit_survives_new_comment(admin_client, author, news):
+    """
+    Проверяет, что правка комментария на странице новости
+    сохраняется, даже если новый комментарий вытеснил его
+    из окна последних.
+    """
+    shown = list(
+        Comment.objects.filter(news=news).order_by('-created', '-pk')[
+            :INLINE_COMMENTS
+        ]
+    )
+    data = {
+        'title': news.title,
+        'text': news.text,
+        'date': news.date.strftime('%d.%m.%Y'),
+        'comment_set-TOTAL_FORMS': len(shown),
+        'comment_set-INITIAL_FORMS': len(shown),
+        'comment_set-MIN_NUM_FORMS': 0,
+        'comment_set-MAX_NUM_FORMS': 1000,
+    }
+    for i, comment in enumerate(shown):
+        data.update({
+            f'comment_set-{i}-id': comment.pk,
+            f'comment_set-{i}-news': news.pk,
+            f'comment_set-{i}-author': comment.author_id,
+            f'comment_set-{i}-text': comment.text,
+        })
+    data[f'comment_set-{len(shown) - 1}-text'] = 'Исправлено'
+    Comment.objects.create(news=news, author=author, text='Пока правили')
+
+    response = admin_client.post(
+        reverse('admin:news_news_change', args=(news.pk,)), data
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    shown[-1].refresh_from_db()
+    assert shown[-1].text == 'Исправлено'
+
+
+def test_change_page_queries_do_not_grow(
+        admin_client, author, news, django_assert_max_num_queries
+):
+    """Проверяет, что число запросов не зависит от числа комментариев."""
+    with CaptureQueriesContext(connection) as small:
+        change_page(admin_client, news)
+    big = create_news(author, INLINE_COMMENTS * 30)
+    with django_assert_max_num_queries(len(small)):
+        change_page(admin_client, big)
+
+
+def test_changelists_open(admin_client, news):
+    """Проверяет списки новостей и комментариев новости."""
+    response = admin_client.get(reverse('admin:news_news_changelist'))
+    assert response.status_code == HTTPStatus.OK
+    response = admin_client.get(
+        reverse('admin:news_comment_changelist'),
+        {'news__id__exact': news.pk},
+    )
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_bulk_delete_comments(
+        admin_client, news, django_assert_max_num_queries
+):
+    """
+    Проверяет, что выбранные комментарии удаляются без запроса
+    на каждый, а счётчик у новости уменьшается.
+    """
+    selected = list(Comment.objects.values_list('pk', flat=True)[:7])
+    with django_assert_max_num_queries(7):
+        response = admin_client.post(
+            reverse('admin:news_comment_changelist'),
+            {
+                'action': 'delete_selected',
+                ACTION_CHECKBOX_NAME: selected,
+                'post': 'yes',
+            },
+        )
+    assert response.status_code == HTTPStatus.FOUND
+    news.refresh_from_db()
+    assert news.comment_count == INLINE_COMMENTS * 3 - 7
+    assert Comment.objects.count() == news.comment_count
+
+
+def test_delete_news_with_comments(admin_client, news):
+    """Проверяет, что удаление новости из админки убирает её комментарии."""
+    response = admin_client.post(
+        reverse('admin:news_news_delete', args=(news.pk,)), {'post': 'yes'}
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    assert not News.objects.exists()
+    assert not Comment.objects.exists()
+
+
+def test_bulk_delete_news_needs_comment_permission(client, news):
+    """
+    Проверяет, что без права на удаление комментариев
+    действие не удаляет новость вместе с ними.
+    """
+    staff = User.objects.create_user(username='staff', is_staff=True)
+    staff.user_permissions.add(*Permission.objects.filter(
+        codename__in=('view_news', 'delete_news')
+    ))
+    client.force_login(staff)
+    response = client.post(reverse('admin:news_news_changelist'), {
+        'action': 'delete_selected',
+        ACTION_CHECKBOX_NAME: [news.pk],
+        'post': 'yes',
+    })
+    assert response.status_code == HTTPStatus.FORBIDDEN
+    assert News.objects.filter(pk=news.pk).exists()
+    assert Comment.objects.count() == INLINE_COMMENTS * 3
+
+
+def test_delete_confirmation_counts_comments(admin_client, news):
+    """Проверяет, что подтверждение не перечисляет каждый комментарий."""
+    response = admin_client.get(
+        reverse('admin:news_news_delete', args=(news.pk,))
+    )
+    content = response.content.decode()
+    assert 'Comment 0' not in content
+    assert str(INLINE_COMMENTS * 3) in content
@@ -0,0 +1,153 @@
+import gzip
+import json
+from datetime import date
+from http import HTTPStatus
+
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+from news import api
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+PAGE_SIZE = 3
+
+
+@pytest.fixture(autouse=True)
+def page_sizes(settings):
+    settings.NEWS_API_PAGE_SIZE = PAGE_SIZE
+    settings.COMMENTS_COUNT_ON_PAGE = PAGE_SIZE
+
+
+@pytest.fixture
+def feed():
+    """Новости двух дат, чтобы курсор проходил и по дате, и по id."""
+    News.objects.bulk_create(
+        News(title=f'Новость {i}', text=f'Текст {i}',
+             date=date(2022, 1, 1 + i % 2))
+        for i in range(7)
+    )
+    return list(News.objects.order_by('-date', '-pk'))
+
+
+@pytest.fixture
+def news(author):
+    news = News.objects.create(title='Обсуждаемая', text='Текст')
+    for i in range(PAGE_SIZE + 1):
+        Comment.objects.create(news=news, author=author, text=f'Comment {i}')
+    return news
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    assert response.status_code == HTTPStatus.OK
+    assert response['Content-Type'] == api.CONTENT_TYPE
+    return json.loads(response.content)
+
+
+def test_feed_keyset_pages(client, feed):
+    """Проверяет, что лента по курсорам отдаёт все новости по порядку."""
+    url = reverse('api_v1:feed')
+    ids, cursor = [], None
+    while True:
+        page = get_json(client, url, **({'after': cursor} if cursor else {}))
+        ids += [row['id'] for row in page['results']]
+        cursor = page['next']
+        if cursor is None:
+            break
+    assert ids == [news.pk for news in feed]
+    assert set(page['results'][0]) == set(api.FEED_FIELDS)
+
+
+def test_detail_and_comments(client, news):
+    """Проверяет новость с первой страницей комментариев и следующую."""
+    data = get_json(client, reverse('api_v1:detail', args=(news.pk,)))
+    assert data['title'] == news.title
+    assert not data['archived']
+    assert [c['text'] for c in data['comments']['results']] == [
+        f'Comment {i}' for i in range(PAGE_SIZE)
+    ]
+    assert data['comments']['results'][0]['author'] == 'author'
+    page = get_json(
+        client, reverse('api_v1:comments', args=(news.pk,)),
+        after=data['comments']['next'],
+    )
+    assert [c['text'] for c in page['results']] == [f'Comment {PAGE_SIZE}']
+    assert page['next'] is None
+
+
+def test_archived_news(client, news):
+    """Проверяет, что API отдаёт и архивную новость."""
+    News.objects.filter(pk=news.pk).update(date=date(2000, 1, 1))
+    call_command('archive_news', older_than=1)
+    data = get_json(client, reverse('api_v1:detail', args=(news.pk,)))
+    assert data['archived']
+    assert len(data['comments']['results']) == PAGE_SIZE
+
+
+def test_errors_are_json(client):
+    """Проверяет, что ошибки API тоже отдаются в JSON."""
+    response = client.get(reverse('api_v1:detail', args=(1,)))
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert json.loads(response.content)['detail']
+    response = client.get(reverse('api_v1:feed'), {'after': 'мусор'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_etag_and_gzip(client, news):
+    """
+    Проверяет ETag для обоих представлений ответа
+    и что сжатое тело совпадает с несжатым.
+    """
+    url = reverse('api_v1:detail', args=(news.pk,))
+    plain = client.get(url)
+    packed = client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+    assert packed['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(packed.content) == plain.content
+    assert plain['ETag'] != packed['ETag']
+    for response, encoding in ((plain, ''), (packed, 'gzip')):
+        repeated = client.get(
+            url, HTTP_IF_NONE_MATCH=response['ETag'],
+            HTTP_ACCEPT_ENCODING=encoding,
+        )
+        assert repeated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_cached_until_news_changes(
+        client, news, author, django_assert_num_queries
+):
+    """
+    Проверяет, что повторный запрос не обращается к базе,
+    а новый комментарий сразу виден.
+    """
+    url = reverse('api_v1:feed')
+    client.get(url)
+    with django_assert_num_queries(0):
+        client.get(url)
+    Comment.objects.create(news=news, author=author, text='Новый')
+    data = get_json(client, url)
+    assert data['results'][0]['comment_count'] == PAGE_SIZE + 2
+
+
+def test_query_string_does_not_create_cache_entries(
+        client, feed, django_assert_num_queries):
+    """
+    Проверяет, что посторонние параметры и порядок параметров
+    не создают новых записей в кеше.
+    """
+    url = reverse('api_v1:feed')
+    cursor = get_json(client, url)['next']
+    client.get(url, {'after': cursor})
+    with django_assert_num_queries(0):
+        client.get(url, {'junk': 'x'})
+        client.get(f'{url}?junk=y&after={cursor}')
+
+
+def test_json_fallback_matches_orjson(monkeypatch, news):
+    """Проверяет, что без orjson ответ кодируется так же."""
+    data = api.news_detail(news.pk)
+    fast = api.dumps(data)
+    monkeypatch.setattr(api, 'orjson', None)
+    assert api.dumps(data) == fast
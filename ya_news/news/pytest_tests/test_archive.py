@@ -0,0 +1,110 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+import pytest
+from news.models import ArchivedComment, ArchivedNews, Comment, News
+
+pytestmark = pytest.mark.django_db
+
+ARCHIVE_AFTER_DAYS = 30
+COMMENTS_ON_PAGE = 2
+
+
+@pytest.fixture(autouse=True)
+def archive_settings(settings):
+    settings.NEWS_ARCHIVE_AFTER_DAYS = ARCHIVE_AFTER_DAYS
+    settings.COMMENTS_COUNT_ON_PAGE = COMMENTS_ON_PAGE
+
+
+@pytest.fixture
+def old_news(author):
+    """Старая новость с тремя комментариями."""
+    news = News.objects.create(
+        title='Старая',
+        text='Давно это было',
+        date=timezone.localdate() - timedelta(days=ARCHIVE_AFTER_DAYS + 1),
+    )
+    for i in range(COMMENTS_ON_PAGE + 1):
+        Comment.objects.create(news=news, author=author, text=f'Comment {i}')
+    return news
+
+
+@pytest.fixture
+def fresh_news(author):
+    news = News.objects.create(title='Свежая', text='Только что')
+    Comment.objects.create(news=news, author=author, text='Свежий')
+    return news
+
+
+@pytest.fixture
+def archived(old_news, fresh_news):
+    call_command('archive_news', batch_size=1)
+    return old_news
+
+
+def test_command_moves_only_old_news(old_news, fresh_news):
+    """
+    Проверяет, что в архив уходят только старые новости с комментариями,
+    а первичные ключи и счётчики сохраняются.
+    """
+    comment_ids = set(
+        Comment.objects.filter(news=old_news).values_list('pk', flat=True)
+    )
+    call_command('archive_news', batch_size=1)
+    assert list(News.objects.values_list('pk', flat=True)) == [fresh_news.pk]
+    assert Comment.objects.filter(news=fresh_news).count() == 1
+    archived = ArchivedNews.objects.get()
+    assert (archived.pk, archived.title, archived.comment_count) == (
+        old_news.pk, old_news.title, COMMENTS_ON_PAGE + 1
+    )
+    assert set(
+        ArchivedComment.objects.values_list('pk', flat=True)
+    ) == comment_ids
+
+
+def test_home_shows_only_live_news(client, archived, fresh_news):
+    """Проверяет, что главная берёт новости только из живой таблицы."""
+    response = client.get(reverse('news:home'))
+    assert list(response.context['object_list']) == [fresh_news]
+
+
+def test_detail_falls_back_to_archive(author_client, archived):
+    """
+    Проверяет, что старая ссылка открывает архивную новость
+    с комментариями, но без формы и ссылок на правку.
+    """
+    response = author_client.get(
+        reverse('news:detail', kwargs={'pk': archived.pk})
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['news'].title == archived.title
+    assert response.context['archived']
+    assert len(response.context['comments']) == COMMENTS_ON_PAGE
+    assert 'form' not in response.context
+    assert 'Редактировать' not in response.content.decode()
+
+
+def test_load_more_reads_archive(client, archived):
+    """Проверяет, что «Показать ещё» листает архивные комментарии."""
+    response = client.get(reverse('news:detail', kwargs={'pk': archived.pk}))
+    page = client.get(
+        reverse('news:comments', kwargs={'pk': archived.pk}),
+        {'after': response.context['next_cursor']},
+    ).json()
+    assert f'Comment {COMMENTS_ON_PAGE}' in page['html']
+    assert page['next'] is None
+
+
+def test_archived_news_cannot_be_commented(author_client, archived):
+    """Проверяет, что комментарий к архивной новости не создаётся."""
+    response = author_client.post(
+        reverse('news:detail', kwargs={'pk': archived.pk}),
+        data={'text': 'Поздно'},
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert Comment.objects.count() == 1
+    assert ArchivedComment.objects.count() == COMMENTS_ON_PAGE + 1
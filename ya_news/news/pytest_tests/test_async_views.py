@@ -0,0 +1,51 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.test import AsyncClient
+from django.urls import resolve, reverse
+
+import pytest
+from news.query_budget import QueryBudgetExceeded
+from news.views import NewsList
+
+# Представления выполняются в потоках пула, у каждого своё
+# соединение, поэтому данные теста должны быть закоммичены.
+pytestmark = [
+    pytest.mark.django_db(transaction=True),
+    pytest.mark.usefixtures('async_views'),
+]
+
+
+@async_to_sync
+async def get(url):
+    return await AsyncClient().get(url)
+
+
+def test_read_views_are_async(news):
+    """Проверяет, что главная и страница новости — корутины."""
+    for url in (reverse('news:home'), reverse('news:detail', args=(1,))):
+        match = resolve(url)
+        assert asyncio.iscoroutinefunction(match.func)
+        assert match.func.view_class.read_from_replica
+
+
+def test_pages_served_through_asgi(settings, news):
+    """
+    Проверяет, что страницы отдаются через ASGI, запросы к базе
+    из потоков пула попадают в Server-Timing, а политика
+    HTTP-кеширования применяется и здесь.
+    """
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    for url in (reverse('news:home'), reverse('news:detail', args=(news.pk,))):
+        response = get(url)
+        assert response.status_code == 200
+        assert news.title in response.content.decode()
+        assert 'db;dur=' in response['Server-Timing']
+        assert 'public' in response['Cache-Control']
+
+
+def test_query_budget_sees_pool_queries(news, monkeypatch):
+    """Проверяет, что бюджет запросов учитывает запросы из пула."""
+    monkeypatch.setattr(NewsList, 'query_budget', 0)
+    with pytest.raises(QueryBudgetExceeded):
+        get(reverse('news:home'))
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+from django.core.cache import cache
+from django.urls import reverse
+
+import pytest
+from news.backends import USER_KEY
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def author_client(author_client):
+    """Первый запрос кладёт сессию и пользователя в кеш."""
+    author_client.get(reverse('news:home'))
+    return author_client
+
+
+def test_session_and_user_from_cache(
+        author_client, news, django_assert_num_queries
+):
+    """
+    Проверяет, что авторизованный запрос не читает
+    ни сессию, ни пользователя из базы.
+    """
+    with django_assert_num_queries(1):
+        response = author_client.get(reverse('news:comments', args=(news.pk,)))
+    assert response.wsgi_request.user.is_authenticated
+
+
+def test_user_update_visible(author_client, author):
+    """Проверяет, что правка пользователя сразу видна на страницах."""
+    author.username = 'renamed'
+    author.save()
+    response = author_client.get(reverse('news:home'))
+    assert 'renamed' in response.content.decode()
+
+
+def test_password_change_logs_out(author_client, author):
+    """Проверяет, что после смены пароля старая сессия недействительна."""
+    author.set_password('new-password')
+    author.save()
+    response = author_client.get(reverse('news:home'))
+    assert not response.wsgi_request.user.is_authenticated
+
+
+def test_logout_drops_cached_user(author_client, author):
+    """Проверяет, что выход удаляет пользователя из кеша."""
+    assert cache.get(USER_KEY.format(author.pk)) is not None
+    response = author_client.get(reverse('users:logout'))
+    assert response.status_code == HTTPStatus.OK
+    assert cache.get(USER_KEY.format(author.pk)) is None
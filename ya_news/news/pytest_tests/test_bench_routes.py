@@ -0,0 +1,50 @@
+import io
+import json
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+import pytest
+from news.management.commands.bench_routes import compare
+from news.models import News
+
+pytestmark = pytest.mark.django_db
+
+METRICS = {'p50_ms': 10, 'p95_ms': 20, 'queries': 3, 'bytes': 1000}
+
+
+@pytest.mark.parametrize('changes, regressed', [
+    ({'p50_ms': 11.9}, False),
+    ({'p95_ms': 25}, True),
+    ({'queries': 4}, True),
+    ({'queries': 2, 'bytes': 900}, False),
+])
+def test_compare_flags_regressions(changes, regressed):
+    """
+    Проверяет, что латентность сравнивается с допуском,
+    а рост числа запросов и размера ответа — строго.
+    """
+    baseline = {'10': {'news:home': METRICS}}
+    results = {'10': {'news:home': {**METRICS, **changes}}}
+    assert bool(compare(baseline, results, threshold=0.2)) is regressed
+
+
+def test_bench_routes_saves_and_checks_baseline(tmp_path):
+    """
+    Проверяет, что замер сохраняется в JSON, сравнивается сам с собой
+    без регрессий и не оставляет данных в базе.
+    """
+    path = tmp_path / 'baseline.json'
+    options = {'scales': [3], 'requests': 2, 'baseline': str(path)}
+    call_command('bench_routes', save=True, stdout=io.StringIO(), **options)
+    baseline = json.loads(path.read_text())
+    assert set(baseline['3']) == {'news:home', 'news:detail', 'news:edit'}
+    # Анонимные страницы замеряются без кеша страниц.
+    assert baseline['3']['news:home']['queries'] > 0
+    assert baseline['3']['news:detail']['queries'] > 0
+    assert not News.objects.exists()
+
+    baseline['3']['news:edit']['queries'] -= 1
+    path.write_text(json.dumps(baseline))
+    with pytest.raises(CommandError):
+        call_command('bench_routes', stdout=io.StringIO(), **options)
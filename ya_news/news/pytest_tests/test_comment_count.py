@@ -0,0 +1,71 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+def test_comment_count_follows_create_and_delete(author, news):
+    """
+    Проверяет, что счётчик комментариев меняется
+    при создании и удалении комментария.
+    """
+    comment = Comment.objects.create(news=news, author=author, text='1')
+    Comment.objects.create(news=news, author=author, text='2')
+    news.refresh_from_db()
+    assert news.comment_count == 2
+
+    comment.delete()
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+def test_comment_count_follows_bulk_operations(author, news):
+    """
+    Проверяет, что счётчик учитывает bulk_create
+    и удаление через QuerySet.delete().
+    """
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text=str(i)) for i in range(5)
+    )
+    news.refresh_from_db()
+    assert news.comment_count == 5
+
+    Comment.objects.filter(
+        pk__in=Comment.objects.filter(news=news).values('pk')[:3]
+    ).delete()
+    news.refresh_from_db()
+    assert news.comment_count == 2
+
+
+def test_recount_comments_fixes_drift(author, news):
+    """
+    Проверяет, что команда recount_comments
+    исправляет рассинхронизированный счётчик.
+    """
+    Comment.objects.create(news=news, author=author, text='1')
+    News.objects.filter(pk=news.pk).update(comment_count=42)
+
+    call_command('recount_comments', batch_size=1)
+
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+def test_home_page_does_not_load_comments(client, author, news):
+    """
+    Проверяет, что главная страница выводит число комментариев,
+    не загружая сами комментарии.
+    """
+    Comment.objects.create(news=news, author=author, text='1')
+    url = reverse('news:home')
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(url)
+    assert 'Комментариев: 1' in response.content.decode()
+    assert not any(
+        '"news_comment"."text"' in query['sql'] for query in queries
+    )
@@ -0,0 +1,98 @@
+import re
+from http import HTTPStatus
+
+from django.contrib.auth.models import User
+from django.urls import reverse
+
+import pytest
+from news.forms import BAD_WORDS
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+COMMENTS_ON_PAGE = 3
+COMMENT_TEXT = re.compile(r'<p class="mb-0">(.*?)</p>')
+
+
+@pytest.fixture(autouse=True)
+def comments_on_page(settings):
+    settings.COMMENTS_COUNT_ON_PAGE = COMMENTS_ON_PAGE
+
+
+@pytest.fixture
+def news():
+    """Создает новость с несколькими страницами комментариев."""
+    news = News.objects.create(title='Test News', text='Test news text')
+    author = User.objects.create_user(username='author', password='password')
+    for i in range(COMMENTS_ON_PAGE * 2 + 1):
+        Comment.objects.create(news=news, author=author, text=f'Comment {i}')
+    return news
+
+
+def test_detail_page_shows_first_page_only(client, news):
+    """
+    Проверяет, что на странице новости выводится
+    только первая страница комментариев.
+    """
+    url = reverse('news:detail', kwargs={'pk': news.pk})
+    response = client.get(url)
+    comments = response.context['comments']
+    assert len(comments) == COMMENTS_ON_PAGE
+    assert comments == list(Comment.objects.filter(news=news)[:3])
+    assert response.context['next_cursor']
+
+
+def test_load_more_walks_through_all_comments(client, news):
+    """
+    Проверяет, что по курсорам можно получить все комментарии
+    в хронологическом порядке и без повторов.
+    """
+    response = client.get(reverse('news:detail', kwargs={'pk': news.pk}))
+    texts = [comment.text for comment in response.context['comments']]
+    cursor = response.context['next_cursor']
+    url = reverse('news:comments', kwargs={'pk': news.pk})
+    while cursor:
+        page = client.get(url, {'after': cursor}).json()
+        texts += COMMENT_TEXT.findall(page['html'])
+        cursor = page['next']
+    expected = list(
+        Comment.objects.filter(news=news).values_list('text', flat=True)
+    )
+    assert texts == expected
+
+
+def test_load_more_query_count_does_not_depend_on_depth(
+        client, news, django_assert_num_queries):
+    """
+    Проверяет, что любая страница комментариев
+    загружается одним запросом.
+    """
+    url = reverse('news:comments', kwargs={'pk': news.pk})
+    cursor = client.get(url).json()['next']
+    while cursor:
+        with django_assert_num_queries(1):
+            cursor = client.get(url, {'after': cursor}).json()['next']
+
+
+def test_invalid_cursor_returns_bad_request(client, news):
+    """Проверяет, что испорченный курсор не приводит к ошибке сервера."""
+    url = reverse('news:comments', kwargs={'pk': news.pk})
+    response = client.get(url, {'after': 'not-a-cursor'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_rejected_comment_page_keeps_comments(client, news):
+    """
+    Проверяет, что страница с отклонённым комментарием
+    показывает комментарии новости.
+    """
+    client.force_login(User.objects.get(username='author'))
+    response = client.post(
+        reverse('news:detail', kwargs={'pk': news.pk}),
+        {'text': f'Какой ты {BAD_WORDS[0]}'},
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert response.context['form'].errors
+    texts = [comment.text for comment in response.context['comments']]
+    assert texts == [f'Comment {i}' for i in range(COMMENTS_ON_PAGE)]
+    assert response.context['next_cursor']
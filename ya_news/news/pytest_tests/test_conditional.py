@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+from django.urls import reverse
+
+import pytest
+from news.models import Comment
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def detail_url(news):
+    return reverse('news:detail', kwargs={'pk': news.pk})
+
+
+@pytest.mark.parametrize('url_name', ['news:home', 'news:detail'])
+def test_unchanged_page_returns_not_modified(client, news, url_name):
+    """
+    Проверяет, что при совпадении ETag страница
+    не рендерится повторно.
+    """
+    kwargs = {'pk': news.pk} if url_name == 'news:detail' else {}
+    url = reverse(url_name, kwargs=kwargs)
+    etag = client.get(url)['ETag']
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+    assert response.content == b''
+
+
+def test_new_comment_changes_etag(client, author, news, detail_url):
+    """Проверяет, что новый комментарий меняет ETag."""
+    first = client.get(detail_url)
+    Comment.objects.create(news=news, author=author, text='Comment')
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=first['ETag'])
+    assert response.status_code == HTTPStatus.OK
+    assert response['ETag'] != first['ETag']
+
+
+def test_if_modified_since_alone_does_not_hide_edit(
+        client, news, detail_url):
+    """
+    Проверяет, что после правки текста новости запрос
+    с одним If-Modified-Since получает новую страницу.
+    """
+    first = client.get(detail_url)
+    assert not first.has_header('Last-Modified')
+    news.text = 'Edited text'
+    news.save()
+    response = client.get(
+        detail_url, HTTP_IF_MODIFIED_SINCE='Fri, 01 Jan 2100 00:00:00 GMT'
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert 'Edited text' in response.content.decode()
+
+
+def test_news_edit_changes_etag(client, news, detail_url):
+    """
+    Проверяет, что правка текста новости
+    не оставляет у клиента устаревшую страницу.
+    """
+    etag = client.get(detail_url)['ETag']
+    news.text = 'Edited text'
+    news.save()
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_etag_differs_between_users(client, author, detail_url):
+    """
+    Проверяет, что анонимный и авторизованный пользователь
+    получают разные ETag: у них разное содержимое страницы.
+    """
+    anonymous_etag = client.get(detail_url)['ETag']
+    client.force_login(author)
+    response = client.get(detail_url, HTTP_IF_NONE_MATCH=anonymous_etag)
+    assert response.status_code == HTTPStatus.OK
+    assert 'form' in response.context
+
+
+def test_missing_news_still_not_found(client):
+    """Проверяет, что для несуществующей новости возвращается 404."""
+    url = reverse('news:detail', kwargs={'pk': 404})
+    response = client.get(url, HTTP_IF_NONE_MATCH='"any"')
+    assert response.status_code == HTTPStatus.NOT_FOUND
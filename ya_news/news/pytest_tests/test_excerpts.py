@@ -0,0 +1,51 @@
+from django.core.management import call_command
+from django.db import connection
+from django.template.defaultfilters import truncatewords
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from news.models import News
+
+pytestmark = pytest.mark.django_db
+
+LONG_TEXT = ' '.join(f'слово{i}' for i in range(100))
+
+
+def test_excerpt_maintained_on_save():
+    """Проверяет, что анонс совпадает с truncatewords и следует за текстом."""
+    news = News.objects.create(title='Заголовок', text=LONG_TEXT)
+    assert news.excerpt == truncatewords(LONG_TEXT, 15)
+    news.text = 'Новый текст'
+    news.save(update_fields=['text'])
+    news.refresh_from_db()
+    assert news.excerpt == 'Новый текст'
+
+
+def test_excerpt_set_by_bulk_create():
+    """Проверяет, что bulk_create тоже заполняет анонс."""
+    News.objects.bulk_create([News(title='Пачка', text=LONG_TEXT)])
+    assert News.objects.get().excerpt == truncatewords(LONG_TEXT, 15)
+
+
+def test_home_page_does_not_read_text(client):
+    """Проверяет, что главная выводит анонс, не загружая текст новости."""
+    News.objects.create(title='Заголовок', text=LONG_TEXT)
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(reverse('news:home'))
+    assert truncatewords(LONG_TEXT, 15) in response.content.decode()
+    assert not any(
+        '"news_news"."text"' in query['sql'] for query in queries
+    )
+
+
+def test_backfill_command():
+    """Проверяет, что команда восстанавливает анонсы после update()."""
+    News.objects.bulk_create(
+        News(title=f'Новость {i}', text=LONG_TEXT) for i in range(5)
+    )
+    News.objects.update(excerpt='')
+    call_command('backfill_excerpts', batch_size=2)
+    assert set(News.objects.values_list('excerpt', flat=True)) == {
+        truncatewords(LONG_TEXT, 15)
+    }
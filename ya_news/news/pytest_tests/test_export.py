@@ -0,0 +1,160 @@
+import csv
+import gzip
+import io
+import json
+from datetime import date
+from http import HTTPStatus
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+from news.export import news_with_comments
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def export_url():
+    return reverse('news:export')
+
+
+@pytest.fixture
+def staff_client(client):
+    client.force_login(User.objects.create_user(
+        username='analyst', is_staff=True
+    ))
+    return client
+
+
+@pytest.fixture
+def news(author):
+    """Три новости разных дат, у средней нет комментариев."""
+    first, second, third = (
+        News.objects.create(title=f'Новость {day}', text='Текст',
+                            date=date(2022, 1, day))
+        for day in (1, 2, 3)
+    )
+    for text in ('Первый', 'Второй'):
+        Comment.objects.create(news=first, author=author, text=text)
+    Comment.objects.create(news=third, author=author, text='Третий')
+    return first, second, third
+
+
+def streamed(response):
+    content = b''.join(response.streaming_content)
+    if response.get('Content-Encoding') == 'gzip':
+        content = gzip.decompress(content)
+    return content.decode()
+
+
+def test_ndjson_nests_comments(staff_client, export_url, news):
+    """Проверяет, что строка NDJSON — новость со своими комментариями."""
+    response = staff_client.get(export_url)
+    assert response.status_code == HTTPStatus.OK
+    rows = [json.loads(line) for line in streamed(response).splitlines()]
+    assert [row['id'] for row in rows] == [item.pk for item in news]
+    assert [
+        [comment['text'] for comment in row['comments']] for row in rows
+    ] == [['Первый', 'Второй'], [], ['Третий']]
+    assert rows[0]['comments'][0]['author'] == 'author'
+    assert rows[0]['date'] == '2022-01-01'
+
+
+def test_csv_row_per_comment(staff_client, export_url, news):
+    """
+    Проверяет, что в CSV строка на комментарий,
+    а новость без комментариев занимает одну строку.
+    """
+    response = staff_client.get(export_url, {'format': 'csv'})
+    rows = list(csv.DictReader(io.StringIO(streamed(response))))
+    assert [(row['news_title'], row['comment_text']) for row in rows] == [
+        ('Новость 1', 'Первый'),
+        ('Новость 1', 'Второй'),
+        ('Новость 2', ''),
+        ('Новость 3', 'Третий'),
+    ]
+
+
+def test_date_range(staff_client, export_url, news):
+    """Проверяет, что выгружаются только новости из диапазона дат."""
+    response = staff_client.get(
+        export_url, {'from': '2022-01-02', 'to': '2022-01-03'}
+    )
+    rows = [json.loads(line) for line in streamed(response).splitlines()]
+    assert [row['id'] for row in rows] == [news[1].pk, news[2].pk]
+    assert len(rows[1]['comments']) == 1
+
+
+def test_gzip_on_the_fly(staff_client, export_url, news):
+    """Проверяет, что сжатый ответ распаковывается в ту же выгрузку."""
+    plain = streamed(staff_client.get(export_url))
+    response = staff_client.get(export_url, HTTP_ACCEPT_ENCODING='gzip')
+    assert response['Content-Encoding'] == 'gzip'
+    assert streamed(response) == plain
+
+
+@pytest.mark.parametrize('params', (
+    {'format': 'xml'}, {'from': '2022-13-01'}, {'to': 'вчера'},
+))
+def test_bad_parameters(staff_client, export_url, params):
+    """Проверяет, что неизвестный формат и кривые даты дают 400."""
+    response = staff_client.get(export_url, params)
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+
+
+def test_staff_only(client, export_url, author):
+    """Проверяет, что выгрузка недоступна анонимам и обычным пользователям."""
+    assert client.get(export_url).status_code == HTTPStatus.FOUND
+    client.force_login(author)
+    assert client.get(export_url).status_code == HTTPStatus.FORBIDDEN
+
+
+def test_two_queries_regardless_of_size(
+        author, django_assert_num_queries
+):
+    """
+    Проверяет, что новости и комментарии читаются двумя потоковыми
+    запросами, сколько бы их ни было.
+    """
+    News.objects.bulk_create(
+        News(title=f'Новость {i}', text='Текст') for i in range(30)
+    )
+    Comment.objects.bulk_create(
+        Comment(news=news, author=author, text='Текст')
+        for news in News.objects.all()
+    )
+    with django_assert_num_queries(2):
+        comments = sum(
+            1 for row in news_with_comments(chunk_size=7)
+            for _ in row['comments']
+        )
+    assert comments == 30
+
+
+def test_comments_streamed_one_by_one(news):
+    """
+    Проверяет, что комментарии новости отдаются по одному,
+    а непройденные не попадают к следующей новости.
+    """
+    rows = news_with_comments(chunk_size=1)
+    first = next(rows)
+    assert next(first['comments'])['text'] == 'Первый'
+    assert [
+        [comment['text'] for comment in row['comments']] for row in rows
+    ] == [[], ['Третий']]
+
+
+def test_command_writes_gzip_file(tmp_path, news):
+    """Проверяет, что команда пишет сжатую выгрузку в файл."""
+    output = tmp_path / 'news.csv.gz'
+    call_command(
+        'export_news', format='csv', gzip=True, output=str(output),
+        date_from=date(2022, 1, 3),
+    )
+    rows = list(csv.DictReader(
+        io.StringIO(gzip.decompress(output.read_bytes()).decode())
+    ))
+    assert [row['comment_text'] for row in rows] == ['Третий']
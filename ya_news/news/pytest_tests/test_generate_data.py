@@ -0,0 +1,56 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db.models import Count
+
+import pytest
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+def generate(**options):
+    call_command('generate_news_data', stdout=io.StringIO(), **options)
+
+
+def snapshot():
+    return (
+        list(News.objects.order_by('pk').values_list('title', 'date')),
+        list(Comment.objects.order_by('pk').values_list('text', 'created')),
+    )
+
+
+def test_generates_requested_volume():
+    """
+    Проверяет, что создаётся заданное число объектов,
+    а счётчики комментариев совпадают с реальными.
+    """
+    generate(users=5, news=10, comments=3, batch_size=7)
+    assert User.objects.count() == 5
+    assert News.objects.count() == 10
+    assert Comment.objects.count() == 30
+    for news in News.objects.annotate(actual=Count('comment')):
+        assert news.comment_count == news.actual
+
+
+def test_popularity_is_skewed():
+    """
+    Проверяет, что комментарии распределены неравномерно:
+    самая популярная новость собирает заметную долю.
+    """
+    generate(users=5, news=50, comments=20, skew=1.2)
+    counts = sorted(
+        News.objects.values_list('comment_count', flat=True), reverse=True
+    )
+    assert counts[0] > 10 * counts[len(counts) // 2]
+
+
+def test_same_seed_gives_same_data():
+    """Проверяет, что одинаковый seed даёт одинаковые данные."""
+    generate(users=3, news=5, comments=2, seed=7)
+    first = snapshot()
+    News.objects.all().delete()
+    User.objects.all().delete()
+    generate(users=3, news=5, comments=2, seed=7)
+    assert snapshot() == first
@@ -0,0 +1,124 @@
+import io
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import Client
+from django.urls import reverse
+
+import pytest
+from news.management.commands.bench_http_cache import (
+    BYPASS, HIT, MISS, REVALIDATED, STALE, CachingProxy,
+)
+from news.models import Comment
+
+pytestmark = pytest.mark.django_db
+
+POLICY = 'public, max-age=60, stale-while-revalidate=300'
+
+
+@pytest.fixture
+def session_cookie(author):
+    client = Client()
+    client.force_login(author)
+    return client.cookies[settings.SESSION_COOKIE_NAME].value
+
+
+@pytest.fixture
+def clock():
+    """Модельное время прокси, двигается вручную."""
+    now = [0.0]
+    return now
+
+
+@pytest.fixture
+def proxy(clock):
+    return CachingProxy(clock=lambda: clock[0])
+
+
+def page_url(url_name, news):
+    if url_name == 'news:detail':
+        return reverse(url_name, args=(news.pk,))
+    return reverse(url_name)
+
+
+@pytest.mark.parametrize('url_name', ['news:home', 'news:detail'])
+def test_anonymous_pages_are_public(client, news, url_name):
+    """
+    Проверяет, что анонимные страницы можно хранить в общем кеше
+    и они не зависят от cookie.
+    """
+    response = client.get(page_url(url_name, news))
+    assert response['Cache-Control'] == POLICY
+    assert not response.has_header('Vary')
+
+
+@pytest.mark.parametrize('url_name', ['news:home', 'news:detail'])
+def test_authenticated_pages_are_private(client, news, author, url_name):
+    """Проверяет, что страницы пользователя общий кеш не хранит."""
+    client.force_login(author)
+    response = client.get(page_url(url_name, news))
+    assert response['Cache-Control'] == 'private, no-cache'
+    assert response['Vary'] == 'Cookie'
+
+
+def test_response_with_cookie_is_private(client, news):
+    """
+    Проверяет, что ответ, который ставит cookie (здесь — удаляет
+    cookie истёкшей сессии), общий кеш не хранит.
+    """
+    client.cookies[settings.SESSION_COOKIE_NAME] = 'expired'
+    response = client.get(reverse('news:home'))
+    assert response.cookies
+    assert response['Cache-Control'] == 'private, no-cache'
+
+
+def test_other_views_untouched(client, news):
+    """Проверяет, что маршруты без политики заголовков не получают."""
+    response = client.get(reverse('news:search'), {'q': 'Заголовок'})
+    assert not response.has_header('Cache-Control')
+    response = client.get(reverse('news:detail', args=(news.pk + 1,)))
+    assert not response.has_header('Cache-Control')
+
+
+def test_proxy_serves_all_anonymous_visitors(proxy, news, session_cookie):
+    """
+    Проверяет, что после первого запроса аноним с любыми cookie,
+    кроме сессии, получает страницу из общего кеша.
+    """
+    url = reverse('news:detail', args=(news.pk,))
+    visitors = [{}, {'_ym_uid': '1'}, {'_ym_uid': '2', 'csrftoken': 'x'}]
+    outcomes = [proxy.get(url, cookies)[1] for cookies in visitors]
+    assert outcomes == [MISS, HIT, HIT]
+    _, outcome = proxy.get(
+        url, {settings.SESSION_COOKIE_NAME: session_cookie}
+    )
+    assert outcome == BYPASS
+    assert proxy.upstream == 2
+
+
+def test_proxy_stale_while_revalidate(proxy, clock, news, author):
+    """
+    Проверяет, что устаревшая страница отдаётся сразу и обновляется,
+    а после stale-while-revalidate сверяется по ETag.
+    """
+    url = reverse('news:detail', args=(news.pk,))
+    proxy.get(url)
+    Comment.objects.create(news=news, author=author, text='Свежий')
+    clock[0] = 61
+    response, outcome = proxy.get(url)
+    assert outcome == STALE
+    assert 'Свежий' not in response.content.decode()
+    response, outcome = proxy.get(url)
+    assert outcome == HIT
+    assert 'Свежий' in response.content.decode()
+    clock[0] = 61 + 60 + 300
+    assert proxy.get(url)[1] == REVALIDATED
+
+
+def test_bench_reports_hit_rate():
+    """Проверяет, что команда сравнивает долю попаданий в кеш."""
+    out = io.StringIO()
+    call_command('bench_http_cache', requests=50, news=3, stdout=out)
+    lines = out.getvalue().splitlines()
+    assert lines[1].split()[-1] == '50'
+    assert int(lines[2].split()[-1]) < 50
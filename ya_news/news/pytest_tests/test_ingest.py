@@ -0,0 +1,108 @@
+import queue
+from http import HTTPStatus
+from threading import Thread
+
+from django.test import RequestFactory
+from django.urls import reverse
+
+import pytest
+from news import cache, conditional, models
+from news.ingest import CommentQueue, comment_queue
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def queue_mode(settings):
+    settings.COMMENT_INGEST_MODE = 'queue'
+    yield
+    comment_queue.stop()
+
+
+def test_author_sees_queued_comment(client, author, news):
+    """
+    Проверяет, что комментарий из очереди записывается
+    и автор сразу видит его на странице новости.
+    """
+    client.force_login(author)
+    url = reverse('news:detail', args=(news.pk,))
+    client.post(url, {'text': 'Из очереди'})
+    response = client.get(url)
+    assert 'Из очереди' in response.content.decode()
+    news.refresh_from_db()
+    assert news.comment_count == 1
+
+
+def test_author_not_modified_after_queued_comment(
+        client, monkeypatch, author, news):
+    """
+    Проверяет, что ETag, посчитанный другим запросом до COMMIT
+    пачки из очереди, не даёт автору 304 без его комментария.
+    """
+    client.force_login(author)
+    url = reverse('news:detail', args=(news.pk,))
+    client.get(url)
+    stale_rows = list(conditional.with_last_comment(
+        News.objects.filter(pk=news.pk)
+    ))
+    request = RequestFactory().get(url)
+    request.user = author
+    request.COOKIES['csrftoken'] = client.cookies['csrftoken'].value
+    etags = []
+    invalidate_news = models.invalidate_news
+
+    def invalidate_before_commit(*news_ids):
+        # Другой запрос автора уже видит новую версию кеша,
+        # но ещё читает строки без комментария.
+        invalidate_news(*news_ids)
+        reader = Thread(target=lambda: etags.append(
+            conditional.get_etag(
+                request, cache.detail_scope(news.pk), stale_rows
+            )
+        ))
+        reader.start()
+        reader.join()
+
+    monkeypatch.setattr(models, 'invalidate_news', invalidate_before_commit)
+    client.post(url, {'text': 'Из очереди'})
+    comment_queue.flush()
+    response = client.get(url, HTTP_IF_NONE_MATCH=f'"{etags[0]}"')
+    assert response.status_code == HTTPStatus.OK
+    assert 'Из очереди' in response.content.decode()
+
+
+def test_stop_flushes_queue(author, news):
+    """Проверяет, что остановка дописывает всё, что стоит в очереди."""
+    writer = CommentQueue()
+    for i in range(5):
+        assert writer.submit(
+            Comment(news=news, author=author, text=f'Текст {i}')
+        )
+    writer.stop()
+    assert Comment.objects.count() == 5
+    assert not writer.pending
+
+
+def test_full_queue_falls_back_to_sync(settings, author, news):
+    """
+    Проверяет, что при переполненной очереди комментарий
+    не ставится в неё, а возвращается для синхронной записи.
+    """
+    settings.COMMENT_QUEUE_PUT_TIMEOUT = 0
+    writer = CommentQueue()
+    # Поток-писатель не запущен, очередь занята до отказа.
+    writer.thread = object()
+    writer.queue = queue.Queue(1)
+    writer.queue.put(None)
+    comment = Comment(news=news, author=author, text='Текст')
+    assert not writer.submit(comment)
+    assert not writer.pending
+
+
+def test_sync_mode_skips_queue(settings, author, news):
+    """Проверяет, что в режиме sync очередь не используется."""
+    settings.COMMENT_INGEST_MODE = 'sync'
+    writer = CommentQueue()
+    assert not writer.submit(Comment(news=news, author=author, text='Т'))
+    assert writer.thread is None
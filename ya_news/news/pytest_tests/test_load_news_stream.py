@@ -0,0 +1,118 @@
+import io
+import json
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+import pytest
+from news.management.commands.load_news_stream import iter_json_array
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+CREATED = '2022-11-01T10:00:00Z'
+
+
+@pytest.fixture
+def records(author):
+    records = []
+    for pk in range(1, 4):
+        records.append({
+            'model': 'news.news',
+            'pk': pk,
+            'fields': {
+                'title': f'News {pk}',
+                'text': 'Text',
+                'date': '2022-11-01',
+                'comment_count': 100,
+            },
+        })
+        records.extend(
+            {
+                'model': 'news.comment',
+                'fields': {
+                    'news': pk,
+                    'author': author.pk,
+                    'text': f'Comment {i}',
+                    'created': CREATED,
+                },
+            }
+            for i in range(pk)
+        )
+    return records
+
+
+def test_json_array_read_in_small_chunks():
+    """
+    Проверяет, что массив разбирается по частям,
+    даже если объект не помещается в один блок чтения.
+    """
+    items = [{'text': 'а' * 20, 'n': i} for i in range(5)]
+    stream = io.StringIO(json.dumps(items, ensure_ascii=False, indent=2))
+    assert list(iter_json_array(stream, read_size=7)) == items
+
+
+def test_json_array_rejects_oversized_object():
+    """
+    Проверяет, что незакрытый объект не читается в память до конца
+    файла: разбор прерывается, как только буфер превысил предел.
+    """
+    stream = io.StringIO('[{"text": "' + 'а' * 10000)
+    with pytest.raises(CommandError):
+        list(iter_json_array(stream, read_size=7, max_object_size=50))
+    assert stream.tell() < 100
+
+
+@pytest.mark.parametrize('file_name', ['dump.json', 'dump.ndjson'])
+def test_loads_news_and_comments(tmp_path, records, file_name):
+    """
+    Проверяет загрузку из JSON и NDJSON: даты комментариев
+    сохраняются, счётчики совпадают с числом комментариев.
+    """
+    path = tmp_path / file_name
+    if file_name.endswith('.ndjson'):
+        path.write_text('\n'.join(json.dumps(record) for record in records))
+    else:
+        path.write_text(json.dumps(records))
+
+    call_command(
+        'load_news_stream', str(path), batch_size=2, transaction_size=3,
+        stdout=io.StringIO(),
+    )
+
+    assert News.objects.count() == 3
+    assert Comment.objects.count() == 6
+    assert list(
+        News.objects.order_by('pk').values_list('comment_count', flat=True)
+    ) == [1, 2, 3]
+    assert set(Comment.objects.values_list('created', flat=True)) == {
+        datetime(2022, 11, 1, 10, tzinfo=timezone.utc)
+    }
+
+
+def test_loads_project_fixture():
+    """Проверяет, что фикстура проекта загружается командой."""
+    fixture = settings.BASE_DIR / 'news' / 'fixtures' / 'news.json'
+    call_command('load_news_stream', str(fixture), stdout=io.StringIO())
+    with open(fixture, encoding='utf-8') as fixture_file:
+        assert News.objects.count() == len(json.load(fixture_file))
+
+
+def test_loaded_dates_do_not_affect_other_comments(author):
+    """
+    Проверяет, что загрузка с заданными датами не отключает
+    auto_now_add для комментариев, сохраняемых обычным путём.
+    """
+    news = News.objects.create(title='Заголовок', text='Текст')
+    created = datetime(2022, 11, 1, 10, tzinfo=timezone.utc)
+    Comment.objects.bulk_load([
+        Comment(news=news, author=author, text='Старый', created=created)
+    ])
+    fresh = Comment.objects.create(news=news, author=author, text='Новый')
+
+    assert Comment.objects.get(text='Старый').created == created
+    assert fresh.created is not None and fresh.created > created
+    news.refresh_from_db()
+    assert news.comment_count == 2
@@ -0,0 +1,71 @@
+import os
+
+import pytest
+from news.forms import BAD_WORDS, CommentForm
+from news.moderation import BadWordsSource, WordMatcher
+
+
+@pytest.mark.parametrize('text, found', [
+    ('эабвэ', True),
+    ('аабвгж', True),
+    ('абгвде', False),
+    ('', False),
+])
+def test_matcher_follows_failure_links(text, found):
+    """
+    Проверяет, что автомат находит слова, начинающиеся
+    внутри частично совпавшего другого слова.
+    """
+    matcher = WordMatcher(['абвгд', 'бв', 'вгде'])
+    assert matcher.search(text) is found
+
+
+@pytest.mark.parametrize('word', BAD_WORDS)
+def test_matcher_agrees_with_substring_search(word):
+    """Проверяет, что слово находится в любом месте текста."""
+    matcher = WordMatcher(BAD_WORDS)
+    assert matcher.search(f'ах ты {word}ище!')
+
+
+def test_words_reloaded_from_file(settings, tmp_path):
+    """
+    Проверяет, что изменённый файл со словами
+    подхватывается без перезапуска.
+    """
+    words_file = tmp_path / 'bad_words.txt'
+    words_file.write_text('# список\nбука\n', encoding='utf-8')
+    settings.BAD_WORDS_FILE = str(words_file)
+    settings.BAD_WORDS_RELOAD_INTERVAL = 0
+    source = BadWordsSource(BAD_WORDS)
+    assert source.get_matcher().search('злая бука')
+    assert not source.get_matcher().search('бяка')
+
+    words_file.write_text('бяка\n', encoding='utf-8')
+    stat = words_file.stat()
+    os.utime(words_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert source.get_matcher().search('бяка')
+    assert not source.get_matcher().search('злая бука')
+
+
+def test_unreadable_file_keeps_last_words(settings, tmp_path):
+    """
+    Проверяет, что без файла со словами проверка не падает:
+    остаётся последний прочитанный список, а до него — встроенный.
+    """
+    words_file = tmp_path / 'bad_words.txt'
+    settings.BAD_WORDS_FILE = str(words_file)
+    settings.BAD_WORDS_RELOAD_INTERVAL = 0
+    source = BadWordsSource(BAD_WORDS)
+    assert source.get_matcher().search(BAD_WORDS[0])
+
+    words_file.write_text('бука\n', encoding='utf-8')
+    assert source.get_matcher().search('злая бука')
+    words_file.unlink()
+    assert source.get_matcher().search('злая бука')
+
+
+def test_form_rejects_bad_word_in_any_case():
+    """Проверяет, что регистр букв не помогает обойти проверку."""
+    form = CommentForm(data={'text': BAD_WORDS[0].upper()})
+    assert not form.is_valid()
+    assert 'text' in form.errors
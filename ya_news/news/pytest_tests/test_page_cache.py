@@ -0,0 +1,146 @@
+from http import HTTPStatus
+from threading import Thread
+
+from django.core.checks import run_checks
+from django.db import transaction
+from django.urls import reverse
+
+import pytest
+from news import cache
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def file_cache(settings, tmp_path):
+    """Подменяет кеш на файловый."""
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': str(tmp_path),
+        }
+    }
+
+
+@pytest.mark.parametrize('url_name', ['news:home', 'news:detail'])
+def test_anonymous_pages_served_from_cache(
+        client, news, url_name, django_assert_num_queries):
+    """
+    Проверяет, что повторный анонимный запрос
+    не обращается к базе данных.
+    """
+    kwargs = {'pk': news.pk} if url_name == 'news:detail' else {}
+    url = reverse(url_name, kwargs=kwargs)
+    first = client.get(url)
+    with django_assert_num_queries(0):
+        second = client.get(url)
+    assert second.status_code == HTTPStatus.OK
+    assert second.content == first.content
+
+
+def test_new_comment_invalidates_pages(client, author, news):
+    """
+    Проверяет, что новый комментарий сбрасывает кеш
+    страницы новости и главной страницы.
+    """
+    detail_url = reverse('news:detail', kwargs={'pk': news.pk})
+    home_url = reverse('news:home')
+    client.get(detail_url)
+    client.get(home_url)
+
+    Comment.objects.create(news=news, author=author, text='Fresh comment')
+
+    assert 'Fresh comment' in client.get(detail_url).content.decode()
+    assert 'Комментариев: 1' in client.get(home_url).content.decode()
+
+
+def test_news_change_invalidates_only_its_page(client, news):
+    """
+    Проверяет, что изменение новости не сбрасывает
+    кеш страниц других новостей.
+    """
+    other = News.objects.create(title='Other News', text='Other text')
+    client.get(reverse('news:detail', kwargs={'pk': news.pk}))
+    other_version = cache.get_version(cache.detail_scope(other.pk))
+
+    news.title = 'Updated News'
+    news.save()
+
+    response = client.get(reverse('news:detail', kwargs={'pk': news.pk}))
+    assert 'Updated News' in response.content.decode()
+    assert cache.get_version(cache.detail_scope(other.pk)) == other_version
+
+
+def test_authorized_user_page_not_cached(client, author, news):
+    """
+    Проверяет, что авторизованный пользователь
+    получает собственную, а не кешированную страницу.
+    """
+    url = reverse('news:detail', kwargs={'pk': news.pk})
+    client.get(url)
+    client.force_login(author)
+    response = client.get(url)
+    assert 'form' in response.context
+    assert author.username in response.content.decode()
+
+
+def test_stale_page_served_while_rebuilding(news):
+    """
+    Проверяет, что пока страницу перестраивает другой процесс,
+    остальные получают предыдущую версию, а не строят её заново.
+    """
+    scope = cache.detail_scope(news.pk)
+    assert cache.cached_page(scope, lambda: 'old') == 'old'
+    cache.invalidate(scope)
+    cache.get_cache().add(cache.LOCK_KEY.format(scope), True)
+
+    def render():
+        raise AssertionError('Страница не должна перестраиваться.')
+
+    assert cache.cached_page(scope, render) == 'old'
+
+
+def test_file_based_cache_supported(client, news, file_cache):
+    """Проверяет, что кеш страниц работает с файловым бэкендом."""
+    url = reverse('news:detail', kwargs={'pk': news.pk})
+    client.get(url)
+    news.title = 'Updated News'
+    news.save()
+    assert 'Updated News' in client.get(url).content.decode()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_page_cached_before_commit_is_invalidated(client, author, news):
+    """
+    Проверяет, что страница, сохранённая другим соединением
+    до COMMIT пишущей транзакции, устаревает после фиксации.
+    """
+    url = reverse('news:detail', kwargs={'pk': news.pk})
+    client.get(url)
+
+    def read_before_commit():
+        # Другое соединение ещё не видит комментарий.
+        cache.cached_page(cache.detail_scope(news.pk), lambda: 'stale')
+
+    with transaction.atomic():
+        Comment.objects.create(news=news, author=author, text='Committed')
+        reader = Thread(target=read_before_commit)
+        reader.start()
+        reader.join()
+
+    assert 'Committed' in client.get(url).content.decode()
+
+
+def test_per_process_cache_reported(settings):
+    """
+    Проверяет, что кеш страниц в памяти процесса
+    отмечается предупреждением, а общий — нет.
+    """
+    assert 'news.W001' not in {check.id for check in run_checks()}
+    settings.CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+    assert 'news.W001' in {check.id for check in run_checks()}
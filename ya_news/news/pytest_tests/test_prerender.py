@@ -0,0 +1,110 @@
+import io
+from http import HTTPStatus
+
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+from news import cache
+from news.models import Comment, News
+from news.prerender import (
+    SERVED_HEADER, record_visit, regenerate, regenerator,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def prerender_dir(settings, tmp_path, monkeypatch):
+    # Фоновый поток не нужен: тесты вызывают regenerate() сами.
+    monkeypatch.setattr(regenerator, 'start', lambda: None)
+    settings.NEWS_PRERENDER_DIR = tmp_path
+    settings.NEWS_PRERENDER_SERVE = True
+    settings.NEWS_PRERENDER_TOP = 1
+    return tmp_path
+
+
+def detail_path(news):
+    return cache.static_page_path(cache.detail_scope(news.pk))
+
+
+def test_command_renders_home_and_detail(news):
+    """Проверяет, что команда сохраняет главную и страницу новости."""
+    call_command('prerender_news', stdout=io.StringIO())
+    home = cache.static_page_path(cache.LIST_SCOPE).read_text()
+    assert news.title in home
+    assert news.text in detail_path(news).read_text()
+
+
+def test_anonymous_served_from_file(client, news, author):
+    """
+    Проверяет, что аноним получает файл с политикой кеширования,
+    а авторизованный пользователь — обычную страницу.
+    """
+    regenerate()
+    url = reverse('news:detail', args=(news.pk,))
+    response = client.get(url)
+    assert response.has_header(SERVED_HEADER)
+    assert 'public' in response['Cache-Control']
+    client.force_login(author)
+    assert not client.get(url).has_header(SERVED_HEADER)
+
+
+def test_file_answers_conditional_get(client, news):
+    """
+    Проверяет, что у готового файла есть ETag и Last-Modified,
+    а повторный условный запрос получает 304.
+    """
+    regenerate()
+    url = reverse('news:detail', args=(news.pk,))
+    response = client.get(url)
+    assert response.has_header('Last-Modified')
+    repeated = client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+    assert repeated.status_code == HTTPStatus.NOT_MODIFIED
+    assert repeated.has_header(SERVED_HEADER)
+    repeated = client.get(
+        url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+    )
+    assert repeated.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_pages_rendered_with_async_views(async_views, news):
+    """
+    Проверяет, что генератор строит страницы и тогда,
+    когда представления асинхронные.
+    """
+    assert regenerate() == 2
+    assert news.text in detail_path(news).read_text()
+
+
+def test_comment_discards_and_regenerates_page(news, author):
+    """
+    Проверяет, что новый комментарий удаляет файлы страниц,
+    а генератор строит их заново уже с комментарием.
+    """
+    regenerate()
+    Comment.objects.create(news=news, author=author, text='Комментарий')
+    assert not detail_path(news).exists()
+    assert not cache.static_page_path(cache.LIST_SCOPE).exists()
+    assert regenerate() == 2
+    assert 'Комментарий' in detail_path(news).read_text()
+
+
+def test_changes_bypassing_signals_detected(news):
+    """Проверяет, что правка через update() находится по отпечатку."""
+    regenerate()
+    News.objects.filter(pk=news.pk).update(text='Новый текст')
+    assert regenerate() == 2
+    assert 'Новый текст' in detail_path(news).read_text()
+    assert regenerate() == 0
+
+
+def test_most_visited_news_rendered(news):
+    """Проверяет, что рендерится самая посещаемая новость."""
+    popular = News.objects.create(title='Популярная', text='Текст')
+    record_visit(news.pk)
+    record_visit(news.pk)
+    record_visit(popular.pk)
+    regenerate()
+    assert detail_path(news).exists()
+    assert not detail_path(popular).exists()
@@ -0,0 +1,49 @@
+import logging
+
+from django.db import connection
+from django.urls import reverse
+
+import pytest
+from news.models import News
+from news.query_budget import QueryBudgetExceeded, QueryRecorder
+from news.views import NewsList
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def zero_budget(monkeypatch):
+    monkeypatch.setattr(NewsList, 'query_budget', 0)
+
+
+def test_exceeded_budget_raises(client, zero_budget):
+    """Проверяет, что в режиме raise превышение бюджета роняет запрос."""
+    with pytest.raises(QueryBudgetExceeded, match='NewsList: 2 SQL'):
+        client.get(reverse('news:home'))
+
+
+def test_exceeded_budget_logged(client, settings, zero_budget, caplog):
+    """
+    Проверяет, что в режиме log страница отдаётся,
+    а отчёт о превышении попадает в лог.
+    """
+    settings.QUERY_BUDGET_MODE = 'log'
+    with caplog.at_level(logging.WARNING, logger='news.query_budget'):
+        response = client.get(reverse('news:home'))
+    assert response.status_code == 200
+    assert 'NewsList: 2 SQL' in caplog.text
+
+
+def test_report_shows_duplicates_with_origin():
+    """
+    Проверяет, что отчёт называет повторяющийся запрос
+    и место в коде, откуда он выполнен.
+    """
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        for _ in range(3):
+            list(News.objects.all())
+    report = recorder.report('View', 1)
+    assert 'View: 3 SQL-запросов при бюджете 1.' in report
+    assert 'Повторяется 3 раз' in report
+    assert 'test_query_budget.py' in report
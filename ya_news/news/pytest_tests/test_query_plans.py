@@ -0,0 +1,94 @@
+import re
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+import pytest
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+# Полный проход по таблице: SCAN без USING INDEX.
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?\w+( AS \w+)?$')
+TEMP_SORT = 'USE TEMP B-TREE'
+EXPLAINED = ('SELECT', 'UPDATE', 'DELETE')
+
+
+def explain(sql):
+    """Строки EXPLAIN QUERY PLAN для запроса."""
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def assert_plans_use_indexes(queries):
+    for query in queries:
+        sql = query['sql']
+        if not sql.startswith(EXPLAINED):
+            continue
+        for step in explain(sql):
+            assert not FULL_SCAN.match(step), f'{step}\n{sql}'
+            assert TEMP_SORT not in step, f'{step}\n{sql}'
+
+
+@pytest.fixture
+def news(author):
+    news = News.objects.create(title='Test News', text='Test news text')
+    Comment.objects.create(news=news, author=author, text='Comment')
+    return news
+
+
+@pytest.fixture
+def comment(news):
+    return news.comment_set.get()
+
+
+@pytest.fixture(autouse=True)
+def comments_on_page(settings):
+    settings.COMMENTS_COUNT_ON_PAGE = 1
+
+
+def get_urls(news, comment):
+    return [
+        reverse('news:home'),
+        reverse('news:detail', kwargs={'pk': news.pk}),
+        reverse('news:edit', kwargs={'pk': comment.pk}),
+        reverse('news:delete', kwargs={'pk': comment.pk}),
+    ]
+
+
+def test_anonymous_read_queries_use_indexes(client, news, comment):
+    """
+    Проверяет, что запросы страниц для анонимного
+    пользователя не сканируют таблицы целиком.
+    """
+    Comment.objects.create(news=news, author=comment.author, text='Next')
+    with CaptureQueriesContext(connection) as queries:
+        client.get(reverse('news:home'))
+        response = client.get(reverse('news:detail', kwargs={'pk': news.pk}))
+        client.get(
+            reverse('news:comments', kwargs={'pk': news.pk}),
+            {'after': response.context['next_cursor']},
+        )
+    assert_plans_use_indexes(queries)
+
+
+def test_author_queries_use_indexes(author_client, news, comment):
+    """
+    Проверяет, что запросы страниц и форм автора
+    комментария не сканируют таблицы целиком.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        for url in get_urls(news, comment):
+            author_client.get(url)
+        author_client.post(
+            reverse('news:detail', kwargs={'pk': news.pk}),
+            data={'text': 'New comment'},
+        )
+        author_client.post(
+            reverse('news:edit', kwargs={'pk': comment.pk}),
+            data={'text': 'Edited comment'},
+        )
+        author_client.post(reverse('news:delete', kwargs={'pk': comment.pk}))
+    assert_plans_use_indexes(queries)
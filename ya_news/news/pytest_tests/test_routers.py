@@ -0,0 +1,109 @@
+import io
+import sqlite3
+
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.urls import reverse
+
+import pytest
+from news import routers, views
+from news.models import News
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    """
+    Реплика считается настроенной, а вместо чтения с неё
+    записывается, какую базу выбрал бы запрос.
+    """
+    monkeypatch.setattr(routers, 'replica_configured', lambda: True)
+    monkeypatch.setattr(routers, 'replica_usable', lambda: True)
+    chosen = []
+
+    def comments_page(news_id, cursor=None):
+        chosen.append(routers.reading_from_replica.get())
+        return [], None
+
+    monkeypatch.setattr(views, 'comments_page', comments_page)
+    return chosen
+
+
+def test_router_reads_from_replica_only_when_enabled():
+    """Проверяет, что чтение идёт с реплики только по флагу, запись — нет."""
+    router = routers.PrimaryReplicaRouter()
+    assert router.db_for_read(News) == routers.PRIMARY
+    token = routers.reading_from_replica.set(True)
+    try:
+        assert router.db_for_read(News) == routers.REPLICA
+        assert router.db_for_write(News) == routers.PRIMARY
+        with routers.primary_reads():
+            assert router.db_for_read(News) == routers.PRIMARY
+    finally:
+        routers.reading_from_replica.reset(token)
+
+
+def test_sessions_and_users_read_from_primary():
+    """
+    Проверяет, что сессии и пользователи не читаются с реплики,
+    даже когда представление читает с неё.
+    """
+    router = routers.PrimaryReplicaRouter()
+    token = routers.reading_from_replica.set(True)
+    try:
+        assert router.db_for_read(Session) == routers.PRIMARY
+        assert router.db_for_read(User) == routers.PRIMARY
+    finally:
+        routers.reading_from_replica.reset(token)
+
+
+def test_read_only_view_uses_replica(client, news, replica):
+    """Проверяет, что страница комментариев читается с реплики."""
+    client.get(reverse('news:comments', args=(news.pk,)))
+    assert replica == [True]
+    assert not routers.reading_from_replica.get()
+
+
+def test_writer_pinned_to_primary(client, settings, news, replica):
+    """
+    Проверяет, что после записи пользователь читает
+    с основной базы, пока действует cookie.
+    """
+    user = User.objects.create_user(username='author')
+    client.force_login(user)
+    response = client.post(
+        reverse('news:detail', args=(news.pk,)), {'text': 'Комментарий'}
+    )
+    assert routers.PIN_COOKIE in response.cookies
+    # Пока cookie жива, реплика со снимком до записи не используется.
+    assert response.cookies[routers.PIN_COOKIE]['max-age'] >= (
+        settings.REPLICA_MAX_LAG + settings.REPLICA_LAG_CHECK_INTERVAL
+    )
+    client.get(reverse('news:comments', args=(news.pk,)))
+    assert replica == [False]
+
+
+def test_lagging_replica_not_used(client, news, replica, monkeypatch):
+    """Проверяет, что отставшая реплика не используется."""
+    monkeypatch.setattr(routers, 'replica_usable', lambda: False)
+    client.get(reverse('news:comments', args=(news.pk,)))
+    assert replica == [False]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sync_replica_copies_database(tmp_path, news):
+    """Проверяет, что копия содержит данные и время синхронизации."""
+    path = tmp_path / 'replica.sqlite3'
+    call_command('sync_replica', replica=str(path), stdout=io.StringIO())
+    replica = sqlite3.connect(str(path))
+    try:
+        assert replica.execute(
+            'SELECT title FROM news_news'
+        ).fetchall() == [(news.title,)]
+        assert replica.execute(
+            f'SELECT count(*) FROM {routers.STATUS_TABLE}'
+        ).fetchone() == (1,)
+    finally:
+        replica.close()
@@ -0,0 +1,85 @@
+from http import HTTPStatus
+
+from django.urls import reverse
+
+import pytest
+from news.models import News
+from news.search import search_news
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def search_url():
+    return reverse('news:search')
+
+
+def found(query, **kwargs):
+    results, _ = search_news(query, **kwargs)
+    return [news.title for news in results]
+
+
+def test_title_match_ranked_first():
+    """Проверяет, что совпадение в заголовке важнее совпадения в тексте."""
+    News.objects.create(title='Погода', text='Ожидается сильный ураган')
+    News.objects.create(title='Ураган', text='Стихия в Карибском море')
+    assert found('ураган') == ['Ураган', 'Погода']
+
+
+def test_russian_word_forms_and_yo():
+    """
+    Проверяет, что поиск не зависит от регистра, «ё» и окончания
+    слова, если оно длиннее запроса.
+    """
+    News.objects.create(title='Ёлки', text='Новогодние ёлки на площадях')
+    assert found('ЕЛКИ') == ['Ёлки']
+    assert found('новогодн') == ['Ёлки']
+
+
+def test_index_follows_changes():
+    """Проверяет, что индекс обновляется при правке, удалении и bulk_create."""
+    news = News.objects.create(title='Старое', text='Текст')
+    news.title = 'Новое'
+    news.save()
+    assert found('старое') == []
+    assert found('новое') == ['Новое']
+    News.objects.bulk_create([News(title='Пачка', text='Текст')])
+    assert found('пачка') == ['Пачка']
+    news.delete()
+    assert found('новое') == []
+
+
+def test_keyset_pages_cover_all_results():
+    """Проверяет, что страницы по курсору не теряют и не повторяют новости."""
+    News.objects.bulk_create(
+        News(title=f'Выборы {i}', text='Выборы') for i in range(7)
+    )
+    titles, cursor = [], None
+    while True:
+        results, cursor = search_news('выборы', cursor, limit=3)
+        titles += [news.title for news in results]
+        if cursor is None:
+            break
+    assert sorted(titles) == sorted(f'Выборы {i}' for i in range(7))
+
+
+def test_snippet_escaped_and_highlighted(client, search_url):
+    """Проверяет, что HTML из текста экранируется, а совпадение выделено."""
+    News.objects.create(title='Скрипт', text='<script>alert(1)</script> тест')
+    response = client.get(search_url, {'q': 'тест'})
+    content = response.content.decode()
+    assert '<mark>тест</mark>' in content
+    assert '<script>alert' not in content
+
+
+@pytest.mark.parametrize('query', ['"', 'NEAR(', 'а OR', '*', ''])
+def test_operators_in_query_are_harmless(client, search_url, query):
+    """Проверяет, что синтаксис FTS5 в запросе не приводит к ошибке."""
+    response = client.get(search_url, {'q': query})
+    assert response.status_code == HTTPStatus.OK
+
+
+def test_bad_cursor(client, search_url):
+    """Проверяет, что испорченный курсор даёт ответ 400."""
+    response = client.get(search_url, {'q': 'тест', 'after': 'мусор'})
+    assert response.status_code == HTTPStatus.BAD_REQUEST
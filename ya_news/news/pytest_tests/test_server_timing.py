@@ -0,0 +1,51 @@
+import json
+import logging
+
+from django.urls import reverse
+
+import pytest
+
+pytestmark = pytest.mark.django_db
+
+
+def metrics(response):
+    """Имена метрик из заголовка Server-Timing."""
+    return {
+        part.split(';')[0].strip()
+        for part in response['Server-Timing'].split(',')
+    }
+
+
+def test_header_has_timings(client, news, settings):
+    """Проверяет, что в заголовке есть база, шаблон, представление и итог."""
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    response = client.get(reverse('news:detail', args=(news.pk,)))
+    assert {'db', 'tpl', 'view', 'total'} <= metrics(response)
+    assert 'queries"' in response['Server-Timing']
+
+
+def test_form_validation_timed(author_client, news, settings):
+    """Проверяет, что проверка формы комментария попадает в замер."""
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    response = author_client.post(
+        reverse('news:detail', args=(news.pk,)), {'text': 'Комментарий'}
+    )
+    assert 'form' in metrics(response)
+
+
+def test_not_sampled_request_has_no_header(client, settings):
+    """Проверяет, что запрос вне выборки не замеряется."""
+    settings.SERVER_TIMING_SAMPLE_RATE = 0
+    response = client.get(reverse('news:home'))
+    assert not response.has_header('Server-Timing')
+
+
+def test_timings_logged_as_json(client, settings, caplog):
+    """Проверяет, что замер пишется в лог одной JSON-строкой."""
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+    with caplog.at_level(logging.INFO, logger='news.timing'):
+        client.get(reverse('news:home'))
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['path'] == reverse('news:home')
+    assert record['status'] == 200
+    assert {'db_count', 'db_ms', 'view_ms', 'total_ms'} <= record.keys()
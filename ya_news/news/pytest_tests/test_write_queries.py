@@ -0,0 +1,77 @@
+from django.urls import reverse
+
+import pytest
+from news.models import Comment, News
+
+pytestmark = pytest.mark.django_db
+
+# Сессия и пользователь после первого запроса берутся из кеша.
+AUTH_QUERIES = 0
+
+
+@pytest.fixture
+def author_client(author_client):
+    """Первый запрос кладёт сессию и пользователя в кеш."""
+    author_client.get(reverse('news:home'))
+    return author_client
+
+
+@pytest.fixture
+def comment(news, author):
+    return Comment.objects.create(news=news, author=author, text='Текст')
+
+
+def test_create_comment_queries(
+        author_client, news, django_assert_num_queries
+):
+    """
+    Проверяет, что создание комментария — это поиск новости,
+    вставка и обновление счётчика.
+    """
+    url = reverse('news:detail', args=(news.pk,))
+    with django_assert_num_queries(AUTH_QUERIES + 3) as captured:
+        response = author_client.post(url, {'text': 'Новый'})
+    assert response.url == url + '#comments'
+    # Текст новости для записи комментария не нужен.
+    assert '"news_news"."text"' not in captured.captured_queries[0]['sql']
+
+
+def test_update_comment_queries(
+        author_client, comment, django_assert_num_queries
+):
+    """
+    Проверяет, что правка комментария — это одна проверка
+    автора и запись.
+    """
+    url = reverse('news:edit', args=(comment.pk,))
+    with django_assert_num_queries(AUTH_QUERIES + 2):
+        response = author_client.post(url, {'text': 'Исправлено'})
+    assert response.url == reverse(
+        'news:detail', args=(comment.news_id,)
+    ) + '#comments'
+    comment.refresh_from_db()
+    assert comment.text == 'Исправлено'
+
+
+def test_delete_comment_queries(
+        author_client, comment, django_assert_num_queries
+):
+    """
+    Проверяет, что удаление комментария — это одна проверка автора,
+    удаление и обновление счётчика.
+    """
+    url = reverse('news:delete', args=(comment.pk,))
+    with django_assert_num_queries(AUTH_QUERIES + 3):
+        author_client.post(url)
+    assert not Comment.objects.exists()
+    assert News.objects.get().comment_count == 0
+
+
+@pytest.mark.parametrize('name', ('news:edit', 'news:delete'))
+def test_comment_pages_load_news_with_comment(
+        author_client, comment, name, django_assert_num_queries
+):
+    """Проверяет, что заголовок новости читается вместе с комментарием."""
+    with django_assert_num_queries(AUTH_QUERIES + 1):
+        response = author_client.get(reverse(name, args=(comment.pk,)))
+    assert comment.news.title in response.content.decode()
@@ -0,0 +1,111 @@
+"""
+Полнотекстовый поиск по новостям через SQLite FTS5.
+
+Индекс news_search создаёт миграция 0004_news_search, триггеры
+поддерживают его при любых изменениях news_news, в том числе через
+bulk_create и update(). Морфологии у FTS5 нет, поэтому каждое слово
+запроса ищется как префикс: «новост» найдёт и «новость», и «новости».
+Индекс хранит текст с «е» вместо «ё», поэтому и во фрагментах
+результатов «ё» заменена.
+"""
+import re
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import News
+from .pagination import CURSOR_SEPARATOR, InvalidCursor
+
+# Управляющие символы не встречаются в тексте новостей, поэтому
+# ими можно отметить совпадения до экранирования HTML.
+MATCH_START = '\x02'
+MATCH_END = '\x03'
+SNIPPET_TOKENS = 16
+# Совпадение в заголовке весит больше, чем в тексте.
+TITLE_WEIGHT = 10.0
+TEXT_WEIGHT = 1.0
+
+SEARCH_SQL = '''
+    SELECT * FROM (
+        SELECT
+            news_news.id, news_news.title, news_news.date,
+            news_news.comment_count,
+            bm25(news_search, %s, %s) AS score,
+            snippet(news_search, 1, %s, %s, '…', %s) AS snippet
+        FROM news_search
+        JOIN news_news ON news_news.id = news_search.rowid
+        WHERE news_search MATCH %s
+    )
+    {where}
+    ORDER BY score, id
+    LIMIT %s
+'''
+AFTER_SQL = 'WHERE score > %s OR (score = %s AND id > %s)'
+
+
+def build_match(query):
+    """
+    Запрос FTS5 из пользовательской строки.
+
+    Берутся только слова, поэтому операторы FTS5 и кавычки
+    в строке пользователя не могут сломать запрос.
+    """
+    words = re.findall(r'\w+', query.lower().replace('ё', 'е'))
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+def highlight(snippet):
+    """Экранирует фрагмент и выделяет совпадения тегом <mark>."""
+    return mark_safe(
+        escape(snippet)
+        .replace(MATCH_START, '<mark>')
+        .replace(MATCH_END, '</mark>')
+    )
+
+
+def encode_cursor(news):
+    raw = f'{news.score!r}{CURSOR_SEPARATOR}{news.pk}'
+    return urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Возвращает пару (score, id) из строки курсора."""
+    try:
+        raw = urlsafe_b64decode(cursor.encode()).decode()
+        score, pk = raw.rsplit(CURSOR_SEPARATOR, 1)
+        return float(score), int(pk)
+    except (Base64Error, UnicodeError, ValueError):
+        raise InvalidCursor(cursor)
+
+
+def search_news(query, cursor=None, limit=10):
+    """
+    Новости по релевантности (bm25) с подсвеченным фрагментом текста.
+
+    Листание по ключу (score, id), как у комментариев.
+    Возвращает список новостей и курсор следующей страницы.
+    """
+    match = build_match(query)
+    if not match:
+        return [], None
+    params = [
+        TITLE_WEIGHT, TEXT_WEIGHT, MATCH_START, MATCH_END, SNIPPET_TOKENS,
+        match,
+    ]
+    where = ''
+    if cursor:
+        score, pk = decode_cursor(cursor)
+        where = AFTER_SQL
+        params += [score, score, pk]
+    params.append(limit + 1)
+    results = list(
+        News.objects.raw(SEARCH_SQL.format(where=where), params)
+    )
+    for news in results:
+        news.snippet = highlight(news.snippet)
+    if len(results) <= limit:
+        return results, None
+    results = results[:limit]
+    return results, encode_cursor(results[-1])
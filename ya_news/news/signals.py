@@ -0,0 +1,56 @@
+from django.contrib.auth import get_user_model, user_logged_out
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import invalidate_user
+from .cache import invalidate_news
+from .models import Comment, News
+
+
+@receiver(post_save, sender=Comment)
+def increment_comment_count(sender, instance, created, raw, **kwargs):
+    """Новый комментарий увеличивает счётчик у новости."""
+    if created and not raw:
+        News.objects.filter(pk=instance.news_id).update(
+            comment_count=F('comment_count') + 1
+        )
+
+
+@receiver(post_delete, sender=Comment)
+def decrement_comment_count(sender, instance, **kwargs):
+    """
+    Удалённый комментарий уменьшает счётчик у новости.
+
+    Сигнал приходит и при удалении через QuerySet.delete(), в том числе
+    из админки, и при каскадном удалении вместе с автором.
+    """
+    News.objects.filter(
+        pk=instance.news_id, comment_count__gt=0
+    ).update(comment_count=F('comment_count') - 1)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, **kwargs):
+    """Комментарий меняет страницу новости и счётчик на главной."""
+    invalidate_news(instance.news_id)
+
+
+@receiver(post_save, sender=News)
+@receiver(post_delete, sender=News)
+def invalidate_news_pages(sender, instance, **kwargs):
+    invalidate_news(instance.pk)
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Смена пароля, правка и удаление пользователя сбрасывают кеш."""
+    invalidate_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def forget_logged_out_user(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
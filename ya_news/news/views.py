@@ -1,49 +1,148 @@
 from django.conf import settings
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import (
+    LoginRequiredMixin, UserPassesTestMixin,
+)
+from django.http import (
+    HttpResponseBadRequest, JsonResponse, StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
+from django.template.loader import render_to_string
 from django.urls import reverse
+from django.middleware.gzip import re_accepts_gzip
+from django.utils.cache import patch_vary_headers
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
 from django.views import generic
+from django.views.decorators.http import condition
 
+from . import cache, conditional, export
+from .aio import AsyncViewMixin
 from .forms import CommentForm
-from .models import Comment
-from .models import News
+from .ingest import comment_queue
+from .models import ArchivedComment, ArchivedNews, Comment, News
+from .pagination import InvalidCursor, paginate_comments
+from .prerender import PRERENDER_ATTRIBUTE
+from .query_budget import QueryBudgetMixin
+from .search import search_news
 
 
-class NewsList(generic.ListView):
+def comments_page(news_id, cursor=None, model=Comment):
+    """
+    Одна страница комментариев к новости вместе с авторами.
+
+    Для архивной новости model — ArchivedComment.
+    """
+    queryset = model.objects.filter(news_id=news_id).select_related(
+        'author'
+    ).only(
+        'text', 'created', 'news_id', 'author__username'
+    )
+    return paginate_comments(
+        queryset, cursor, settings.COMMENTS_COUNT_ON_PAGE
+    )
+
+
+class AnonymousPageCacheMixin:
+    """
+    Отдаёт анонимным пользователям отрендеренную страницу из кеша.
+
+    Авторизованным пользователям страница строится заново: в ней есть
+    имя пользователя, ссылки на правку комментариев и форма. Заново
+    строится и страница для статического файла (news.prerender).
+    """
+    def get_page_cache_scope(self):
+        raise NotImplementedError
+
+    def get(self, request, *args, **kwargs):
+        if request.user.is_authenticated or getattr(
+            request, PRERENDER_ATTRIBUTE, False
+        ):
+            return super().get(request, *args, **kwargs)
+
+        def render():
+            response = super(AnonymousPageCacheMixin, self).get(
+                request, *args, **kwargs
+            )
+            return response.render()
+
+        return cache.cached_page(self.get_page_cache_scope(), render)
+
+
+@method_decorator(condition(
+    etag_func=conditional.list_etag,
+), name='dispatch')
+class NewsList(
+        AsyncViewMixin,
+        QueryBudgetMixin,
+        AnonymousPageCacheMixin,
+        generic.ListView,
+):
     """Список новостей."""
     model = News
     template_name = 'news/home.html'
+    query_budget = 4
+    read_from_replica = True
 
     def get_queryset(self):
         """
         Выводим только несколько последних новостей.
 
         Их количество определяется в настройках проекта.
+        Число комментариев берём из поля comment_count,
+        сами комментарии не загружаем. Вместо текста выводится
+        сохранённый анонс, сам текст не читаем.
         """
-        return self.model.objects.prefetch_related(
-            'comment_set'
+        return self.model.objects.defer(
+            'text'
         )[:settings.NEWS_COUNT_ON_HOME_PAGE]
 
+    def get_page_cache_scope(self):
+        return cache.LIST_SCOPE
+
 
-class NewsDetail(generic.DetailView):
+@method_decorator(condition(
+    etag_func=conditional.detail_etag,
+), name='dispatch')
+class NewsDetail(
+        QueryBudgetMixin, AnonymousPageCacheMixin, generic.DetailView
+):
     model = News
     template_name = 'news/detail.html'
+    context_object_name = 'news'
+    query_budget = 5
+    archived = False
+
+    def get_page_cache_scope(self):
+        return cache.detail_scope(self.kwargs['pk'])
 
     def get_object(self, queryset=None):
-        obj = get_object_or_404(
-            self.model.objects.prefetch_related('comment_set__author'),
-            pk=self.kwargs['pk']
-        )
-        return obj
+        """Новости нет среди живых — ищем её в архиве."""
+        try:
+            return self.model.objects.get(pk=self.kwargs['pk'])
+        except self.model.DoesNotExist:
+            self.archived = True
+            return get_object_or_404(ArchivedNews, pk=self.kwargs['pk'])
 
     def get_context_data(self, **kwargs):
+        """
+        На страницу попадает только первая страница комментариев.
+
+        Следующие страницы подгружаются через news:comments.
+        Архивную новость комментировать нельзя.
+        """
         context = super().get_context_data(**kwargs)
-        if self.request.user.is_authenticated:
+        context['comments'], context['next_cursor'] = comments_page(
+            self.object.pk,
+            model=ArchivedComment if self.archived else Comment,
+        )
+        context['archived'] = self.archived
+        if self.request.user.is_authenticated and not self.archived:
             context['form'] = CommentForm()
         return context
 
 
 class NewsComment(
+        QueryBudgetMixin,
         LoginRequiredMixin,
         generic.detail.SingleObjectMixin,
         generic.FormView
@@ -51,26 +150,146 @@ class NewsComment(
     model = News
     form_class = CommentForm
     template_name = 'news/detail.html'
+    query_budget = 5
+
+    def get_queryset(self):
+        """Для записи комментария достаточно убедиться, что новость есть."""
+        return News.objects.only('pk')
 
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
         return super().post(request, *args, **kwargs)
 
+    def form_invalid(self, form):
+        # Страница с ошибкой показывает новость целиком.
+        self.object = News.objects.get(pk=self.object.pk)
+        return super().form_invalid(form)
+
+    def get_context_data(self, **kwargs):
+        """Страница с ошибкой формы показывает и комментарии новости."""
+        context = super().get_context_data(**kwargs)
+        context['comments'], context['next_cursor'] = comments_page(
+            self.object.pk
+        )
+        return context
+
     def form_valid(self, form):
         comment = form.save(commit=False)
         comment.news = self.object
         comment.author = self.request.user
-        comment.save()
+        if not comment_queue.submit(comment):
+            comment.save()
         return super().form_valid(form)
 
     def get_success_url(self):
-        post = self.get_object()
-        return reverse('news:detail', kwargs={'pk': post.pk}) + '#comments'
+        return reverse(
+            'news:detail', kwargs={'pk': self.object.pk}
+        ) + '#comments'
+
+
+class NewsComments(QueryBudgetMixin, generic.View):
+    """Следующая страница комментариев для кнопки «Показать ещё»."""
+    query_budget = 3
+    read_from_replica = True
+
+    def get(self, request, *args, **kwargs):
+        comment_queue.wait_for_author(request.user)
+        cursor = request.GET.get('after')
+        archived = False
+        try:
+            comments, next_cursor = comments_page(self.kwargs['pk'], cursor)
+            # Кнопка «Показать ещё» на живой новости не ведёт на пустую
+            # страницу; значит, курсор получен на странице архивной.
+            if cursor and not comments and ArchivedNews.objects.filter(
+                pk=self.kwargs['pk']
+            ).exists():
+                archived = True
+                comments, next_cursor = comments_page(
+                    self.kwargs['pk'], cursor, ArchivedComment
+                )
+        except InvalidCursor:
+            return HttpResponseBadRequest('Некорректный курсор.')
+        html = render_to_string(
+            'includes/comments.html',
+            {'comments': comments, 'archived': archived},
+            request,
+        )
+        return JsonResponse({'html': html, 'next': next_cursor})
+
+
+class NewsSearch(QueryBudgetMixin, generic.TemplateView):
+    """Полнотекстовый поиск по новостям."""
+    template_name = 'news/search.html'
+    query_budget = 3
+    read_from_replica = True
+
+    def get(self, request, *args, **kwargs):
+        query = request.GET.get('q', '').strip()
+        try:
+            results, next_cursor = search_news(
+                query, request.GET.get('after'),
+                settings.SEARCH_RESULTS_ON_PAGE,
+            )
+        except InvalidCursor:
+            return HttpResponseBadRequest('Некорректный курсор.')
+        context = self.get_context_data(
+            query=query, results=results, next_cursor=next_cursor
+        )
+        return self.render_to_response(context)
 
 
-class NewsDetailView(generic.View):
+class NewsExport(LoginRequiredMixin, UserPassesTestMixin, generic.View):
+    """
+    Выгрузка новостей с комментариями для аналитики.
+
+    Параметры: format (ndjson или csv), from и to — даты новостей
+    в формате ГГГГ-ММ-ДД. Ответ сжимается на лету, если клиент
+    принимает gzip. Доступна только сотрудникам.
+    """
+
+    def test_func(self):
+        return self.request.user.is_staff
 
     def get(self, request, *args, **kwargs):
+        export_format = request.GET.get('format', export.NDJSON)
+        if export_format not in export.FORMATTERS:
+            return HttpResponseBadRequest('Неизвестный формат выгрузки.')
+        dates = {}
+        for name in ('from', 'to'):
+            value = request.GET.get(name)
+            try:
+                dates[name] = parse_date(value) if value else None
+            except ValueError:
+                dates[name] = None
+            if value and dates[name] is None:
+                return HttpResponseBadRequest('Некорректная дата.')
+        rows = export.news_with_comments(
+            dates['from'], dates['to'], settings.NEWS_EXPORT_CHUNK_SIZE
+        )
+        gzip = bool(re_accepts_gzip.search(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')
+        ))
+        response = StreamingHttpResponse(
+            export.export_chunks(export_format, rows, gzip),
+            content_type=export.CONTENT_TYPES[export_format],
+        )
+        if gzip:
+            response['Content-Encoding'] = 'gzip'
+        patch_vary_headers(response, ('Accept-Encoding',))
+        response['Content-Disposition'] = (
+            f'attachment; filename="news.{export_format}"'
+        )
+        return response
+
+
+class NewsDetailView(AsyncViewMixin, generic.View):
+    # Относится к GET; POST пишет и всегда идёт в основную базу.
+    read_from_replica = True
+
+    def get(self, request, *args, **kwargs):
+        # Автор должен увидеть свой комментарий, даже если он ещё
+        # в очереди; ждём до проверки ETag, иначе отдадим 304.
+        comment_queue.wait_for_author(request.user)
         view = NewsDetail.as_view()
         return view(request, *args, **kwargs)
 
@@ -79,27 +298,37 @@ class NewsDetailView(generic.View):
         return view(request, *args, **kwargs)
 
 
-class CommentBase(LoginRequiredMixin):
+class CommentBase(QueryBudgetMixin, LoginRequiredMixin):
     """Базовый класс для работы с комментариями."""
     model = Comment
 
     def get_success_url(self):
-        comment = self.get_object()
         return reverse(
-            'news:detail', kwargs={'pk': comment.news.pk}
+            'news:detail', kwargs={'pk': self.object.news_id}
         ) + '#comments'
 
     def get_queryset(self):
-        """Пользователь может работать только со своими комментариями."""
-        return self.model.objects.filter(author=self.request.user)
+        """
+        Пользователь может работать только со своими комментариями.
+
+        Заголовок новости нужен шаблонам, поэтому загружается тем же
+        запросом, что и проверка автора.
+        """
+        return self.model.objects.filter(
+            author=self.request.user
+        ).select_related('news').only(
+            'text', 'created', 'news', 'news__title'
+        )
 
 
 class CommentUpdate(CommentBase, generic.UpdateView):
     """Редактирование комментария."""
     template_name = 'news/edit.html'
     form_class = CommentForm
+    query_budget = 4
 
 
 class CommentDelete(CommentBase, generic.DeleteView):
     """Удаление комментария."""
     template_name = 'news/delete.html'
+    query_budget = 5
@@ -13,5 +13,7 @@ from django.core.asgi import get_asgi_application
 
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yanews.settings')
+# Под ASGI страницы новостей обрабатываются асинхронно (news/aio.py).
+os.environ.setdefault('NEWS_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -22,13 +23,18 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'news.timing.ServerTimingMiddleware',
+    'news.routers.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'news.query_budget.QueryBudgetMiddleware',
+    'news.http_cache.HttpCachePolicyMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'news.prerender.PrerenderedPageMiddleware',
 ]
 
 ROOT_URLCONF = 'yanews.urls'
@@ -52,16 +58,74 @@ TEMPLATES = [
 WSGI_APPLICATION = 'yanews.wsgi.application'
 
 
-DATABASES = {
-    'default': {
+# Профиль базы данных выбирается переменной окружения DJANGO_DB_PROFILE.
+DATABASE_PROFILES = {
+    'development': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    'production': {
+        'ENGINE': 'yanews.sqlite_backend',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами, а не открывается на каждый.
+        'CONN_MAX_AGE': 600,
+        'TRANSACTION_MODE': 'IMMEDIATE',
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            # Отрицательное значение — размер в килобайтах.
+            'cache_size': -20000,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+        },
+    },
+}
+
+DATABASES = {
+    'default': DATABASE_PROFILES[
+        os.environ.get('DJANGO_DB_PROFILE', 'development')
+    ],
+}
+
+# Путь к копии базы, с которой читают представления со списками
+# и страницами новостей. Копию обновляет команда sync_replica.
+if os.environ.get('DJANGO_DB_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DJANGO_DB_REPLICA'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['news.routers.PrimaryReplicaRouter']
+# Реплика старше этого, в секундах, не используется.
+REPLICA_MAX_LAG = 60
+# Как часто проверяется отставание реплики, секунды. После записи
+# пользователь читает с основной базы REPLICA_MAX_LAG плюс этот интервал.
+REPLICA_LAG_CHECK_INTERVAL = 5
+
+
+# Кеш общий для всех процессов сервера: в нём сессии и пользователи,
+# и сброс записи при выходе или смене пароля должен быть виден каждому
+# воркеру. LocMemCache у каждого процесса свой и годится только для
+# запуска в одном процессе.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_DIR', str(BASE_DIR / '.django_cache')
+        ),
     }
 }
 
 
 AUTH_PASSWORD_VALIDATORS = []
 
+# Сессия и пользователь читаются из кеша, а не из базы на каждый запрос.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+AUTHENTICATION_BACKENDS = ['news.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = 300
+
 
 LANGUAGE_CODE = 'ru'
 
@@ -81,3 +145,83 @@ LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('news:home')
 
 NEWS_COUNT_ON_HOME_PAGE = 10
+
+COMMENTS_COUNT_ON_PAGE = 50
+
+SEARCH_RESULTS_ON_PAGE = 10
+
+# Сколько последних комментариев показывать на странице новости
+# в админке; остальные — в списке комментариев.
+NEWS_ADMIN_INLINE_COMMENTS = 20
+
+# Новостей на странице ленты JSON API (news/api.py).
+NEWS_API_PAGE_SIZE = 20
+
+# Cache-Control для общих кешей по имени маршрута (см. news/http_cache.py):
+# аргументы patch_cache_control() для анонимных ответов.
+HTTP_CACHE_POLICIES = {
+    'news:home': {'max_age': 60, 'stale_while_revalidate': 300},
+    'news:detail': {'max_age': 60, 'stale_while_revalidate': 300},
+}
+
+# Асинхронные представления под ASGI (см. news/aio.py); включает
+# yanews/asgi.py. Синхронный код они выполняют в пуле из стольких
+# потоков, у каждого своё соединение с базой.
+NEWS_ASYNC_VIEWS = os.environ.get('NEWS_ASYNC_VIEWS') == '1'
+NEWS_ASYNC_DB_THREADS = 8
+
+# Сколько строк за раз читать из базы при выгрузке (news/export.py).
+NEWS_EXPORT_CHUNK_SIZE = 2000
+
+# Новости старше стольких дней команда archive_news переносит
+# в архивные таблицы (см. news/archive.py).
+NEWS_ARCHIVE_AFTER_DAYS = 365
+
+# Файл со списком запрещённых слов, по одному в строке.
+# Если не задан, используется news.forms.BAD_WORDS.
+BAD_WORDS_FILE = None
+BAD_WORDS_RELOAD_INTERVAL = 5
+
+# 'sync' — комментарий сохраняется в запросе, 'queue' — через очередь
+# с пакетной записью в отдельном потоке (см. news/ingest.py).
+COMMENT_INGEST_MODE = os.environ.get('COMMENT_INGEST_MODE', 'sync')
+COMMENT_QUEUE_SIZE = 1000
+COMMENT_QUEUE_BATCH_SIZE = 100
+# Сколько секунд ждать места в очереди, прежде чем писать синхронно.
+COMMENT_QUEUE_PUT_TIMEOUT = 0.5
+# Сколько секунд автор ждёт записи своих комментариев из очереди.
+COMMENT_QUEUE_WAIT_TIMEOUT = 2
+
+# Доля запросов, для которых считается Server-Timing: от 0 до 1.
+# По умолчанию выключено: каждый замер — строка в логе.
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.environ.get('SERVER_TIMING_SAMPLE_RATE', '0')
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'news.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+# 'log' — писать превышение бюджета запросов в лог, 'raise' — падать.
+QUERY_BUDGET_MODE = 'log' if DEBUG else None
+
+# Каталог заранее отрендеренных страниц (см. news/prerender.py).
+NEWS_PRERENDER_DIR = BASE_DIR / 'prerendered'
+# Отвечать анонимам из этих файлов и обновлять их в фоне.
+NEWS_PRERENDER_SERVE = os.environ.get('NEWS_PRERENDER_SERVE') == '1'
+NEWS_PRERENDER_TOP = 20
+NEWS_PRERENDER_INTERVAL = 30
+
+NEWS_PAGE_CACHE_ALIAS = 'default'
+NEWS_PAGE_CACHE_LOCK_TIMEOUT = 5
+NEWS_PAGE_CACHE_POLL_INTERVAL = 0.05
@@ -0,0 +1,27 @@
+"""
+SQLite с настройками для боевого режима.
+
+При открытии соединения выполняет PRAGMA из ключа PRAGMAS настроек базы
+(WAL, synchronous, размер кеша, mmap, ожидание блокировки), а
+транзакции с TRANSACTION_MODE = 'IMMEDIATE' сразу берут блокировку на
+запись и ждут её busy_timeout, вместо ошибки «database is locked» при
+попытке повысить блокировку посреди транзакции.
+"""
+from django.db.backends.sqlite3 import base
+
+
+def apply_pragmas(connection, pragmas):
+    for name, value in pragmas.items():
+        connection.execute(f'PRAGMA {name} = {value}')
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        apply_pragmas(connection, self.settings_dict.get('PRAGMAS', {}))
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
@@ -8,6 +8,7 @@ from django.views.generic import CreateView
 
 urlpatterns = [
     path('', include('news.urls')),
+    path('api/v1/', include('news.api_urls')),
     path('admin/', admin.site.urls),
 ]
 
@@ -0,0 +1,33 @@
+"""
+Пользователь из кеша вместо запроса к auth_user на каждый запрос.
+
+Запись сбрасывается при сохранении и удалении пользователя (смена
+пароля, правка в админке, обновление last_login) и при выходе,
+см. сигналы в notes/signals.py.
+
+Кеш должен быть общим для всех процессов (в настройках —
+FileBasedCache): с LocMemCache запись сбрасывается только в процессе,
+который обработал запрос, а остальные отдают прежнего пользователя
+до USER_CACHE_TIMEOUT. Сессии (cached_db) лежат в том же кеше.
+"""
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_KEY = 'auth:user:{}'
+
+
+def invalidate_user(user_id):
+    cache.delete(USER_KEY.format(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+
+    def get_user(self, user_id):
+        key = USER_KEY.format(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is not None:
+                cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -3,6 +3,7 @@ from django.core.exceptions import ValidationError
 from pytils.translit import slugify
 
 from .models import Note
+from .timing import FORM, timed
 
 
 WARNING = ' - такой slug уже существует, придумайте уникальное значение!'
@@ -15,6 +16,7 @@ class NoteForm(forms.ModelForm):
         model = Note
         fields = ('title', 'text', 'slug')
 
+    @timed(FORM)
     def clean_slug(self):
         """Обрабатывает случай, если slug не уникален."""
         cleaned_data = super().clean()
@@ -0,0 +1,68 @@
+"""
+Заголовки Cache-Control для общих кешей (обратного прокси, CDN).
+
+Политика задаётся в HTTP_CACHE_POLICIES по имени маршрута: аргументы
+patch_cache_control(), обычно max_age и stale_while_revalidate.
+HttpCachePolicyMiddleware применяет её к успешным ответам на GET
+и HEAD:
+
+* анониму — public с заданными сроками;
+* авторизованному пользователю и ответу, который ставит cookie, —
+  private, no-cache;
+* ответ, где Cache-Control уже задан представлением, не меняется.
+
+Vary: Cookie, который Django ставит при чтении сессии, снимается,
+если в запросе не было cookie сессии: такая страница одинакова для
+всех анонимов, какие бы ещё cookie у них ни были. Прокси при этом
+должен пропускать мимо кеша запросы с cookie сессии, как CachingProxy
+из команды bench_http_cache.
+"""
+from django.conf import settings
+from django.utils.cache import cc_delim_re, patch_cache_control
+
+CACHEABLE_STATUSES = (200, 304)
+
+
+def remove_vary_cookie(response):
+    if not response.has_header('Vary'):
+        return
+    headers = [
+        header for header in cc_delim_re.split(response['Vary'])
+        if header.lower() != 'cookie'
+    ]
+    if headers:
+        response['Vary'] = ', '.join(headers)
+    else:
+        del response['Vary']
+
+
+class HttpCachePolicyMiddleware:
+    """
+    Применяет HTTP_CACHE_POLICIES к ответам.
+
+    Должен стоять выше SessionMiddleware и CsrfViewMiddleware, чтобы
+    видеть добавленные ими Vary и cookie.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        match = request.resolver_match
+        if request.method not in ('GET', 'HEAD') or match is None:
+            return response
+        policy = settings.HTTP_CACHE_POLICIES.get(match.view_name)
+        if (
+            policy is None
+            or response.status_code not in CACHEABLE_STATUSES
+            or response.has_header('Cache-Control')
+        ):
+            return response
+        if response.cookies or request.user.is_authenticated:
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        patch_cache_control(response, public=True, **policy)
+        if settings.SESSION_COOKIE_NAME not in request.COOKIES:
+            remove_vary_cookie(response)
+        return response
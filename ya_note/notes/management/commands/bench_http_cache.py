@@ -0,0 +1,202 @@
+import random
+from collections import Counter
+from time import monotonic
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+from django.utils.cache import cc_delim_re
+
+from notes.management.commands.bench_routes import Rollback
+
+HIT = 'hit'
+STALE = 'stale'
+REVALIDATED = 'revalidated'
+MISS = 'miss'
+BYPASS = 'bypass'
+
+
+def cache_control(response):
+    """Директивы Cache-Control ответа: {'max-age': '60', 'public': ''}."""
+    directives = {}
+    for directive in cc_delim_re.split(response.get('Cache-Control', '')):
+        name, _, value = directive.partition('=')
+        if name:
+            directives[name.strip().lower()] = value.strip()
+    return directives
+
+
+def hit_rate(stats):
+    """Доля ответов из кеша, включая устаревшие."""
+    total = sum(stats.values())
+    return (stats[HIT] + stats[STALE]) / total if total else 0
+
+
+class CachingProxy:
+    """
+    Упрощённый общий кеш перед приложением, как proxy_cache в nginx.
+
+    Хранит ответы 200 с public и max-age без Set-Cookie, отдельно
+    для каждого значения заголовков из Vary. Устаревшую копию
+    в пределах stale-while-revalidate отдаёт сразу и тут же обновляет
+    (у настоящего прокси это фоновый запрос), а позже — сверяет
+    по ETag. Запросы с cookie сессии идут мимо кеша.
+    """
+
+    def __init__(self, client=None, clock=monotonic):
+        self.client = client or Client()
+        self.clock = clock
+        self.vary = {}
+        self.entries = {}
+        self.stats = Counter()
+        self.upstream = 0
+
+    def get(self, path, cookies=None):
+        """Ответ и то, откуда он взят: HIT, STALE, MISS и т. д."""
+        headers = {
+            'HTTP_COOKIE': '; '.join(
+                f'{name}={value}' for name, value in (cookies or {}).items()
+            ),
+        }
+        if settings.SESSION_COOKIE_NAME in (cookies or {}):
+            return self.record(BYPASS, self.fetch(path, headers))
+        key = self.key(path, headers)
+        entry = self.entries.get(key)
+        if entry is None:
+            response = self.fetch(path, headers)
+            self.store(path, headers, response)
+            return self.record(MISS, response)
+        response, stored, max_age, stale = entry
+        age = self.clock() - stored
+        if age < max_age:
+            return self.record(HIT, response)
+        if age < max_age + stale:
+            self.revalidate(path, headers, response)
+            return self.record(STALE, response)
+        response = self.revalidate(path, headers, response)
+        return self.record(
+            REVALIDATED if response is entry[0] else MISS, response
+        )
+
+    def record(self, outcome, response):
+        self.stats[outcome] += 1
+        return response, outcome
+
+    def fetch(self, path, headers):
+        self.upstream += 1
+        return self.client.get(path, **headers)
+
+    def key(self, path, headers):
+        return path, tuple(
+            headers.get('HTTP_' + name.upper().replace('-', '_'), '')
+            for name in self.vary.get(path, ())
+        )
+
+    def store(self, path, headers, response):
+        directives = cache_control(response)
+        if (
+            response.status_code != 200
+            or response.cookies
+            or 'public' not in directives
+            or {'private', 'no-store', 'no-cache'} & set(directives)
+        ):
+            return
+        max_age = int(directives.get('max-age') or 0)
+        if max_age <= 0:
+            return
+        self.vary[path] = [
+            name for name in cc_delim_re.split(response.get('Vary', ''))
+            if name
+        ]
+        self.entries[self.key(path, headers)] = (
+            response, self.clock(), max_age,
+            int(directives.get('stale-while-revalidate') or 0),
+        )
+
+    def revalidate(self, path, headers, cached):
+        """Свежий ответ; при 304 — прежний, с обновлённым временем."""
+        conditional = dict(headers)
+        if cached.has_header('ETag'):
+            conditional['HTTP_IF_NONE_MATCH'] = cached['ETag']
+        response = self.fetch(path, conditional)
+        if response.status_code == 304:
+            response = cached
+        self.store(path, headers, response)
+        return response
+
+
+class Command(BaseCommand):
+    help = (
+        'Прогоняет поток посетителей главной через CachingProxy '
+        'и показывает, какая доля запросов обслужена общим кешем '
+        'с политикой HTTP_CACHE_POLICIES и без неё. Время — модельное.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=3000)
+        parser.add_argument(
+            '--rps', type=float, default=5,
+            help='Модельная частота запросов в секунду.',
+        )
+        parser.add_argument(
+            '--authenticated', type=float, default=0.3,
+            help='Доля запросов авторизованных пользователей.',
+        )
+        parser.add_argument(
+            '--with-cookies', type=float, default=0.5,
+            help='Доля анонимов с посторонними cookie (счётчики).',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        try:
+            with override_settings(
+                ALLOWED_HOSTS=['testserver'], SERVER_TIMING_SAMPLE_RATE=0
+            ), transaction.atomic():
+                self.run(options)
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, options):
+        client = Client()
+        client.force_login(User.objects.create_user(username='bench-http'))
+        session = client.cookies[settings.SESSION_COOKIE_NAME].value
+        self.stdout.write(
+            f'{"вариант":<15} {"попаданий":>10} {"у анонимов":>11} '
+            f'{"в приложение":>13}'
+        )
+        for label, policies in (
+            ('без политики', {}),
+            ('с политикой', settings.HTTP_CACHE_POLICIES),
+        ):
+            with override_settings(HTTP_CACHE_POLICIES=policies):
+                proxy, anonymous = self.simulate(session, options)
+            self.stdout.write(
+                f'{label:<15} {hit_rate(proxy.stats):>10.1%} '
+                f'{hit_rate(anonymous):>11.1%} {proxy.upstream:>13}'
+            )
+
+    @staticmethod
+    def simulate(session, options):
+        """Прокси после прогона и исходы одних анонимных запросов."""
+        generator = random.Random(options['seed'])
+        path = reverse('notes:home')
+        now = [0.0]
+        proxy = CachingProxy(clock=lambda: now[0])
+        anonymous = Counter()
+        for number in range(options['requests']):
+            now[0] = number / options['rps']
+            if generator.random() < options['authenticated']:
+                proxy.get(path, {settings.SESSION_COOKIE_NAME: session})
+                continue
+            cookies = {}
+            if generator.random() < options['with_cookies']:
+                cookies['_ym_uid'] = str(generator.randrange(10 ** 6))
+            _, outcome = proxy.get(path, cookies)
+            anonymous[outcome] += 1
+        return proxy, anonymous
@@ -0,0 +1,173 @@
+import io
+import json
+from statistics import median, quantiles
+from time import perf_counter
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import reverse
+
+from notes.models import Note
+
+# Латентность сравнивается с допуском --threshold, остальное — строго.
+LATENCY_METRICS = ('p50_ms', 'p95_ms')
+EXACT_METRICS = ('queries', 'bytes')
+
+
+class Rollback(Exception):
+    """Откатывает данные, созданные для замера."""
+
+
+def percentile(values, percent):
+    if len(values) == 1:
+        return values[0]
+    return quantiles(values, n=100, method='inclusive')[percent - 1]
+
+
+def measure(client, url, requests):
+    """Латентность, число SQL-запросов и размер ответа для одного URL."""
+    client.get(url)
+    timings = []
+    queries = []
+    for _ in range(requests):
+        with CaptureQueriesContext(connection) as captured:
+            started = perf_counter()
+            response = client.get(url)
+            timings.append((perf_counter() - started) * 1000)
+        queries.append(len(captured))
+    return {
+        'p50_ms': round(percentile(timings, 50), 3),
+        'p95_ms': round(percentile(timings, 95), 3),
+        'queries': median(queries),
+        'bytes': len(response.content),
+        'status': response.status_code,
+    }
+
+
+def compare(baseline, results, threshold):
+    """Список регрессий относительно сохранённого базового замера."""
+    regressions = []
+    for scale, routes in results.items():
+        for route, metrics in routes.items():
+            base = baseline.get(scale, {}).get(route)
+            if base is None:
+                continue
+            for metric in LATENCY_METRICS + EXACT_METRICS:
+                allowed = base[metric]
+                if metric in LATENCY_METRICS:
+                    allowed *= 1 + threshold
+                if metrics[metric] > allowed:
+                    regressions.append(
+                        f'{scale}/{route}: {metric} {base[metric]} '
+                        f'-> {metrics[metric]}'
+                    )
+    return regressions
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет p50/p95 латентности, число SQL-запросов и размер ответа '
+        'основных страниц YaNote на данных разного объёма и сравнивает '
+        'с базовым замером.'
+    )
+    routes = ('notes:list', 'notes:detail', 'notes:add')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--scales', type=int, nargs='+', default=[10, 100, 1000],
+            help='Число заметок у пользователя, под которым идут запросы.',
+        )
+        parser.add_argument('--requests', type=int, default=30)
+        parser.add_argument(
+            '--baseline', help='JSON-файл с базовым замером для сравнения.'
+        )
+        parser.add_argument(
+            '--save', action='store_true',
+            help='Записать результаты в файл --baseline.',
+        )
+        parser.add_argument(
+            '--threshold', type=float, default=0.2,
+            help='Допустимый рост латентности, доля от базовой.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            # Нужен, чтобы тестовый клиент прошёл проверку ALLOWED_HOSTS.
+            setup_test_environment()
+        except RuntimeError:
+            # Окружение уже настроено, например, при запуске из тестов.
+            pass
+        results = {}
+        for scale in options['scales']:
+            results[str(scale)] = self.run_scale(scale, options['requests'])
+        self.print_results(results)
+
+        path = options['baseline']
+        if path and options['save']:
+            with open(path, 'w', encoding='utf-8') as baseline_file:
+                json.dump(results, baseline_file, indent=2, sort_keys=True)
+            self.stdout.write(self.style.SUCCESS(f'Сохранено в {path}.'))
+        elif path:
+            with open(path, encoding='utf-8') as baseline_file:
+                baseline = json.load(baseline_file)
+            regressions = compare(baseline, results, options['threshold'])
+            if regressions:
+                raise CommandError(
+                    'Регрессии:\n' + '\n'.join(regressions)
+                )
+            self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
+
+    def run_scale(self, scale, requests):
+        """Создаёт данные, замеряет маршруты и откатывает изменения."""
+        try:
+            with transaction.atomic():
+                routes = self.measure_routes(scale, requests)
+                raise Rollback
+        except Rollback:
+            pass
+        return routes
+
+    def measure_routes(self, scale, requests):
+        # Заметки других пользователей: таблица растёт вместе с объёмом.
+        call_command(
+            'generate_notes_data', users=max(scale // 10, 2), notes=scale,
+            stdout=io.StringIO(),
+        )
+        user = User.objects.create_user(username='bench-routes-user')
+        Note.objects.bulk_create(
+            Note(
+                title=f'Заметка {i}', text='Текст',
+                slug=f'bench-routes-{i}', author=user,
+            )
+            for i in range(scale)
+        )
+        urls = {
+            'notes:list': reverse('notes:list'),
+            'notes:detail': reverse(
+                'notes:detail', kwargs={'slug': 'bench-routes-0'}
+            ),
+            'notes:add': reverse('notes:add'),
+        }
+        client = Client()
+        client.force_login(user)
+        return {
+            route: measure(client, urls[route], requests)
+            for route in self.routes
+        }
+
+    def print_results(self, results):
+        self.stdout.write(
+            f'{"объём":>7} {"маршрут":<14} {"p50, мс":>9} {"p95, мс":>9} '
+            f'{"запросов":>9} {"байт":>8}'
+        )
+        for scale, routes in results.items():
+            for route, metrics in routes.items():
+                self.stdout.write(
+                    f'{scale:>7} {route:<14} {metrics["p50_ms"]:>9.2f} '
+                    f'{metrics["p95_ms"]:>9.2f} {metrics["queries"]:>9} '
+                    f'{metrics["bytes"]:>8}'
+                )
@@ -0,0 +1,121 @@
+import random
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from faker import Faker
+from pytils.translit import slugify
+
+from notes.models import Note
+
+PASSWORD = 'password'
+TEXT_POOL_SIZE = 1000
+# Ограничение SQLite на число параметров запроса.
+LOOKUP_CHUNK = 500
+
+
+class Command(BaseCommand):
+    help = (
+        'Генерирует пользователей и заметки для нагрузочного тестирования. '
+        'Заголовки берутся из небольшого набора, поэтому их slug '
+        'совпадают. При одинаковом --seed данные совпадают.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument(
+            '--notes', type=int, default=20,
+            help='Заметок на пользователя.',
+        )
+        parser.add_argument(
+            '--titles', type=int, default=50,
+            help='Сколько разных заголовков использовать.',
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.faker = Faker('ru_RU')
+        self.faker.seed_instance(options['seed'])
+        self.batch_size = options['batch_size']
+        self.max_slug_length = Note._meta.get_field('slug').max_length
+        titles = [
+            self.faker.sentence(nb_words=3)[:100]
+            for _ in range(options['titles'])
+        ]
+        texts = [
+            self.faker.paragraph(nb_sentences=3)
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+
+        with transaction.atomic():
+            authors = self.create_users(options['users'], options['seed'])
+            self.used_slugs = self.existing_slugs(titles)
+            self.suffixes = {}
+            notes = (
+                self.make_note(author, self.rng.choice(titles), texts)
+                for author in authors
+                for _ in range(options['notes'])
+            )
+            Note.objects.bulk_create(notes, batch_size=self.batch_size)
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано: пользователей {len(authors)}, '
+            f'заметок {len(authors) * options["notes"]}, '
+            f'разных заголовков {len(titles)}.'
+        ))
+
+    def create_users(self, count, seed):
+        """Пользователи с одинаковым паролем; хеш считается один раз."""
+        password = make_password(PASSWORD)
+        usernames = [
+            f'{self.faker.user_name()}_{seed}_{i}' for i in range(count)
+        ]
+        User.objects.bulk_create(
+            (User(username=name, password=password) for name in usernames),
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        pks = []
+        for start in range(0, count, LOOKUP_CHUNK):
+            pks += User.objects.filter(
+                username__in=usernames[start:start + LOOKUP_CHUNK]
+            ).values_list('pk', flat=True)
+        return pks
+
+    def existing_slugs(self, titles):
+        slugs = set()
+        for base in {self.base_slug(title) for title in titles}:
+            slugs.update(
+                Note.objects.filter(
+                    slug__startswith=base
+                ).values_list('slug', flat=True)
+            )
+        return slugs
+
+    def base_slug(self, title):
+        return slugify(title)[:self.max_slug_length]
+
+    def make_note(self, author_id, title, texts):
+        """
+        Заметка со slug из транслитерированного заголовка, как в
+        Note.save. Note.save суффиксов не добавляет, и повторный slug там
+        даёт IntegrityError; здесь заголовки повторяются намеренно,
+        поэтому при совпадении добавляется числовой суффикс.
+        """
+        base = self.base_slug(title)
+        slug = base
+        number = self.suffixes.get(base, 1)
+        while slug in self.used_slugs:
+            number += 1
+            suffix = f'-{number}'
+            slug = base[:self.max_slug_length - len(suffix)] + suffix
+        self.suffixes[base] = number
+        self.used_slugs.add(slug)
+        return Note(
+            title=title,
+            text=self.rng.choice(texts),
+            slug=slug,
+            author_id=author_id,
+        )
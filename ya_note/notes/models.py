@@ -27,6 +27,14 @@ class Note(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = (
+            models.Index(
+                fields=('author', 'slug'),
+                name='note_author_slug_idx',
+            ),
+        )
+
     def __str__(self):
         return self.title
 
@@ -0,0 +1,122 @@
+"""
+Бюджет SQL-запросов на представление.
+
+Класс представления объявляет query_budget — сколько запросов к базе
+допустимо за весь запрос, включая сессию, пользователя и рендеринг
+шаблона. QueryBudgetMiddleware считает запросы и при превышении пишет
+в лог или выбрасывает исключение, в зависимости от QUERY_BUDGET_MODE.
+В отчёт попадают повторяющиеся запросы и откуда они были вызваны.
+"""
+import logging
+import sys
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection
+from django.template.base import Template
+
+logger = logging.getLogger(__name__)
+
+LOG = 'log'
+RAISE = 'raise'
+STACK_DEPTH = 6
+
+
+class QueryBudgetExceeded(Exception):
+    """Представление выполнило больше запросов, чем заявлено."""
+
+
+class QueryBudgetMixin:
+    """
+    Сообщает middleware бюджет запросов текущего представления.
+
+    Если представление вызывает другое, действует бюджет вложенного.
+    """
+    query_budget = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.query_budget is not None:
+            request.query_budget = (type(self).__name__, self.query_budget)
+        return super().dispatch(request, *args, **kwargs)
+
+
+def stack_summary():
+    """
+    Откуда выполнен запрос: кадры кода проекта и шаблоны, которые
+    в этот момент рендерились.
+    """
+    base_dir = str(settings.BASE_DIR)
+    lines = []
+    templates = []
+    frame = sys._getframe(2)
+    while frame is not None:
+        code = frame.f_code
+        # type(), а не isinstance: ленивые объекты вроде request.user
+        # вычислялись бы при проверке и выполняли бы новые запросы.
+        template = frame.f_locals.get('self')
+        if code.co_name == 'render' and issubclass(type(template), Template):
+            if template.origin.name not in templates:
+                templates.append(template.origin.name)
+        elif (
+            code.co_filename.startswith(base_dir)
+            and 'site-packages' not in code.co_filename
+            and len(lines) < STACK_DEPTH
+        ):
+            lines.append(
+                f'{code.co_filename}:{frame.f_lineno} in {code.co_name}'
+            )
+        frame = frame.f_back
+    lines.extend(f'template {name}' for name in templates)
+    return lines
+
+
+class QueryRecorder:
+    """Обёртка для connection.execute_wrapper, запоминает запросы."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, stack_summary()))
+        return execute(sql, params, many, context)
+
+    def report(self, view, budget):
+        counts = Counter(sql for sql, _ in self.queries)
+        lines = [
+            f'{view}: {len(self.queries)} SQL-запросов при бюджете {budget}.'
+        ]
+        seen = set()
+        for sql, stack in self.queries:
+            if counts[sql] < 2 or sql in seen:
+                continue
+            seen.add(sql)
+            lines.append(f'Повторяется {counts[sql]} раз: {sql}')
+            lines.extend(f'    {line}' for line in stack)
+        return '\n'.join(lines)
+
+
+class QueryBudgetMiddleware:
+    """
+    Проверяет бюджет запросов представлений.
+
+    Должен стоять в начале MIDDLEWARE, чтобы учитывать запросы сессии
+    и пользователя. При QUERY_BUDGET_MODE = None ничего не делает.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.QUERY_BUDGET_MODE
+        if mode not in (LOG, RAISE):
+            return self.get_response(request)
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+        view, budget = getattr(request, 'query_budget', (None, None))
+        if budget is not None and len(recorder.queries) > budget:
+            report = recorder.report(view, budget)
+            if mode == RAISE:
+                raise QueryBudgetExceeded(report)
+            logger.warning(report)
+        return response
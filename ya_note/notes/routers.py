@@ -0,0 +1,145 @@
+"""
+Чтение с реплики, запись в основную базу.
+
+Реплика подключается переменной окружения DJANGO_DB_REPLICA
+(псевдоним replica в DATABASES). Читают с неё только представления
+с read_from_replica = True и только в безопасных методах. После
+записи пользователь закрепляется за основной базой через cookie, чтобы
+сразу увидеть своё изменение. Если реплика отстаёт больше чем
+на REPLICA_MAX_LAG секунд, чтение идёт с основной базы, поэтому
+закрепление длится не меньше этого срока (см. pin_seconds).
+
+Сессии и пользователи всегда читаются с основной базы: иначе только что
+вошедший пользователь на реплике оказался бы анонимом.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic, time
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+
+PRIMARY = 'default'
+REPLICA = 'replica'
+PIN_COOKIE = 'primary_pin'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+STATUS_TABLE = 'replica_status'
+# Приложения, модели которых не читаются с реплики.
+PRIMARY_APPS = ('auth', 'sessions')
+
+reading_from_replica = ContextVar('reading_from_replica', default=False)
+# Момент проверки и отставание реплики, секунды.
+lag_cache = {'checked': None, 'lag': None}
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+def replica_lag():
+    """
+    Сколько секунд назад реплика синхронизирована; None, если неизвестно.
+
+    Время синхронизации записывает команда sync_replica. Проверка
+    делается не чаще раза в REPLICA_LAG_CHECK_INTERVAL секунд.
+    """
+    now = monotonic()
+    checked = lag_cache['checked']
+    if checked is not None and (
+        now - checked < settings.REPLICA_LAG_CHECK_INTERVAL
+    ):
+        return lag_cache['lag']
+    try:
+        with connections[REPLICA].cursor() as cursor:
+            cursor.execute(f'SELECT synced FROM {STATUS_TABLE}')
+            row = cursor.fetchone()
+        lag = time() - row[0] if row else None
+    except DatabaseError:
+        lag = None
+    lag_cache.update(checked=now, lag=lag)
+    return lag
+
+
+def pin_seconds():
+    """
+    Сколько секунд после записи пользователь читает с основной базы.
+
+    Отставание проверяется раз в REPLICA_LAG_CHECK_INTERVAL секунд,
+    поэтому используемая реплика может быть старше REPLICA_MAX_LAG
+    на этот интервал. Пока закрепление не истекло, реплики с копией,
+    снятой до записи, пользователь не видит.
+    """
+    return settings.REPLICA_MAX_LAG + settings.REPLICA_LAG_CHECK_INTERVAL
+
+
+def replica_usable():
+    lag = replica_lag()
+    return lag is not None and lag <= settings.REPLICA_MAX_LAG
+
+
+@contextmanager
+def primary_reads():
+    """Внутри блока все чтения идут с основной базы."""
+    token = reading_from_replica.set(False)
+    try:
+        yield
+    finally:
+        reading_from_replica.reset(token)
+
+
+class PrimaryReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if (
+            reading_from_replica.get()
+            and model._meta.app_label not in PRIMARY_APPS
+        ):
+            return REPLICA
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Реплика — копия основной базы, схему получает вместе с данными.
+        return db == PRIMARY
+
+
+class ReplicaMiddleware:
+    """
+    Включает чтение с реплики для представлений с read_from_replica
+    и закрепляет пользователя за основной базой после записи.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+        request.replica_token = None
+        try:
+            response = self.get_response(request)
+        finally:
+            if request.replica_token is not None:
+                reading_from_replica.reset(request.replica_token)
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=pin_seconds(),
+                httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None)
+        if (
+            replica_configured()
+            and getattr(view_class, 'read_from_replica', False)
+            and request.method in SAFE_METHODS
+            and PIN_COOKIE not in request.COOKIES
+            and replica_usable()
+        ):
+            request.replica_token = reading_from_replica.set(True)
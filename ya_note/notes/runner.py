@@ -0,0 +1,15 @@
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+from .query_budget import RAISE
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Запуск тестов, в котором превышение бюджета запросов любого
+    представления валит тест, а не только в тестах бюджета.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        settings.QUERY_BUDGET_MODE = RAISE
@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """То же, что notes.runner.TestRunner, при запуске через pytest."""
+    settings.QUERY_BUDGET_MODE = 'raise'
@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from notes.backends import USER_KEY
+
+
+class TestAuthCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username='user', password='password'
+        )
+        self.client.force_login(self.user)
+        self.client.get(reverse('notes:home'))
+
+    def test_session_and_user_from_cache(self):
+        """
+        Проверяем, что список заметок обходится одним запросом:
+        сессия и пользователь берутся из кеша.
+        """
+        with self.assertNumQueries(1):
+            self.client.get(reverse('notes:list'))
+
+    def test_password_change_logs_out(self):
+        """Проверяем, что после смены пароля старая сессия недействительна."""
+        self.user.set_password('new-password')
+        self.user.save()
+        response = self.client.get(reverse('notes:list'))
+        self.assertRedirects(
+            response, f'{reverse("users:login")}?next={reverse("notes:list")}'
+        )
+
+    def test_logout_drops_cached_user(self):
+        """Проверяем, что выход удаляет пользователя из кеша."""
+        self.assertIsNotNone(cache.get(USER_KEY.format(self.user.pk)))
+        self.client.get(reverse('users:logout'))
+        self.assertIsNone(cache.get(USER_KEY.format(self.user.pk)))
@@ -0,0 +1,48 @@
+import io
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+
+from notes.models import Note
+
+
+class TestGenerateNotesData(TestCase):
+
+    def generate(self, **options):
+        call_command('generate_notes_data', stdout=io.StringIO(), **options)
+
+    def test_generates_requested_volume(self):
+        """
+        Тест проверяет, что создаётся заданное число
+        пользователей и заметок у каждого из них.
+        """
+        self.generate(users=4, notes=5, titles=3, batch_size=7)
+        self.assertEqual(User.objects.count(), 4)
+        for user in User.objects.all():
+            self.assertEqual(Note.objects.filter(author=user).count(), 5)
+
+    def test_colliding_titles_get_unique_slugs(self):
+        """
+        Тест проверяет, что заголовки повторяются,
+        а slug у всех заметок разные.
+        """
+        Note.objects.create(
+            title='Заметка', text='Текст', slug='zametka',
+            author=User.objects.create_user(username='user'),
+        )
+        self.generate(users=3, notes=10, titles=2)
+        titles = set(Note.objects.values_list('title', flat=True))
+        slugs = set(Note.objects.values_list('slug', flat=True))
+        self.assertLessEqual(len(titles), 3)
+        self.assertEqual(len(slugs), Note.objects.count())
+
+    def test_same_seed_gives_same_data(self):
+        """Тест проверяет, что одинаковый seed даёт одинаковые данные."""
+        self.generate(users=2, notes=3, seed=7)
+        first = list(Note.objects.values_list('title', 'text', 'slug'))
+        User.objects.all().delete()
+        self.generate(users=2, notes=3, seed=7)
+        self.assertEqual(
+            list(Note.objects.values_list('title', 'text', 'slug')), first
+        )
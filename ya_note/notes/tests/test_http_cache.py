@@ -0,0 +1,72 @@
+import io
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from notes.management.commands.bench_http_cache import (
+    BYPASS, HIT, MISS, STALE, CachingProxy,
+)
+
+POLICY = 'public, max-age=60, stale-while-revalidate=300'
+
+
+class TestHttpCache(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', password='password'
+        )
+
+    def test_anonymous_home_is_public(self):
+        """
+        Проверяем, что главная анонима может храниться в общем кеше
+        и не зависит от cookie.
+        """
+        response = self.client.get(reverse('notes:home'))
+        self.assertEqual(response['Cache-Control'], POLICY)
+        self.assertFalse(response.has_header('Vary'))
+
+    def test_authenticated_home_is_private(self):
+        """Проверяем, что главную пользователя общий кеш не хранит."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('notes:home'))
+        self.assertEqual(response['Cache-Control'], 'private, no-cache')
+        self.assertEqual(response['Vary'], 'Cookie')
+
+    def test_other_views_untouched(self):
+        """Проверяем, что маршруты без политики заголовков не получают."""
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('notes:list'))
+        self.assertFalse(response.has_header('Cache-Control'))
+
+    def test_proxy_hit_rate(self):
+        """
+        Проверяем, что анонимы с любыми cookie, кроме сессии,
+        получают главную из общего кеша, пока она не устарела.
+        """
+        client = Client()
+        client.force_login(self.user)
+        session = client.cookies[settings.SESSION_COOKIE_NAME].value
+        now = [0.0]
+        proxy = CachingProxy(clock=lambda: now[0])
+        url = reverse('notes:home')
+        visitors = [
+            {}, {'_ym_uid': '1'}, {settings.SESSION_COOKIE_NAME: session},
+        ]
+        outcomes = [proxy.get(url, cookies)[1] for cookies in visitors]
+        self.assertEqual(outcomes, [MISS, HIT, BYPASS])
+        now[0] = 61
+        self.assertEqual(proxy.get(url)[1], STALE)
+        self.assertEqual(proxy.get(url)[1], HIT)
+        self.assertEqual(proxy.upstream, 3)
+
+    def test_bench_reports_hit_rate(self):
+        """Проверяем, что команда сравнивает долю попаданий в кеш."""
+        out = io.StringIO()
+        call_command('bench_http_cache', requests=50, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertEqual(lines[1].split()[-1], '50')
+        self.assertLess(int(lines[2].split()[-1]), 50)
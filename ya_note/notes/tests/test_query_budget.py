@@ -0,0 +1,60 @@
+from http import HTTPStatus
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from notes.models import Note
+from notes.query_budget import QueryBudgetExceeded
+from notes.views import NotesList
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class TestQueryBudget(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', password='password'
+        )
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст', author=cls.user
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_pages_fit_budget(self):
+        """
+        Проверяем, что страницы для автора укладываются
+        в заявленный бюджет запросов.
+        """
+        slug = self.note.slug
+        urls = (
+            ('notes:home', None),
+            ('notes:list', None),
+            ('notes:success', None),
+            ('notes:add', None),
+            ('notes:detail', (slug,)),
+            ('notes:edit', (slug,)),
+            ('notes:delete', (slug,)),
+        )
+        for name, args in urls:
+            with self.subTest(name=name):
+                response = self.client.get(reverse(name, args=args))
+                self.assertEqual(response.status_code, HTTPStatus.OK)
+
+    def test_writes_fit_budget(self):
+        """Проверяем, что создание, правка и удаление укладываются в бюджет."""
+        data = {'title': 'Новая', 'text': 'Текст', 'slug': 'new'}
+        self.client.post(reverse('notes:add'), data)
+        data['text'] = 'Другой текст'
+        self.client.post(reverse('notes:edit', args=('new',)), data)
+        self.client.post(reverse('notes:delete', args=('new',)))
+        self.assertFalse(Note.objects.filter(slug='new').exists())
+
+    def test_exceeded_budget_raises(self):
+        """Проверяем, что превышение бюджета называет представление."""
+        with mock.patch.object(NotesList, 'query_budget', 0):
+            with self.assertRaisesRegex(QueryBudgetExceeded, 'NotesList'):
+                self.client.get(reverse('notes:list'))
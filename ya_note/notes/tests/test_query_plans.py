@@ -0,0 +1,82 @@
+import re
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from notes.models import Note
+
+# Полный проход по таблице: SCAN без USING INDEX.
+FULL_SCAN = re.compile(r'^SCAN (TABLE )?\w+( AS \w+)?$')
+TEMP_SORT = 'USE TEMP B-TREE'
+EXPLAINED = ('SELECT', 'UPDATE', 'DELETE')
+
+
+class TestQueryPlans(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', password='password'
+        )
+        cls.other = User.objects.create_user(
+            username='other', password='password'
+        )
+        cls.note = Note.objects.create(
+            title='Заголовок', text='Текст', author=cls.user
+        )
+        Note.objects.create(
+            title='Чужая заметка', text='Текст', author=cls.other
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def assertPlansUseIndexes(self, queries):
+        """Запросы не сканируют таблицы и не сортируют во временном B-tree."""
+        for query in queries:
+            sql = query['sql']
+            if not sql.startswith(EXPLAINED):
+                continue
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = [row[-1] for row in cursor.fetchall()]
+            for step in plan:
+                self.assertIsNone(FULL_SCAN.match(step), f'{step}\n{sql}')
+                self.assertNotIn(TEMP_SORT, step, sql)
+
+    def test_read_views_use_indexes(self):
+        """
+        Проверяем, что запросы страниц заметок
+        не сканируют таблицы целиком
+        """
+        urls = [
+            reverse('notes:list'),
+            reverse('notes:detail', kwargs={'slug': self.note.slug}),
+            reverse('notes:edit', kwargs={'slug': self.note.slug}),
+            reverse('notes:delete', kwargs={'slug': self.note.slug}),
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            for url in urls:
+                self.client.get(url)
+        self.assertPlansUseIndexes(queries)
+
+    def test_write_views_use_indexes(self):
+        """
+        Проверяем, что запросы при создании, правке и удалении
+        заметки не сканируют таблицы целиком
+        """
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse('notes:add'), {'title': 'Новая', 'text': 'Текст'}
+            )
+            self.client.post(
+                reverse('notes:edit', kwargs={'slug': self.note.slug}),
+                {'title': 'Заголовок', 'text': 'Другой текст',
+                 'slug': self.note.slug},
+            )
+            self.client.post(
+                reverse('notes:delete', kwargs={'slug': self.note.slug})
+            )
+        self.assertPlansUseIndexes(queries)
@@ -0,0 +1,103 @@
+import io
+import sqlite3
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+
+from notes import routers
+from notes.models import Note
+from notes.views import NotesList
+
+
+class TestReplicaRouting(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username='user')
+
+    def setUp(self):
+        """
+        Реплика считается настроенной, но её псевдоним указывает
+        на тестовую базу; выбор базы записывается в self.chosen.
+        """
+        self.client.force_login(self.user)
+        self.chosen = []
+        for name in ('replica_configured', 'replica_usable'):
+            patcher = mock.patch.object(routers, name, return_value=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = mock.patch.object(routers, 'REPLICA', routers.PRIMARY)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        def get_queryset(view):
+            self.chosen.append(routers.reading_from_replica.get())
+            return Note.objects.none()
+
+        patcher = mock.patch.object(NotesList, 'get_queryset', get_queryset)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_router(self):
+        """Проверяем, что с реплики только читают и только по флагу."""
+        router = routers.PrimaryReplicaRouter()
+        self.assertEqual(router.db_for_read(Note), routers.PRIMARY)
+        token = routers.reading_from_replica.set(True)
+        try:
+            self.assertEqual(router.db_for_read(Note), routers.REPLICA)
+            self.assertEqual(router.db_for_write(Note), routers.PRIMARY)
+            # Иначе только что вошедший пользователь был бы анонимом.
+            self.assertEqual(router.db_for_read(Session), routers.PRIMARY)
+            self.assertEqual(router.db_for_read(User), routers.PRIMARY)
+        finally:
+            routers.reading_from_replica.reset(token)
+
+    def test_list_reads_from_replica(self):
+        """Проверяем, что список заметок читается с реплики."""
+        self.client.get(reverse('notes:list'))
+        self.assertEqual(self.chosen, [True])
+
+    def test_writer_pinned_to_primary(self):
+        """
+        Проверяем, что после записи список читается с основной базы.
+        """
+        response = self.client.post(
+            reverse('notes:add'), {'title': 'Заметка', 'text': 'Текст'}
+        )
+        self.assertIn(routers.PIN_COOKIE, response.cookies)
+        self.assertGreaterEqual(
+            response.cookies[routers.PIN_COOKIE]['max-age'],
+            settings.REPLICA_MAX_LAG + settings.REPLICA_LAG_CHECK_INTERVAL,
+        )
+        self.client.get(reverse('notes:list'))
+        self.assertEqual(self.chosen, [False])
+
+
+class TestSyncReplica(TransactionTestCase):
+    def test_sync_replica_copies_database(self):
+        """Проверяем, что копия содержит заметки и время синхронизации."""
+        user = User.objects.create_user(username='user')
+        Note.objects.create(title='Заметка', text='Текст', author=user)
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / 'replica.sqlite3')
+            call_command('sync_replica', replica=path, stdout=io.StringIO())
+            replica = sqlite3.connect(path)
+            try:
+                self.assertEqual(
+                    replica.execute('SELECT title FROM notes_note').fetchall(),
+                    [('Заметка',)],
+                )
+                self.assertEqual(
+                    replica.execute(
+                        f'SELECT count(*) FROM {routers.STATUS_TABLE}'
+                    ).fetchone(),
+                    (1,),
+                )
+            finally:
+                replica.close()
@@ -0,0 +1,56 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+
+@override_settings(SERVER_TIMING_SAMPLE_RATE=1)
+class TestServerTiming(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='user', password='password'
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def metrics(self, response):
+        return {
+            part.split(';')[0].strip()
+            for part in response['Server-Timing'].split(',')
+        }
+
+    def test_header_has_timings(self):
+        """
+        Проверяем, что в заголовке есть база, шаблон,
+        представление и итог.
+        """
+        with self.assertLogs('notes.timing', level='INFO'):
+            response = self.client.get(reverse('notes:list'))
+        self.assertLessEqual(
+            {'db', 'tpl', 'view', 'total'}, self.metrics(response)
+        )
+
+    def test_form_validation_timed(self):
+        """Проверяем, что проверка slug попадает в замер."""
+        with self.assertLogs('notes.timing', level='INFO'):
+            response = self.client.post(
+                reverse('notes:add'), {'title': 'Заметка', 'text': 'Текст'}
+            )
+        self.assertIn('form', self.metrics(response))
+
+    def test_timings_logged_as_json(self):
+        """Проверяем, что замер пишется в лог одной JSON-строкой."""
+        with self.assertLogs('notes.timing', level='INFO') as logs:
+            self.client.get(reverse('notes:home'))
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record['path'], reverse('notes:home'))
+        self.assertIn('total_ms', record)
+
+    @override_settings(SERVER_TIMING_SAMPLE_RATE=0)
+    def test_not_sampled_request_has_no_header(self):
+        """Проверяем, что запрос вне выборки не замеряется."""
+        response = self.client.get(reverse('notes:home'))
+        self.assertFalse(response.has_header('Server-Timing'))
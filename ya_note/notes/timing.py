@@ -0,0 +1,148 @@
+"""
+Замер времени обработки запроса без отладочной панели.
+
+ServerTimingMiddleware для выбранной доли запросов считает число
+и время SQL-запросов, время рендеринга шаблона, проверки форм
+и самого представления. Результат уходит в заголовок Server-Timing
+и одной JSON-строкой в лог notes.timing.
+
+Время базы и форм входит во время представления, а не вычитается
+из него.
+"""
+import json
+import logging
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+DB = 'db'
+FORM = 'form'
+TEMPLATE = 'tpl'
+VIEW = 'view'
+TOTAL = 'total'
+
+current = ContextVar('server_timing', default=None)
+
+
+class Timing:
+    """Накопленные за запрос метрики: имя -> [число, секунды]."""
+
+    def __init__(self):
+        self.metrics = {}
+        self.marks = {}
+
+    def add(self, name, seconds):
+        metric = self.metrics.setdefault(name, [0, 0.0])
+        metric[0] += 1
+        metric[1] += seconds
+
+    def mark(self, name):
+        self.marks.setdefault(name, perf_counter())
+
+    def header(self):
+        parts = []
+        for name, (count, seconds) in self.metrics.items():
+            part = f'{name};dur={seconds * 1000:.2f}'
+            if name == DB:
+                part += f';desc="{count} queries"'
+            parts.append(part)
+        return ', '.join(parts)
+
+    def as_dict(self):
+        data = {}
+        for name, (count, seconds) in self.metrics.items():
+            data[f'{name}_ms'] = round(seconds * 1000, 2)
+            if name == DB:
+                data['db_count'] = count
+        return data
+
+
+@contextmanager
+def span(name):
+    """Добавляет время блока к метрике name, если запрос замеряется."""
+    timing = current.get()
+    if timing is None:
+        yield
+        return
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, perf_counter() - started)
+
+
+def timed(name):
+    """Декоратор: время вызова функции идёт в метрику name."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def time_query(execute, sql, params, many, context):
+    """Обёртка для connection.execute_wrapper."""
+    with span(DB):
+        return execute(sql, params, many, context)
+
+
+class ServerTimingMiddleware:
+    """
+    Пишет Server-Timing и строку лога для доли запросов
+    SERVER_TIMING_SAMPLE_RATE. Должен стоять первым в MIDDLEWARE.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.SERVER_TIMING_SAMPLE_RATE:
+            return self.get_response(request)
+        timing = Timing()
+        token = current.set(timing)
+        started = perf_counter()
+        try:
+            with connection.execute_wrapper(time_query):
+                response = self.get_response(request)
+        finally:
+            current.reset(token)
+        finished = perf_counter()
+        marks = timing.marks
+        if 'view' in marks:
+            timing.add(VIEW, marks.get('template', finished) - marks['view'])
+        if 'template' in marks:
+            timing.add(
+                TEMPLATE, marks.get('rendered', finished) - marks['template']
+            )
+        timing.add(TOTAL, finished - started)
+        response['Server-Timing'] = timing.header()
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            **timing.as_dict(),
+        }))
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        timing = current.get()
+        if timing is not None:
+            timing.mark('view')
+
+    def process_template_response(self, request, response):
+        timing = current.get()
+        if timing is not None:
+            timing.mark('template')
+            response.add_post_render_callback(
+                lambda response: timing.mark('rendered')
+            )
+        return response
@@ -4,19 +4,24 @@ from django.views import generic
 
 from .forms import NoteForm
 from .models import Note
+from .query_budget import QueryBudgetMixin
 
 
-class Home(generic.TemplateView):
+class Home(QueryBudgetMixin, generic.TemplateView):
     """Домашняя страница."""
     template_name = 'notes/home.html'
+    query_budget = 2
 
 
-class NoteSuccess(LoginRequiredMixin, generic.TemplateView):
+class NoteSuccess(
+        QueryBudgetMixin, LoginRequiredMixin, generic.TemplateView
+):
     """Страница успешного выполнения операции."""
     template_name = 'notes/success.html'
+    query_budget = 2
 
 
-class NoteBase(LoginRequiredMixin):
+class NoteBase(QueryBudgetMixin, LoginRequiredMixin):
     """Базовый класс для остальных CBV."""
     model = Note
     success_url = reverse_lazy('notes:success')
@@ -30,6 +35,7 @@ class NoteCreate(NoteBase, generic.CreateView):
     """Добавление заметки."""
     template_name = 'notes/form.html'
     form_class = NoteForm
+    query_budget = 6
 
     def form_valid(self, form):
         new_note = form.save(commit=False)
@@ -42,18 +48,24 @@ class NoteUpdate(NoteBase, generic.UpdateView):
     """Редактирование заметки."""
     template_name = 'notes/form.html'
     form_class = NoteForm
+    query_budget = 6
 
 
 class NoteDelete(NoteBase, generic.DeleteView):
     """Удаление заметки."""
     template_name = 'notes/delete.html'
+    query_budget = 4
 
 
 class NotesList(NoteBase, generic.ListView):
     """Список всех заметок пользователя."""
     template_name = 'notes/list.html'
+    query_budget = 3
+    read_from_replica = True
 
 
 class NoteDetail(NoteBase, generic.DetailView):
     """Заметка подробно."""
     template_name = 'notes/detail.html'
+    query_budget = 3
+    read_from_replica = True
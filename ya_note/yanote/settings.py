@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from django.urls import reverse_lazy
@@ -23,7 +24,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'notes.timing.ServerTimingMiddleware',
+    'notes.routers.ReplicaMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'notes.query_budget.QueryBudgetMiddleware',
+    'notes.http_cache.HttpCachePolicyMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -53,13 +58,71 @@ TEMPLATES = [
 WSGI_APPLICATION = 'yanote.wsgi.application'
 
 
-DATABASES = {
-    'default': {
+# Профиль базы данных выбирается переменной окружения DJANGO_DB_PROFILE.
+DATABASE_PROFILES = {
+    'development': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+    },
+    'production': {
+        'ENGINE': 'yanote.sqlite_backend',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        # Соединение живёт между запросами, а не открывается на каждый.
+        'CONN_MAX_AGE': 600,
+        'TRANSACTION_MODE': 'IMMEDIATE',
+        'PRAGMAS': {
+            'journal_mode': 'WAL',
+            'synchronous': 'NORMAL',
+            'busy_timeout': 5000,
+            # Отрицательное значение — размер в килобайтах.
+            'cache_size': -20000,
+            'mmap_size': 256 * 1024 * 1024,
+            'temp_store': 'MEMORY',
+        },
+    },
+}
+
+DATABASES = {
+    'default': DATABASE_PROFILES[
+        os.environ.get('DJANGO_DB_PROFILE', 'development')
+    ],
+}
+
+# Путь к копии базы, с которой читают список и страницы заметок.
+# Копию обновляет команда sync_replica.
+if os.environ.get('DJANGO_DB_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['DJANGO_DB_REPLICA'],
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['notes.routers.PrimaryReplicaRouter']
+# Реплика старше этого, в секундах, не используется.
+REPLICA_MAX_LAG = 60
+# Как часто проверяется отставание реплики, секунды. После записи
+# пользователь читает с основной базы REPLICA_MAX_LAG плюс этот интервал.
+REPLICA_LAG_CHECK_INTERVAL = 5
+
+
+# Кеш общий для всех процессов сервера: в нём сессии и пользователи,
+# и сброс записи при выходе или смене пароля должен быть виден каждому
+# воркеру. LocMemCache у каждого процесса свой и годится только для
+# запуска в одном процессе.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_DIR', str(BASE_DIR / '.django_cache')
+        ),
     }
 }
 
+# Сессия и пользователь читаются из кеша, а не из базы на каждый запрос.
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+AUTHENTICATION_BACKENDS = ['notes.backends.CachedModelBackend']
+USER_CACHE_TIMEOUT = 300
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -86,5 +149,36 @@ STATIC_URL = '/static/'
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Доля запросов, для которых считается Server-Timing: от 0 до 1.
+# По умолчанию выключено: каждый замер — строка в логе.
+SERVER_TIMING_SAMPLE_RATE = float(
+    os.environ.get('SERVER_TIMING_SAMPLE_RATE', '0')
+)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'notes.timing': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
+# 'log' — писать превышение бюджета запросов в лог, 'raise' — падать.
+QUERY_BUDGET_MODE = 'log' if DEBUG else None
+# В тестах — 'raise' для всех представлений (см. notes/runner.py).
+TEST_RUNNER = 'notes.runner.TestRunner'
+
+# Cache-Control для общих кешей по имени маршрута (см. notes/http_cache.py):
+# аргументы patch_cache_control() для анонимных ответов.
+HTTP_CACHE_POLICIES = {
+    'notes:home': {'max_age': 60, 'stale_while_revalidate': 300},
+}
+
 LOGIN_URL = reverse_lazy('users:login')
 LOGIN_REDIRECT_URL = reverse_lazy('notes:home')